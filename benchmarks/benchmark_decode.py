@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+Compares the regex and fast response decoding paths of the VRROOM codec.
+"""
+
+import argparse
+import logging
+import sys
+import timeit
+from typing import List
+from vrroompy.codec import Codec, ValidationLevel
+from vrroompy.commands.input import SPEC_SELECTED_INPUTS
+from vrroompy.commands.modes import SPEC_AUTO_SWITCHING, SPEC_OPERATION_MODE
+from vrroompy.commands.network import SPEC_IP_ADDRESS, SPEC_MAC_ADDRESS, SPEC_TCP_PORT
+
+BENCHMARK_CASES = [
+    (SPEC_OPERATION_MODE, b"opmode 2\r\n"),
+    (SPEC_SELECTED_INPUTS, b"insel 1 4\r\n"),
+    (SPEC_AUTO_SWITCHING, b"autosw on\r\n"),
+    (SPEC_IP_ADDRESS, b"ipaddr 192.168.1.222\r\n"),
+    (SPEC_TCP_PORT, b"tcpport 2222\r\n"),
+    (SPEC_MAC_ADDRESS, b"mac 19:AC:B5:D3:22:F4\r\n"),
+]
+
+
+def time_per_call_ns(function, iterations: int) -> float:
+    """
+    Times the function, returning the best average duration of a call in nanoseconds.
+    """
+    best_total = min(timeit.repeat(function, number=iterations, repeat=5))
+    return best_total / iterations * 1e9
+
+
+def main(iterations: int) -> int:
+    """
+    Contains the main functionality of this script.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger = logging.getLogger()
+
+    logger.info(
+        "%-10s %14s %14s %14s %8s",
+        "target",
+        "decode ns/op",
+        "strict ns/op",
+        "fast ns/op",
+        "speedup",
+    )
+    for spec, response in BENCHMARK_CASES:
+        patterns = list(spec.value_patterns)
+        converters = list(spec.value_converters)
+
+        # Bind locals as defaults to keep lookups out of the timed calls
+        def decode(response=response, target=spec.target):
+            Codec.decode_response(response, target, patterns, converters)
+
+        def decode_strict(response=response, decode=spec.decode):
+            decode(response, ValidationLevel.STRICT)
+
+        def decode_fast(response=response, decode=spec.decode):
+            decode(response, ValidationLevel.FAST)
+
+        decode_ns = time_per_call_ns(decode, iterations)
+        strict_ns = time_per_call_ns(decode_strict, iterations)
+        fast_ns = time_per_call_ns(decode_fast, iterations)
+        logger.info(
+            "%-10s %14.0f %14.0f %14.0f %7.1fx",
+            spec.target,
+            decode_ns,
+            strict_ns,
+            fast_ns,
+            decode_ns / fast_ns,
+        )
+
+    return 0
+
+
+def parse_arguments(arguments: List[str]) -> argparse.Namespace:
+    """
+    Parses command-line arguments into namespace data.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compares the regex and fast response decoding paths of the VRROOM codec."
+    )
+    parser.add_argument(
+        "--iterations",
+        "-n",
+        dest="iterations",
+        default=100000,
+        type=int,
+        help="Number of decodes to time per measurement.",
+    )
+
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    exit(main(**vars(parse_arguments(sys.argv[1:]))))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+"""
+Measures fleet polling throughput against a local simulated fleet as worker processes are added.
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from typing import List
+from vrroompy.fleet import DeviceAddress, ShardedFleetPoller
+from vrroompy.simulator import SimulatorFaults, VrroomSimulator
+
+
+def run_simulated_fleet(
+    switch_count: int, latency: float, ready_queue: multiprocessing.Queue
+) -> None:
+    """
+    Serves a simulated switch on each of many local ports, reporting their addresses.
+    """
+
+    async def serve() -> None:
+        simulators = [
+            VrroomSimulator(SimulatorFaults(latency=latency))
+            for _ in range(switch_count)
+        ]
+        for simulator in simulators:
+            await simulator.start()
+        ready_queue.put([simulator.address for simulator in simulators])
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def measure_snapshots_per_second(
+    addresses: List[DeviceAddress], worker_count: int, polls: int
+) -> float:
+    """
+    Polls the fleet repeatedly, returning how many snapshots were read per second.
+    """
+    with ShardedFleetPoller(addresses, worker_count) as poller:
+        poller.poll()  # Warm up workers and connections outside the timing
+
+        start_time = time.perf_counter()
+        snapshot_count = 0
+        for _ in range(polls):
+            for result in poller.poll().values():
+                if result.error is None:
+                    snapshot_count += 1
+        return snapshot_count / (time.perf_counter() - start_time)
+
+
+def main(switch_count: int, polls: int, max_workers: int, latency: float) -> int:
+    """
+    Contains the main functionality of this script.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger = logging.getLogger()
+
+    ready_queue = multiprocessing.Queue()
+    fleet = multiprocessing.Process(
+        target=run_simulated_fleet,
+        args=(switch_count, latency, ready_queue),
+        daemon=True,
+    )
+    fleet.start()
+    try:
+        addresses = ready_queue.get(timeout=30)
+        logger.info("Polling %d simulated switches %d times", switch_count, polls)
+        logger.info("%-8s %14s %8s", "workers", "snapshots/s", "scaling")
+
+        baseline = None
+        for worker_count in range(1, max_workers + 1):
+            rate = measure_snapshots_per_second(addresses, worker_count, polls)
+            baseline = baseline or rate
+            logger.info("%-8d %14.0f %7.2fx", worker_count, rate, rate / baseline)
+    finally:
+        fleet.terminate()
+        fleet.join()
+
+    return 0
+
+
+def parse_arguments(arguments: List[str]) -> argparse.Namespace:
+    """
+    Parses command-line arguments into namespace data.
+    """
+    parser = argparse.ArgumentParser(
+        description="Measures fleet polling throughput against a local simulated fleet."
+    )
+    parser.add_argument(
+        "--switches",
+        "-s",
+        dest="switch_count",
+        default=500,
+        type=int,
+        help="Number of simulated switches to serve and poll.",
+    )
+    parser.add_argument(
+        "--polls",
+        "-n",
+        dest="polls",
+        default=10,
+        type=int,
+        help="Number of polls of the whole fleet to time per worker count.",
+    )
+    parser.add_argument(
+        "--max-workers",
+        "-w",
+        dest="max_workers",
+        default=os.cpu_count() or 1,
+        type=int,
+        help="Largest number of worker processes to measure.",
+    )
+    parser.add_argument(
+        "--latency",
+        "-l",
+        dest="latency",
+        default=0.0,
+        type=float,
+        help="Seconds that each simulated switch delays its replies by.",
+    )
+
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    exit(main(**vars(parse_arguments(sys.argv[1:]))))
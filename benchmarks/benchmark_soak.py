@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+
+"""
+Drives concurrent users through the client stack against a simulated switch, reporting latency, throughput and memory.
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import multiprocessing
+import socket
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+from vrroompy.async_client import AsyncVrroomClient
+from vrroompy.commands import execute_many
+from vrroompy.commands.input import Input, SPEC_SELECTED_INPUTS, set_selected_inputs
+from vrroompy.commands.modes import SPEC_OPERATION_MODE, get_operation_mode
+from vrroompy.commands.snapshot import SNAPSHOT_COMMANDS
+from vrroompy.exceptions import VrroomError
+from vrroompy.simulator import SimulatorFaults, VrroomSimulator
+
+MODES = ("blocking", "pipelined", "async")
+Address = Tuple[str, int]
+
+
+class LatencyHistogram:
+    """
+    Counts latencies in logarithmic buckets, so memory stays fixed however long the run.
+
+    Each bucket is a few percent wider than the last, which bounds the error of any
+    reported percentile to that width.
+    """
+
+    MINIMUM = 1e-6
+    GROWTH = 1.04
+
+    def __init__(self) -> None:
+        self.__counts: List[int] = [0] * 600
+        self.count = 0
+
+    def record(self, latency: float) -> None:
+        """
+        Counts a latency, in seconds.
+        """
+        index = 0
+        if latency > self.MINIMUM:
+            index = int(math.log(latency / self.MINIMUM, self.GROWTH)) + 1
+        self.__counts[min(index, len(self.__counts) - 1)] += 1
+        self.count += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Adds the counts of another histogram to this one.
+        """
+        for index, count in enumerate(other.__counts):
+            self.__counts[index] += count
+        self.count += other.count
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the given fraction of latencies.
+        """
+        rank = max(math.ceil(self.count * fraction), 1)
+        seen = 0
+        for index, count in enumerate(self.__counts):
+            seen += count
+            if seen >= rank:
+                return self.MINIMUM * self.GROWTH**index
+        return math.nan
+
+
+class LoadStats:
+    """
+    Collects the results of every user, safely across threads.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.histogram = LatencyHistogram()
+        # Failed round trips are counted apart, so timeouts do not hide in the latencies
+        self.error_histogram = LatencyHistogram()
+        self.command_count = 0
+        self.error_count = 0
+        self.connect_count = 0
+
+    def record(self, latency: float, command_count: int) -> None:
+        """
+        Records a round trip of the given number of commands.
+        """
+        with self.__lock:
+            self.histogram.record(latency)
+            self.command_count += command_count
+
+    def record_error(self, latency: float) -> None:
+        """
+        Records a failed round trip, after which the user reconnects.
+        """
+        with self.__lock:
+            self.error_histogram.record(latency)
+            self.error_count += 1
+
+    def record_connect(self) -> None:
+        """
+        Records a connection being opened.
+        """
+        with self.__lock:
+            self.connect_count += 1
+
+    def take_interval(self) -> Tuple[LatencyHistogram, int, LatencyHistogram]:
+        """
+        Returns the histogram, command count and histogram of failed round trips since
+        the last call, then resets them.
+        """
+        with self.__lock:
+            interval = (self.histogram, self.command_count, self.error_histogram)
+            self.histogram = LatencyHistogram()
+            self.error_histogram = LatencyHistogram()
+            self.command_count = 0
+            return interval
+
+
+def read_rss_bytes() -> int:
+    """
+    Returns the resident set size of this process, its peak where the current size is
+    unavailable, or zero where neither is.
+    """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return 0  # Not available on Windows
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # Peak rather than current, in kilobytes on Linux but bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_blocking_user(
+    address: Address,
+    stats: LoadStats,
+    stop: threading.Event,
+    timeout: float,
+    round_trip: Callable[[socket.socket], int],
+) -> None:
+    """
+    Sends round trips over a blocking socket until stopped, reconnecting on failure.
+    """
+    user_socket: Optional[socket.socket] = None
+    while not stop.is_set():
+        # Failures are timed from the connection attempt, if one was needed
+        start_time = time.perf_counter()
+        try:
+            if user_socket is None:
+                user_socket = socket.create_connection(address, timeout)
+                stats.record_connect()
+                start_time = time.perf_counter()
+            command_count = round_trip(user_socket)
+            stats.record(time.perf_counter() - start_time, command_count)
+        except (OSError, VrroomError):
+            stats.record_error(time.perf_counter() - start_time)
+            if user_socket is not None:
+                user_socket.close()
+            user_socket = None
+    if user_socket is not None:
+        user_socket.close()
+
+
+def blocking_round_trip(user_socket: socket.socket) -> int:
+    """
+    Gets the operation mode, then switches inputs, as individual blocking commands.
+    """
+    get_operation_mode(user_socket)
+    set_selected_inputs(user_socket, Input.RX1, Input.RX2)
+    return 2
+
+
+def pipelined_round_trip(user_socket: socket.socket) -> int:
+    """
+    Reads every implemented target in a single pipelined batch.
+    """
+    execute_many(user_socket, SNAPSHOT_COMMANDS)
+    return len(SNAPSHOT_COMMANDS)
+
+
+async def run_async_users(
+    address: Address,
+    user_count: int,
+    stats: LoadStats,
+    stop: threading.Event,
+    timeout: float,
+) -> None:
+    """
+    Runs every user as a task sharing one event loop, each with its own connection.
+    """
+
+    async def run_user() -> None:
+        client: Optional[AsyncVrroomClient] = None
+        while not stop.is_set():
+            start_time = time.perf_counter()
+            try:
+                if client is None:
+                    client = await AsyncVrroomClient.connect(*address)
+                    stats.record_connect()
+                    start_time = time.perf_counter()
+                await asyncio.wait_for(client.get(SPEC_OPERATION_MODE), timeout)
+                await asyncio.wait_for(
+                    client.set(SPEC_SELECTED_INPUTS, [Input.RX1, Input.RX2]), timeout
+                )
+                stats.record(time.perf_counter() - start_time, 2)
+            except (OSError, VrroomError, asyncio.TimeoutError):
+                stats.record_error(time.perf_counter() - start_time)
+                if client is not None:
+                    await client.close()
+                client = None
+        if client is not None:
+            await client.close()
+
+    await asyncio.gather(*[run_user() for _ in range(user_count)])
+
+
+def run_simulator(
+    faults: SimulatorFaults, ready_queue: multiprocessing.Queue, seed: int
+) -> None:
+    """
+    Serves a simulated switch until terminated, reporting its address.
+    """
+
+    async def serve() -> None:
+        async with VrroomSimulator(faults, seed=seed) as simulator:
+            ready_queue.put(simulator.address)
+            await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def start_users(
+    mode: str, address: Address, user_count: int, stats: LoadStats, timeout: float
+) -> Tuple[threading.Event, List[threading.Thread]]:
+    """
+    Starts every user of the given mode on background threads.
+    """
+    stop = threading.Event()
+    if mode == "async":
+        threads = [
+            threading.Thread(
+                target=lambda: asyncio.run(
+                    run_async_users(address, user_count, stats, stop, timeout)
+                ),
+                daemon=True,
+            )
+        ]
+    else:
+        round_trip = blocking_round_trip if mode == "blocking" else pipelined_round_trip
+        threads = [
+            threading.Thread(
+                target=run_blocking_user,
+                args=(address, stats, stop, timeout, round_trip),
+                daemon=True,
+            )
+            for _ in range(user_count)
+        ]
+    for thread in threads:
+        thread.start()
+    return stop, threads
+
+
+def main(
+    mode: str,
+    user_count: int,
+    duration: float,
+    report_interval: float,
+    timeout: float,
+    latency: float,
+    jitter: float,
+    split_probability: float,
+    drop_probability: float,
+) -> int:
+    """
+    Contains the main functionality of this script.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger = logging.getLogger()
+
+    faults = SimulatorFaults(
+        latency=latency,
+        jitter=jitter,
+        split_probability=split_probability,
+        drop_probability=drop_probability,
+    )
+    ready_queue = multiprocessing.Queue()
+    simulator = multiprocessing.Process(
+        target=run_simulator, args=(faults, ready_queue, 0), daemon=True
+    )
+    simulator.start()
+    try:
+        address = ready_queue.get(timeout=30)
+        logger.info("Running %d %s users for %.0fs", user_count, mode, duration)
+        logger.info(
+            "%8s %10s %10s %10s %10s %10s %10s %10s %10s",
+            "elapsed",
+            "cmds/s",
+            "p50 ms",
+            "p99 ms",
+            "p99.9 ms",
+            "errors",
+            "err p99 ms",
+            "reconnects",
+            "rss MiB",
+        )
+
+        stats = LoadStats()
+        total = LatencyHistogram()
+        total_errors = LatencyHistogram()
+        start_rss = read_rss_bytes()
+        start_time = time.monotonic()
+        stop, threads = start_users(mode, address, user_count, stats, timeout)
+        try:
+            elapsed = 0.0
+            total_commands = 0
+            while elapsed < duration:
+                time.sleep(min(report_interval, duration - elapsed))
+                interval_time = time.monotonic() - start_time - elapsed
+                elapsed += interval_time
+                interval, command_count, interval_errors = stats.take_interval()
+                total.merge(interval)
+                total_errors.merge(interval_errors)
+                total_commands += command_count
+                logger.info(
+                    "%8.0f %10.0f %10.2f %10.2f %10.2f %10d %10.2f %10d %10.1f",
+                    elapsed,
+                    command_count / interval_time,
+                    interval.percentile(0.5) * 1000,
+                    interval.percentile(0.99) * 1000,
+                    interval.percentile(0.999) * 1000,
+                    interval_errors.count,
+                    interval_errors.percentile(0.99) * 1000,
+                    max(stats.connect_count - user_count, 0),
+                    read_rss_bytes() / 2**20,
+                )
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join(timeout * 2)
+
+        logger.info(
+            "Overall: %.0f cmds/s, p50 %.2fms, p99 %.2fms, p99.9 %.2fms, "
+            "%d errors (p50 %.2fms, p99 %.2fms), %d reconnects, RSS growth %.1f MiB",
+            total_commands / elapsed,
+            total.percentile(0.5) * 1000,
+            total.percentile(0.99) * 1000,
+            total.percentile(0.999) * 1000,
+            stats.error_count,
+            total_errors.percentile(0.5) * 1000,
+            total_errors.percentile(0.99) * 1000,
+            max(stats.connect_count - user_count, 0),
+            (read_rss_bytes() - start_rss) / 2**20,
+        )
+    finally:
+        simulator.terminate()
+        simulator.join()
+
+    return 0
+
+
+def parse_arguments(arguments: List[str]) -> argparse.Namespace:
+    """
+    Parses command-line arguments into namespace data.
+    """
+    parser = argparse.ArgumentParser(
+        description="Drives concurrent users through the client stack against a simulated switch."
+    )
+    parser.add_argument(
+        "--mode",
+        "-m",
+        dest="mode",
+        default="blocking",
+        choices=MODES,
+        help="Whether users send blocking commands, pipelined batches or async calls.",
+    )
+    parser.add_argument(
+        "--users",
+        "-u",
+        dest="user_count",
+        default=16,
+        type=int,
+        help="Number of concurrent users, each with its own connection.",
+    )
+    parser.add_argument(
+        "--duration",
+        "-d",
+        dest="duration",
+        default=60.0,
+        type=float,
+        help="Seconds to run for; use hours' worth to soak for memory growth.",
+    )
+    parser.add_argument(
+        "--report-interval",
+        "-r",
+        dest="report_interval",
+        default=10.0,
+        type=float,
+        help="Seconds between progress reports.",
+    )
+    parser.add_argument(
+        "--timeout",
+        "-t",
+        dest="timeout",
+        default=2.0,
+        type=float,
+        help="Seconds a blocking user waits for a reply before reconnecting.",
+    )
+    parser.add_argument(
+        "--latency",
+        dest="latency",
+        default=0.0,
+        type=float,
+        help="Seconds that the simulated switch delays its replies by.",
+    )
+    parser.add_argument(
+        "--jitter",
+        dest="jitter",
+        default=0.0,
+        type=float,
+        help="Seconds by which the reply delay randomly varies.",
+    )
+    parser.add_argument(
+        "--split",
+        dest="split_probability",
+        default=0.0,
+        type=float,
+        help="Probability of a reply being split across TCP segments.",
+    )
+    parser.add_argument(
+        "--drop",
+        dest="drop_probability",
+        default=0.0,
+        type=float,
+        help="Probability of a reply being dropped, forcing a reconnect.",
+    )
+
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    exit(main(**vars(parse_arguments(sys.argv[1:]))))
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+"""
+Measures the hot path of the codec and command layer, failing on regressions against a baseline.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+from vrroompy.codec import Codec, ValidationLevel
+from vrroompy.commands.enums import Target
+from vrroompy.commands.input import (
+    Input,
+    SPEC_SELECTED_INPUTS,
+    get_selected_inputs,
+    set_selected_inputs,
+)
+from vrroompy.commands.modes import (
+    OperationMode,
+    SPEC_AUTO_SWITCHING,
+    SPEC_OPERATION_MODE,
+    get_autoswitch_enabled,
+    get_operation_mode,
+    set_operation_mode,
+)
+from vrroompy.commands.network import (
+    IpAddressV4,
+    SPEC_IP_ADDRESS,
+    SPEC_MAC_ADDRESS,
+    SPEC_TCP_PORT,
+    get_ip_address,
+    get_mac_address,
+    get_tcp_port,
+    set_ip_address,
+)
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+MEMORY_SWITCH_RESPONSES = {
+    b"get opmode\n": b"opmode 2\r\n",
+    b"get insel\n": b"insel 1 4\r\n",
+    b"get autosw\n": b"autosw on\r\n",
+    b"get ipaddr\n": b"ipaddr 192.168.1.222\r\n",
+    b"get tcpport\n": b"tcpport 2222\r\n",
+    b"get mac\n": b"mac 19:AC:B5:D3:22:F4\r\n",
+}
+
+
+class MemorySocket:
+    """
+    Answers commands in memory, standing in for a socket connected to a switch.
+
+    Get commands are answered from a fixed table, and set commands are echoed.
+    """
+
+    def __init__(self) -> None:
+        self.__response = b""
+
+    def sendall(self, request: bytes) -> None:
+        response = MEMORY_SWITCH_RESPONSES.get(request)
+        if response is None:
+            response = request[len(b"set ") : -1] + b"\r\n"
+        self.__response = response
+
+    def recv(self, _buffer_size: int) -> bytes:
+        response, self.__response = self.__response, b""
+        return response
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    Describes the cost of a single operation of a benchmark case.
+
+    CPython does not count allocations, so memory is measured as the peak number of
+    bytes allocated by tracemalloc during one operation.
+    """
+
+    ns_per_op: float
+    bytes_per_op: int
+
+
+def create_cases() -> Dict[str, Callable[[], object]]:
+    """
+    Creates every benchmark case, keyed by a name that is stable across runs.
+    """
+    memory_socket = MemorySocket()
+    decode_cases = [
+        ("enum", SPEC_OPERATION_MODE, b"opmode 2\r\n"),
+        ("input", SPEC_SELECTED_INPUTS, b"insel 1 4\r\n"),
+        ("onoff", SPEC_AUTO_SWITCHING, b"autosw on\r\n"),
+        ("ipv4", SPEC_IP_ADDRESS, b"ipaddr 192.168.1.222\r\n"),
+        ("mac", SPEC_MAC_ADDRESS, b"mac 19:AC:B5:D3:22:F4\r\n"),
+        ("tcpport", SPEC_TCP_PORT, b"tcpport 2222\r\n"),
+    ]
+    ip_address = IpAddressV4("192.168.1.222")
+
+    cases: Dict[str, Callable[[], object]] = {
+        "codec.encode_get": lambda: Codec.encode_command_get("opmode"),
+        "codec.encode_set": lambda: Codec.encode_command_set("insel", [1, 4]),
+        "target.is_valid": lambda: Target.is_valid("edidfrlflag"),
+        "target.is_valid_invalid": lambda: Target.is_valid("nonsense"),
+        "command.get_operation_mode": lambda: get_operation_mode(memory_socket),
+        "command.set_operation_mode": lambda: set_operation_mode(
+            memory_socket, OperationMode.MATRIX_TMDS
+        ),
+        "command.get_selected_inputs": lambda: get_selected_inputs(memory_socket),
+        "command.set_selected_inputs": lambda: set_selected_inputs(
+            memory_socket, Input.RX1, Input.RX2
+        ),
+        "command.get_autoswitch_enabled": lambda: get_autoswitch_enabled(memory_socket),
+        "command.get_ip_address": lambda: get_ip_address(memory_socket),
+        "command.set_ip_address": lambda: set_ip_address(memory_socket, ip_address),
+        "command.get_mac_address": lambda: get_mac_address(memory_socket),
+        "command.get_tcp_port": lambda: get_tcp_port(memory_socket),
+    }
+    for validation_level in ValidationLevel:
+        for name, spec, response in decode_cases:
+            # Bind locals as defaults to keep lookups out of the timed calls
+            def decode(
+                response=response,
+                decode_spec=spec.decode,
+                validation_level=validation_level,
+            ):
+                return decode_spec(response, validation_level)
+
+            cases[f"spec.decode_{validation_level.value}_{name}"] = decode
+    return cases
+
+
+def measure(
+    function: Callable[[], object], iterations: int, repeats: int
+) -> BenchmarkResult:
+    """
+    Measures the median average time of a call over the repeats, and the peak bytes
+    allocated during one.
+
+    The median is taken rather than the best time, so that a single lucky or unlucky
+    repeat cannot move the result, and regressions are gated on typical cost.
+    """
+    function()  # Warm up any caches outside of the measurements
+    median_total = statistics.median(
+        timeit.repeat(function, number=iterations, repeat=repeats)
+    )
+
+    peaks = []
+    for _ in range(10):
+        tracemalloc.start()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+    return BenchmarkResult(median_total / iterations * 1e9, min(peaks))
+
+
+def load_baseline(path: str) -> Optional[Dict[str, BenchmarkResult]]:
+    """
+    Loads the results stored in a baseline file, if it exists.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as baseline_file:
+        stored = json.load(baseline_file)
+    return {name: BenchmarkResult(**result) for name, result in stored.items()}
+
+
+def save_baseline(path: str, results: Dict[str, BenchmarkResult]) -> None:
+    """
+    Stores the results in a baseline file, for later runs to be compared against.
+    """
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(
+            {name: result._asdict() for name, result in results.items()},
+            baseline_file,
+            indent=2,
+            sort_keys=True,
+        )
+        baseline_file.write("\n")
+
+
+def find_regressions(
+    results: Dict[str, BenchmarkResult],
+    baseline: Dict[str, BenchmarkResult],
+    threshold: float,
+) -> List[str]:
+    """
+    Compares results against the baseline, allowing each to grow by the threshold.
+
+    Returns the names of the cases that regressed in time or memory.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result.ns_per_op > base.ns_per_op * (1 + threshold) or (
+            result.bytes_per_op > base.bytes_per_op * (1 + threshold)
+        ):
+            regressions.append(name)
+    return regressions
+
+
+def main(
+    iterations: int,
+    repeats: int,
+    baseline_path: str,
+    update_baseline: bool,
+    threshold: float,
+    case_filter: str,
+) -> int:
+    """
+    Contains the main functionality of this script.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger = logging.getLogger()
+
+    baseline = None if update_baseline else load_baseline(baseline_path)
+    cases = create_cases()
+    results: Dict[str, BenchmarkResult] = {}
+    logger.info("%-34s %10s %10s %10s", "case", "ns/op", "bytes/op", "vs base")
+    for name, function in cases.items():
+        if case_filter not in name:
+            continue
+        result = measure(function, iterations, repeats)
+        results[name] = result
+
+        change = ""
+        if baseline is not None and name in baseline:
+            change = f"{result.ns_per_op / baseline[name].ns_per_op - 1:+.0%}"
+        logger.info(
+            "%-34s %10.0f %10d %10s",
+            name,
+            result.ns_per_op,
+            result.bytes_per_op,
+            change,
+        )
+
+    if update_baseline:
+        # Cases left out by the filter keep their stored results
+        save_baseline(
+            baseline_path, {**(load_baseline(baseline_path) or {}), **results}
+        )
+        logger.info("Saved baseline to %s", baseline_path)
+        return 0
+    if baseline is None:
+        logger.info("No baseline at %s; run with --update-baseline", baseline_path)
+        return 0
+
+    regressions = find_regressions(results, baseline, threshold)
+    if regressions:
+        # A regression must show again on a second measurement, to rule out noise
+        logger.info("Re-measuring %d regressed case(s)...", len(regressions))
+        results = {
+            name: measure(cases[name], iterations, repeats) for name in regressions
+        }
+        regressions = find_regressions(results, baseline, threshold)
+    for name in regressions:
+        logger.error("Regressed past %.0f%%: %s", threshold * 100, name)
+    return 1 if regressions else 0
+
+
+def parse_arguments(arguments: List[str]) -> argparse.Namespace:
+    """
+    Parses command-line arguments into namespace data.
+    """
+    parser = argparse.ArgumentParser(
+        description="Measures the hot path of the codec and command layer, failing on regressions."
+    )
+    parser.add_argument(
+        "--iterations",
+        "-n",
+        dest="iterations",
+        default=20000,
+        type=int,
+        help="Number of operations to time per measurement.",
+    )
+    parser.add_argument(
+        "--repeats",
+        "-r",
+        dest="repeats",
+        default=15,
+        type=int,
+        help="Number of measurements per case, of which the median is kept.",
+    )
+    parser.add_argument(
+        "--baseline",
+        "-b",
+        dest="baseline_path",
+        default=DEFAULT_BASELINE_PATH,
+        help="Path of the baseline file to compare against or update.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        "-u",
+        dest="update_baseline",
+        action="store_true",
+        help="Stores these results as the new baseline, rather than comparing.",
+    )
+    parser.add_argument(
+        "--threshold",
+        "-t",
+        dest="threshold",
+        default=0.5,
+        type=float,
+        help="Fraction by which a case may grow past its baseline before failing.",
+    )
+    parser.add_argument(
+        "--filter",
+        "-k",
+        dest="case_filter",
+        default="",
+        help="Only runs the cases whose names contain this string.",
+    )
+
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    exit(main(**vars(parse_arguments(sys.argv[1:]))))
@@ -10,17 +10,7 @@ import socket
 import sys
 from typing import List
 from vrroompy.commands.enums import OnOffSwitch
-from vrroompy.commands.input import get_selected_inputs
-from vrroompy.commands.network import (
-    get_ip_address,
-    get_ip_network_mask,
-    get_ip_gateway,
-    get_dhcp_enabled,
-    get_ip_interrupts_enabled,
-    get_tcp_port,
-    get_mac_address,
-)
-from vrroompy.commands.modes import get_operation_mode, get_autoswitch_enabled
+from vrroompy.commands.snapshot import read_snapshot
 
 
 def main(address: str, port: int) -> int:
@@ -37,26 +27,26 @@ def main(address: str, port: int) -> int:
         logger.info("Successfully connected to VRROOM switch.")
 
         logger.info("Getting all values from VRROOM switch...")
-        logger.info("Operation mode: %s", get_operation_mode(vrroom_socket))
+        snapshot = read_snapshot(vrroom_socket)
+        logger.info("Operation mode: %s", snapshot.operation_mode)
 
-        selected_inputs = get_selected_inputs(vrroom_socket)
         logger.info("Selected inputs:")
-        logger.info("\tTX0: %s", selected_inputs[0].name)
-        logger.info("\tTX1: %s", selected_inputs[1].name)
+        logger.info("\tTX0: %s", snapshot.selected_inputs[0].name)
+        logger.info("\tTX1: %s", snapshot.selected_inputs[1].name)
 
-        logger.info("IP Address: %s", get_ip_address(vrroom_socket))
-        logger.info("Network Mask: %s", get_ip_network_mask(vrroom_socket))
-        logger.info("Default Gateway: %s", get_ip_gateway(vrroom_socket))
-        logger.info("DHCP: %s", OnOffSwitch.from_bool(get_dhcp_enabled(vrroom_socket)))
+        logger.info("IP Address: %s", snapshot.ip_address)
+        logger.info("Network Mask: %s", snapshot.ip_network_mask)
+        logger.info("Default Gateway: %s", snapshot.ip_gateway)
+        logger.info("DHCP: %s", OnOffSwitch.from_bool(snapshot.dhcp_enabled))
         logger.info(
             "IP Interrupts: %s",
-            OnOffSwitch.from_bool(get_ip_interrupts_enabled(vrroom_socket)),
+            OnOffSwitch.from_bool(snapshot.ip_interrupts_enabled),
         )
-        logger.info("TCP Port: %s", get_tcp_port(vrroom_socket))
-        logger.info("MAC Address: %s", get_mac_address(vrroom_socket))
+        logger.info("TCP Port: %s", snapshot.tcp_port)
+        logger.info("MAC Address: %s", snapshot.mac_address)
         logger.info(
             "Autoswitch mode: %s",
-            OnOffSwitch.from_bool(get_autoswitch_enabled(vrroom_socket)),
+            OnOffSwitch.from_bool(snapshot.autoswitch_enabled),
         )
 
         logger.info("All VRROOM values obtained successfully.")
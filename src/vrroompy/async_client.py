@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+
+"""
+Contains a client for controlling the VRROOM switch from an asyncio event loop.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from .codec import ValidationLevel
+from .commands import DEFAULT_RECEIVE_BUFFER_SIZE, BatchCommand, decode_response
+from .commands.actions import (
+    ResetDataType,
+    SPEC_ACTION_FACTORY_RESET,
+    SPEC_ACTION_HOTPLUG,
+    SPEC_ACTION_REBOOT,
+)
+from .commands.audio import (
+    AnalogTone,
+    AnalogVolume,
+    SPEC_ANALOG_BASS,
+    SPEC_ANALOG_TREBLE,
+    SPEC_ANALOG_VOLUME,
+    SPEC_HDMI_MUTED_TX0,
+    SPEC_HDMI_MUTED_TX1,
+)
+from .commands.edid import (
+    SPEC_EDID_ALLM_AUTOMIX,
+    SPEC_EDID_DV_AUTOMIX,
+    SPEC_EDID_FRL_AUTOMIX,
+    SPEC_EDID_HDR_AUTOMIX,
+    SPEC_EDID_VRR_AUTOMIX,
+)
+from .commands.enums import OnOffSwitch
+from .commands.input import (
+    Input,
+    SPEC_SELECTED_INPUTS,
+    SPEC_SELECTED_INPUT_TX0,
+    SPEC_SELECTED_INPUT_TX1,
+)
+from .commands.modes import OperationMode, SPEC_AUTO_SWITCHING, SPEC_OPERATION_MODE
+from .commands.network import (
+    IpAddressV4,
+    MacAddress,
+    TcpPort,
+    SPEC_DHCP_ENABLED,
+    SPEC_IP_ADDRESS,
+    SPEC_IP_GATEWAY,
+    SPEC_IP_INTERRUPTS_ENABLED,
+    SPEC_IP_NETWORK_MASK,
+    SPEC_MAC_ADDRESS,
+    SPEC_TCP_PORT,
+)
+from .commands.oled import (
+    OledFadeTime,
+    SPEC_OLED_FADE_TIME,
+)
+from .commands.snapshot import SNAPSHOT_COMMANDS, DeviceSnapshot, decode_snapshot
+from .commands.spec import CommandSpec
+from .commands.transaction import Transaction
+from .commands.video import (
+    SPEC_AVI_INFOFRAME_CUSTOM,
+    SPEC_AVI_INFOFRAME_DISABLE,
+    SPEC_HDR_CUSTOM,
+    SPEC_HDR_DISABLE,
+)
+from .exceptions import ConnectionClosedError, ResponseMissingError
+from .protocol import (
+    InterruptCallback,
+    InterruptEvent,
+    PendingCommand,
+    Response,
+    VrroomProtocol,
+)
+from .recorder import FlightRecorder
+
+
+class AsyncVrroomClient:
+    """
+    Controls a VRROOM switch over asyncio streams.
+
+    A single reader task frames every response and hands it to the command awaiting
+    it, so any number of commands may be in flight at once on one connection.
+    Responses are matched to commands by target, so cancelling an awaiting command
+    does not desynchronise the response stream: its response is discarded if it
+    arrives, and a command the switch never answers fails with ResponseMissingError
+    once a later command is answered.
+
+    Interrupt messages are available both as an async iterator of events, and to
+    callbacks subscribed from within the event loop. If a flight recorder is given,
+    it records the connection's recent traffic.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        validation_level: ValidationLevel = ValidationLevel.STRICT,
+        flight_recorder: Optional[FlightRecorder] = None,
+    ) -> None:
+        self.__reader = reader
+        self.__writer = writer
+        self.__protocol = VrroomProtocol(validation_level, flight_recorder)
+        self.__protocol.on_skipped = self.__fail_skipped
+        self.__read_task: Optional[asyncio.Task] = None
+        self.__interrupt_queues: List["asyncio.Queue[Optional[InterruptEvent]]"] = []
+        self.__transactions: "Dict[asyncio.Task, Transaction]" = {}
+
+    @staticmethod
+    async def connect(
+        host: str,
+        port: int,
+        validation_level: ValidationLevel = ValidationLevel.STRICT,
+        flight_recorder: Optional[FlightRecorder] = None,
+    ) -> "AsyncVrroomClient":
+        """
+        Opens a connection to the switch at the given address.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        return AsyncVrroomClient(reader, writer, validation_level, flight_recorder)
+
+    async def __aenter__(self) -> "AsyncVrroomClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the connection, failing any commands still awaiting a response.
+        """
+        if self.__read_task is not None:
+            self.__read_task.cancel()
+            try:
+                await self.__read_task
+            except asyncio.CancelledError:
+                pass
+            self.__read_task = None
+        self.__fail_pending(ConnectionClosedError("Connection was closed by client!"))
+        self.__writer.close()
+
+    def __fail_pending(self, error: Exception) -> None:
+        for command in self.__protocol.pending_commands:
+            if not command.context.done():
+                command.context.set_exception(error)
+        self.__protocol.clear()
+        # Ends every iteration of interrupt events
+        for queue in self.__interrupt_queues:
+            queue.put_nowait(None)
+
+    @staticmethod
+    def __fail_skipped(command: PendingCommand) -> None:
+        if not command.context.done():
+            command.context.set_exception(
+                ResponseMissingError(
+                    f"Switch answered later commands, but not '{command.target}'!"
+                )
+            )
+
+    async def __read_responses(self) -> None:
+        try:
+            while True:
+                received = await self.__reader.read(DEFAULT_RECEIVE_BUFFER_SIZE)
+                if not received:
+                    raise ConnectionClosedError(
+                        "Connection was closed while awaiting responses!"
+                    )
+                self.__protocol.receive_data(received)
+
+                response = self.__protocol.next_response()
+                while response is not None:
+                    future = response.command.context if response.command else None
+                    # Futures of cancelled commands are already done; drop their responses
+                    if future is not None and not future.done():
+                        future.set_result(response)
+                    response = self.__protocol.next_response()
+        except (ConnectionClosedError, OSError) as error:
+            self.__fail_pending(error)
+
+    def __start_reading(self) -> None:
+        if self.__read_task is None or self.__read_task.done():
+            self.__read_task = asyncio.ensure_future(self.__read_responses())
+
+    def __send(self, spec: CommandSpec, request: bytes) -> "asyncio.Future[Response]":
+        self.__start_reading()
+
+        future = asyncio.get_running_loop().create_future()
+        # Registering and writing without awaiting in between keeps the send order
+        command = self.__protocol.send_command(spec.target, request, future)
+        self.__writer.write(command.request)
+        # A cancelled command is abandoned, so it cannot hold up later ones on its target
+        future.add_done_callback(
+            lambda done: self.__protocol.abandon(command) if done.cancelled() else None
+        )
+        return future
+
+    def subscribe_interrupts(self, callback: InterruptCallback) -> Callable[[], None]:
+        """
+        Subscribes the callback to every interrupt message subsequently received.
+
+        Callbacks are called from the reader task, so must not block the event loop.
+
+        Returns a function that unsubscribes the callback when called.
+        """
+        self.__start_reading()
+        return self.__protocol.subscribe_interrupts(callback)
+
+    async def interrupts(self) -> AsyncIterator[InterruptEvent]:
+        """
+        Iterates over every interrupt message subsequently received.
+
+        Iteration ends when the connection is closed.
+        """
+        queue: "asyncio.Queue[Optional[InterruptEvent]]" = asyncio.Queue()
+        unsubscribe = self.subscribe_interrupts(queue.put_nowait)
+        self.__interrupt_queues.append(queue)
+        try:
+            event = await queue.get()
+            while event is not None:
+                yield event
+                event = await queue.get()
+        finally:
+            unsubscribe()
+            self.__interrupt_queues.remove(queue)
+
+    async def __complete(
+        self,
+        spec: CommandSpec,
+        desired_values: Optional[List[Any]],
+        future: "asyncio.Future[Response]",
+    ) -> List[Any]:
+        response = await future
+        return decode_response(self.__protocol, spec, response, desired_values)
+
+    def submit(
+        self, spec: CommandSpec, desired_values: Optional[List[Any]] = None
+    ) -> "asyncio.Future[List[Any]]":
+        """
+        Sends a get command, or a set command if desired values are given.
+
+        The command is written immediately, without waiting for it to be drained.
+
+        Returns a future resolving to the decoded values of the command. Set commands
+        resolve to a ValueNotChangedError if the returned values are not as desired.
+        """
+        command = BatchCommand(spec, desired_values)
+        future = self.__send(spec, command.encode())
+        return asyncio.ensure_future(self.__complete(spec, desired_values, future))
+
+    async def get(self, spec: CommandSpec) -> List[Any]:
+        """
+        Gets the value(s) of the spec's target from the switch.
+        """
+        future = self.__send(spec, spec.get_request)
+        await self.__writer.drain()
+        response = await future
+        return decode_response(self.__protocol, spec, response)
+
+    async def set(self, spec: CommandSpec, desired_values: List[Any]) -> None:
+        """
+        Sets the spec's target on the switch to the desired value(s).
+
+        Within a transaction in the calling task, the set is buffered until commit.
+
+        Raises ValueNotChangedError if the returned values are different than the desired values.
+        """
+        transaction = self.__transactions.get(asyncio.current_task())
+        if transaction is not None:
+            transaction.set(spec, desired_values)
+            return
+        future = self.__send(spec, spec.encode_set(desired_values))
+        await self.__writer.drain()
+        response = await future
+        decode_response(self.__protocol, spec, response, desired_values)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Transaction]:
+        """
+        Buffers every set made by the calling task, then sends them together on exit.
+
+        Buffered sets are coalesced into the fewest commands with the same effect, and
+        are sent with a single write. Nothing is sent if the block raises an exception.
+        Transactions nested within another in the same task join the outer one.
+
+        Raises ValueNotChangedError if a set returns different than desired values.
+        """
+        task = asyncio.current_task()
+        transaction = self.__transactions.get(task)
+        if transaction is not None:
+            yield transaction
+            return
+
+        transaction = Transaction()
+        self.__transactions[task] = transaction
+        try:
+            yield transaction
+        finally:
+            del self.__transactions[task]
+        await self.execute_many(transaction.commands())
+
+    async def execute_many(self, commands: Sequence[BatchCommand]) -> List[List[Any]]:
+        """
+        Executes many get/set commands with a single write to the switch.
+
+        Returns a list holding the decoded values of each command, in command order.
+
+        Raises ValueNotChangedError if a set command returns different than desired values.
+        """
+        futures = [self.__send(command.spec, command.encode()) for command in commands]
+        try:
+            await self.__writer.drain()
+            responses = [await future for future in futures]
+        except asyncio.CancelledError:
+            # Abandon the whole batch, not only the command being awaited
+            for future in futures:
+                future.cancel()
+            raise
+
+        results = []
+        for command, response in zip(commands, responses):
+            results.append(
+                decode_response(
+                    self.__protocol, command.spec, response, command.desired_values
+                )
+            )
+        return results
+
+    async def read_snapshot(self) -> DeviceSnapshot:
+        """
+        Reads the values of every implemented target from the switch in one batch.
+        """
+        return decode_snapshot(await self.execute_many(SNAPSHOT_COMMANDS))
+
+    # Actions
+    async def factory_reset(self, reset_data: ResetDataType) -> None:
+        """
+        Resets the requested data on the VRROOM switch.
+        """
+        await self.set(SPEC_ACTION_FACTORY_RESET, [reset_data])
+
+    async def hotplug(self) -> None:
+        """
+        Sends a hotplug event to the sources on the VRROOM switch.
+        """
+        await self.set(SPEC_ACTION_HOTPLUG, [])
+
+    async def reboot(self) -> None:
+        """
+        Reboots the VRROOM switch.
+        """
+        await self.set(SPEC_ACTION_REBOOT, [])
+
+    # Inputs
+    async def get_selected_inputs(self) -> List[Input]:
+        """
+        Gets the currently selected inputs of the switch.
+        """
+        return await self.get(SPEC_SELECTED_INPUTS)
+
+    async def set_selected_inputs(self, input_tx0: Input, input_tx1: Input) -> None:
+        """
+        Sets the currently selected inputs of the switch.
+        """
+        await self.set(SPEC_SELECTED_INPUTS, [input_tx0, input_tx1])
+
+    async def get_selected_input_tx0(self) -> Input:
+        """
+        Gets the currently selected input for output TX0.
+        """
+        returned_values = await self.get(SPEC_SELECTED_INPUT_TX0)
+        return returned_values[0]
+
+    async def get_selected_input_tx1(self) -> Input:
+        """
+        Gets the currently selected input for output TX1.
+        """
+        returned_values = await self.get(SPEC_SELECTED_INPUT_TX1)
+        return returned_values[0]
+
+    async def set_selected_input_tx0(self, input: Input) -> None:
+        """
+        Sets the currently selected input for output TX0.
+        """
+        await self.set(SPEC_SELECTED_INPUT_TX0, [input])
+
+    async def set_selected_input_tx1(self, input: Input) -> None:
+        """
+        Sets the currently selected input for output TX1.
+        """
+        await self.set(SPEC_SELECTED_INPUT_TX1, [input])
+
+    # Modes
+    async def get_operation_mode(self) -> OperationMode:
+        """
+        Gets the current operation mode of the switch.
+        """
+        returned_values = await self.get(SPEC_OPERATION_MODE)
+        return returned_values[0]
+
+    async def set_operation_mode(self, op_mode: OperationMode) -> None:
+        """
+        Sets the operation mode of the switch.
+        """
+        await self.set(SPEC_OPERATION_MODE, [op_mode])
+
+    async def get_autoswitch_enabled(self) -> bool:
+        """
+        Gets whether automatic input switching is enabled on the switch.
+        """
+        returned_values = await self.get(SPEC_AUTO_SWITCHING)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_autoswitch_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables automatic input switching on the switch.
+        """
+        await self.set(SPEC_AUTO_SWITCHING, [OnOffSwitch.from_bool(enabled)])
+
+    # Network
+    async def get_ip_address(self) -> IpAddressV4:
+        """
+        Gets the current IP address of the switch.
+        """
+        returned_values = await self.get(SPEC_IP_ADDRESS)
+        return returned_values[0]
+
+    async def set_ip_address(self, address: IpAddressV4) -> None:
+        """
+        Sets the IP address of the switch.
+        """
+        await self.set(SPEC_IP_ADDRESS, [address])
+
+    async def get_ip_network_mask(self) -> IpAddressV4:
+        """
+        Gets the current IP network mask of the switch.
+        """
+        returned_values = await self.get(SPEC_IP_NETWORK_MASK)
+        return returned_values[0]
+
+    async def set_ip_network_mask(self, address: IpAddressV4) -> None:
+        """
+        Sets the IP network mask of the switch.
+        """
+        await self.set(SPEC_IP_NETWORK_MASK, [address])
+
+    async def get_ip_gateway(self) -> IpAddressV4:
+        """
+        Gets the current IP gateway of the switch.
+        """
+        returned_values = await self.get(SPEC_IP_GATEWAY)
+        return returned_values[0]
+
+    async def set_ip_gateway(self, address: IpAddressV4) -> None:
+        """
+        Sets the IP gateway of the switch.
+        """
+        await self.set(SPEC_IP_GATEWAY, [address])
+
+    async def get_dhcp_enabled(self) -> bool:
+        """
+        Gets whether DHCP is enabled on the switch.
+        """
+        returned_values = await self.get(SPEC_DHCP_ENABLED)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_dhcp_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables DHCP on the switch.
+        """
+        await self.set(SPEC_DHCP_ENABLED, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_ip_interrupts_enabled(self) -> bool:
+        """
+        Gets whether IP interrupts are enabled on the switch.
+        """
+        returned_values = await self.get(SPEC_IP_INTERRUPTS_ENABLED)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_ip_interrupts_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables IP interrupts on the switch.
+        """
+        await self.set(SPEC_IP_INTERRUPTS_ENABLED, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_tcp_port(self) -> TcpPort:
+        """
+        Gets what TCP port is being used for commands on the switch.
+        """
+        returned_values = await self.get(SPEC_TCP_PORT)
+        return returned_values[0]
+
+    async def set_tcp_port(self, port: TcpPort) -> None:
+        """
+        Sets what TCP port is being used for commands on the switch.
+        """
+        await self.set(SPEC_TCP_PORT, [port])
+
+    async def get_mac_address(self) -> MacAddress:
+        """
+        Gets the MAC address of the switch.
+        """
+        returned_values = await self.get(SPEC_MAC_ADDRESS)
+        return returned_values[0]
+
+    # EDID
+    async def get_edid_frl_automix_enabled(self) -> bool:
+        """
+        Gets whether the FRL flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = await self.get(SPEC_EDID_FRL_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_edid_frl_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the FRL flag into the automix EDID of the switch.
+        """
+        await self.set(SPEC_EDID_FRL_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_edid_vrr_automix_enabled(self) -> bool:
+        """
+        Gets whether the VRR flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = await self.get(SPEC_EDID_VRR_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_edid_vrr_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the VRR flag into the automix EDID of the switch.
+        """
+        await self.set(SPEC_EDID_VRR_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_edid_allm_automix_enabled(self) -> bool:
+        """
+        Gets whether the ALLM flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = await self.get(SPEC_EDID_ALLM_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_edid_allm_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the ALLM flag into the automix EDID of the switch.
+        """
+        await self.set(SPEC_EDID_ALLM_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_edid_hdr_automix_enabled(self) -> bool:
+        """
+        Gets whether the HDR flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = await self.get(SPEC_EDID_HDR_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_edid_hdr_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the HDR flag into the automix EDID of the switch.
+        """
+        await self.set(SPEC_EDID_HDR_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_edid_dv_automix_enabled(self) -> bool:
+        """
+        Gets whether the Dolby Vision flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = await self.get(SPEC_EDID_DV_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_edid_dv_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the Dolby Vision flag into the automix EDID of the switch.
+        """
+        await self.set(SPEC_EDID_DV_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    # Video
+    async def get_hdr_custom_enabled(self) -> bool:
+        """
+        Gets whether the custom HDR infoframe is sent by the switch.
+        """
+        returned_values = await self.get(SPEC_HDR_CUSTOM)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_hdr_custom_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables sending the custom HDR infoframe from the switch.
+        """
+        await self.set(SPEC_HDR_CUSTOM, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_hdr_disabled(self) -> bool:
+        """
+        Gets whether HDR infoframes are removed by the switch.
+        """
+        returned_values = await self.get(SPEC_HDR_DISABLE)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_hdr_disabled(self, enabled: bool) -> None:
+        """
+        Enables/disables removing HDR infoframes on the switch.
+        """
+        await self.set(SPEC_HDR_DISABLE, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_avi_infoframe_custom_enabled(self) -> bool:
+        """
+        Gets whether the custom AVI infoframe is sent by the switch.
+        """
+        returned_values = await self.get(SPEC_AVI_INFOFRAME_CUSTOM)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_avi_infoframe_custom_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables sending the custom AVI infoframe from the switch.
+        """
+        await self.set(SPEC_AVI_INFOFRAME_CUSTOM, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_avi_infoframe_disabled(self) -> bool:
+        """
+        Gets whether AVI infoframes are removed by the switch.
+        """
+        returned_values = await self.get(SPEC_AVI_INFOFRAME_DISABLE)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_avi_infoframe_disabled(self, enabled: bool) -> None:
+        """
+        Enables/disables removing AVI infoframes on the switch.
+        """
+        await self.set(SPEC_AVI_INFOFRAME_DISABLE, [OnOffSwitch.from_bool(enabled)])
+
+    # Audio
+    async def get_hdmi_audio_muted_tx0(self) -> bool:
+        """
+        Gets whether HDMI audio is muted on output TX0.
+        """
+        returned_values = await self.get(SPEC_HDMI_MUTED_TX0)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_hdmi_audio_muted_tx0(self, enabled: bool) -> None:
+        """
+        Mutes/unmutes HDMI audio on output TX0.
+        """
+        await self.set(SPEC_HDMI_MUTED_TX0, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_hdmi_audio_muted_tx1(self) -> bool:
+        """
+        Gets whether HDMI audio is muted on output TX1.
+        """
+        returned_values = await self.get(SPEC_HDMI_MUTED_TX1)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    async def set_hdmi_audio_muted_tx1(self, enabled: bool) -> None:
+        """
+        Mutes/unmutes HDMI audio on output TX1.
+        """
+        await self.set(SPEC_HDMI_MUTED_TX1, [OnOffSwitch.from_bool(enabled)])
+
+    async def get_analog_volume(self) -> AnalogVolume:
+        """
+        Gets the volume of the analog audio output.
+        """
+        returned_values = await self.get(SPEC_ANALOG_VOLUME)
+        return returned_values[0]
+
+    async def set_analog_volume(self, volume: AnalogVolume) -> None:
+        """
+        Sets the volume of the analog audio output.
+        """
+        await self.set(SPEC_ANALOG_VOLUME, [volume])
+
+    async def get_analog_bass(self) -> AnalogTone:
+        """
+        Gets the bass adjustment of the analog audio output.
+        """
+        returned_values = await self.get(SPEC_ANALOG_BASS)
+        return returned_values[0]
+
+    async def set_analog_bass(self, bass: AnalogTone) -> None:
+        """
+        Sets the bass adjustment of the analog audio output.
+        """
+        await self.set(SPEC_ANALOG_BASS, [bass])
+
+    async def get_analog_treble(self) -> AnalogTone:
+        """
+        Gets the treble adjustment of the analog audio output.
+        """
+        returned_values = await self.get(SPEC_ANALOG_TREBLE)
+        return returned_values[0]
+
+    async def set_analog_treble(self, treble: AnalogTone) -> None:
+        """
+        Sets the treble adjustment of the analog audio output.
+        """
+        await self.set(SPEC_ANALOG_TREBLE, [treble])
+
+    # OLED
+    async def get_oled_fade_time(self) -> OledFadeTime:
+        """
+        Gets the time before the OLED display fades.
+        """
+        returned_values = await self.get(SPEC_OLED_FADE_TIME)
+        return returned_values[0]
+
+    async def set_oled_fade_time(self, fade_time: OledFadeTime) -> None:
+        """
+        Sets the time before the OLED display fades.
+        """
+        await self.set(SPEC_OLED_FADE_TIME, [fade_time])
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+
+"""
+Contains transports that record the bytes of a VRROOM connection to a capture file, and replay them.
+"""
+
+from array import array
+from enum import Enum
+import mmap
+import socket
+import struct
+import time
+from typing import (
+    Any,
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .exceptions import ReplayMismatchError
+
+# Capture files start with this magic, followed by records of a header and payload
+CAPTURE_MAGIC = b"VRROOMCAP1\n"
+# Each record header holds its direction, seconds since capture start and length
+_RECORD_HEADER = struct.Struct("<cdI")
+
+
+class CaptureDirection(Enum):
+    """
+    Enumerates the directions of the bytes held by a capture record.
+    """
+
+    SENT = b">"
+    RECEIVED = b"<"
+
+
+class CaptureRecord(NamedTuple):
+    """
+    Holds the bytes of a single send or receive, and when it happened.
+
+    Timestamps are seconds since the capture started, from a monotonic clock.
+    """
+
+    direction: CaptureDirection
+    timestamp: float
+    data: bytes
+
+
+class RecordingSocket:
+    """
+    Wraps a connected socket, recording every byte sent and received to a capture file.
+
+    Each sendall and recv is recorded as it happens, so that the capture keeps the
+    original segment boundaries and timing of the received stream. The file is only
+    ever appended to, and is flushed after every record, so that a capture survives
+    the process crashing. Every other attribute is passed through to the socket.
+    """
+
+    def __init__(self, wrapped: socket.socket, capture_path: str) -> None:
+        self.__socket = wrapped
+        # The file stays open for the life of the socket, so is closed by close()
+        self.__file: BinaryIO = open(  # pylint: disable=consider-using-with
+            capture_path, "ab"
+        )
+        if self.__file.tell() == 0:
+            self.__file.write(CAPTURE_MAGIC)
+        self.__start_time = time.monotonic()
+        self.record_count = 0
+
+    def __enter__(self) -> "RecordingSocket":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__socket, name)
+
+    def __record(self, direction: CaptureDirection, data: bytes) -> None:
+        timestamp = time.monotonic() - self.__start_time
+        self.__file.write(_RECORD_HEADER.pack(direction.value, timestamp, len(data)))
+        self.__file.write(data)
+        self.__file.flush()
+        self.record_count += 1
+
+    def sendall(self, data: bytes) -> None:
+        """
+        Sends every byte of the data on the socket, recording it once sent.
+        """
+        self.__socket.sendall(data)
+        self.__record(CaptureDirection.SENT, bytes(data))
+
+    def recv(self, buffer_size: int) -> bytes:
+        """
+        Receives up to the buffer size of bytes from the socket, recording them.
+        """
+        received = self.__socket.recv(buffer_size)
+        self.__record(CaptureDirection.RECEIVED, received)
+        return received
+
+    def close(self) -> None:
+        """
+        Closes the socket and the capture file.
+        """
+        self.__socket.close()
+        self.__file.close()
+
+
+def _index_records(buffer: Any) -> Iterator[Tuple[CaptureDirection, float, int, int]]:
+    if buffer[: len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+        raise ValueError("File is not a VRROOM capture!")
+    offset = len(CAPTURE_MAGIC)
+    # A record cut short by a crash while recording is ignored
+    while offset + _RECORD_HEADER.size <= len(buffer):
+        direction, timestamp, length = _RECORD_HEADER.unpack_from(buffer, offset)
+        offset += _RECORD_HEADER.size
+        if offset + length > len(buffer):
+            break
+        yield CaptureDirection(direction), timestamp, offset, length
+        offset += length
+
+
+def _read_records(buffer: Any) -> Iterator[CaptureRecord]:
+    for direction, timestamp, offset, length in _index_records(buffer):
+        yield CaptureRecord(direction, timestamp, buffer[offset : offset + length])
+
+
+class _CaptureIndex:
+    """
+    Holds where each record of one direction lies within a capture, and when it happened.
+    """
+
+    def __init__(self) -> None:
+        self.offsets = array("Q")
+        self.lengths = array("Q")
+        self.timestamps = array("d")
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def append(self, offset: int, length: int, timestamp: float) -> None:
+        """
+        Adds a record at the given offset into the capture.
+        """
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.timestamps.append(timestamp)
+
+
+def read_capture(capture_path: str) -> List[CaptureRecord]:
+    """
+    Reads every record of a capture file.
+
+    Raises ValueError if the file is not a capture.
+    """
+    with open(capture_path, "rb") as capture_file:
+        return list(_read_records(capture_file.read()))
+
+
+def write_capture(capture_path: str, records: Iterable[CaptureRecord]) -> None:
+    """
+    Writes the records to a new capture file, replacing any existing file.
+    """
+    with open(capture_path, "wb") as capture_file:
+        capture_file.write(CAPTURE_MAGIC)
+        for record in records:
+            capture_file.write(
+                _RECORD_HEADER.pack(
+                    record.direction.value, record.timestamp, len(record.data)
+                )
+            )
+            capture_file.write(record.data)
+
+
+class ReplaySocket:
+    """
+    Stands in for a socket, answering from the received stream of a capture file.
+
+    The capture is memory-mapped and only indexed up front, so every recv returns the
+    next received segment exactly as it was recorded, sliced from the map as it is
+    needed. Commands are decoded from the original byte stream without any device
+    or network. Replay runs as fast as possible by default, or in real time, in which
+    case each segment is held back until as long after the preceding send as it was
+    originally received.
+
+    Sent bytes are compared against the recorded sends unless verification is off.
+    Once the received stream runs out, recv returns no bytes, as a closed socket does.
+    """
+
+    def __init__(
+        self, capture_path: str, real_time: bool = False, verify: bool = True
+    ) -> None:
+        self.real_time = real_time
+        self.verify = verify
+        with open(capture_path, "rb") as capture_file:
+            self.__map = mmap.mmap(capture_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__sent = _CaptureIndex()
+        self.__received = _CaptureIndex()
+        for direction, timestamp, offset, length in _index_records(self.__map):
+            if direction == CaptureDirection.SENT:
+                self.__sent.append(offset, length, timestamp)
+            else:
+                self.__received.append(offset, length, timestamp)
+        # Sends are compared from a position within a sent record
+        self.__send_index = 0
+        self.__send_position = 0
+        # Receives are replayed from the unread span of the latest received record
+        self.__receive_index = 0
+        self.__pending_offset = 0
+        self.__pending_end = 0
+        # The replay and recorded times of the latest send, which receives are timed from
+        self.__anchor = (time.monotonic(), 0.0)
+
+    def __enter__(self) -> "ReplaySocket":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def remaining_count(self) -> int:
+        """
+        Returns the number of received segments not yet replayed.
+        """
+        return len(self.__received) - self.__receive_index
+
+    def rewind(self) -> None:
+        """
+        Restarts the replay from the start of the capture.
+        """
+        self.__send_index = 0
+        self.__send_position = 0
+        self.__receive_index = 0
+        self.__pending_offset = 0
+        self.__pending_end = 0
+        self.__anchor = (time.monotonic(), 0.0)
+
+    def __expected_sends(self, index: int, position: int, length: int) -> bytes:
+        expected = b""
+        while len(expected) < length and index < len(self.__sent):
+            offset = self.__sent.offsets[index] + position
+            end = self.__sent.offsets[index] + self.__sent.lengths[index]
+            expected += self.__map[offset : min(end, offset + length - len(expected))]
+            index += 1
+            position = 0
+        return expected
+
+    def sendall(self, data: bytes) -> None:
+        """
+        Accepts the data, checking that it matches what was originally sent.
+
+        Raises ReplayMismatchError if verifying and the data was not sent next.
+        """
+        sent = self.__sent
+        recorded_time = self.__anchor[1]
+        if self.__send_index < len(sent):
+            recorded_time = sent.timestamps[self.__send_index]
+        self.__anchor = (time.monotonic(), recorded_time)
+        if not self.verify:
+            return
+
+        data = bytes(data)
+        index, position = self.__send_index, self.__send_position
+        compared = 0
+        while compared < len(data) and index < len(sent):
+            count = min(sent.lengths[index] - position, len(data) - compared)
+            offset = sent.offsets[index] + position
+            if self.__map[offset : offset + count] != data[compared : compared + count]:
+                break
+            compared += count
+            position += count
+            if position == sent.lengths[index]:
+                index += 1
+                position = 0
+        if compared < len(data):
+            expected = self.__expected_sends(
+                self.__send_index, self.__send_position, len(data)
+            )
+            raise ReplayMismatchError(
+                f"Sent {data!r} where the capture next sent {expected!r}!"
+            )
+        self.__send_index, self.__send_position = index, position
+
+    def recv(self, buffer_size: int) -> bytes:
+        """
+        Returns the next received segment of the capture, up to the buffer size.
+        """
+        if self.__pending_offset == self.__pending_end:
+            received = self.__received
+            if self.__receive_index >= len(received):
+                return b""
+            index = self.__receive_index
+            self.__receive_index += 1
+            if self.real_time:
+                replay_time, recorded_time = self.__anchor
+                delay = (
+                    replay_time
+                    + received.timestamps[index]
+                    - recorded_time
+                    - time.monotonic()
+                )
+                if delay > 0:
+                    time.sleep(delay)
+            self.__pending_offset = received.offsets[index]
+            self.__pending_end = self.__pending_offset + received.lengths[index]
+
+        offset = self.__pending_offset
+        self.__pending_offset = min(offset + buffer_size, self.__pending_end)
+        return self.__map[offset : self.__pending_offset]
+
+    def close(self) -> None:
+        """
+        Unmaps the capture file.
+        """
+        self.__map.close()
+
+
+def record_connection(
+    host: str, port: int, capture_path: str, timeout: Optional[float] = None
+) -> RecordingSocket:
+    """
+    Opens a connection to the switch at the given address, recording it to the capture.
+    """
+    return RecordingSocket(
+        socket.create_connection((host, port), timeout), capture_path
+    )
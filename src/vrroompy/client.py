@@ -0,0 +1,779 @@
+#!/usr/bin/env python3
+
+"""
+Contains a thread-safe client for sharing one VRROOM connection between threads.
+"""
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+import socket
+import threading
+import time
+from typing import Any, Callable, Iterator, List, NamedTuple, Optional, Sequence
+
+from .codec import ValidationLevel
+from .commands import (
+    DEFAULT_RECEIVE_BUFFER_SIZE,
+    BatchCommand,
+    decode_response,
+)
+from .commands.actions import (
+    ResetDataType,
+    SPEC_ACTION_FACTORY_RESET,
+    SPEC_ACTION_HOTPLUG,
+    SPEC_ACTION_REBOOT,
+)
+from .commands.audio import (
+    AnalogTone,
+    AnalogVolume,
+    SPEC_ANALOG_BASS,
+    SPEC_ANALOG_TREBLE,
+    SPEC_ANALOG_VOLUME,
+    SPEC_HDMI_MUTED_TX0,
+    SPEC_HDMI_MUTED_TX1,
+)
+from .commands.edid import (
+    SPEC_EDID_ALLM_AUTOMIX,
+    SPEC_EDID_DV_AUTOMIX,
+    SPEC_EDID_FRL_AUTOMIX,
+    SPEC_EDID_HDR_AUTOMIX,
+    SPEC_EDID_VRR_AUTOMIX,
+)
+from .commands.enums import OnOffSwitch
+from .commands.input import (
+    Input,
+    SPEC_SELECTED_INPUTS,
+    SPEC_SELECTED_INPUT_TX0,
+    SPEC_SELECTED_INPUT_TX1,
+)
+from .commands.modes import OperationMode, SPEC_AUTO_SWITCHING, SPEC_OPERATION_MODE
+from .commands.network import (
+    IpAddressV4,
+    MacAddress,
+    TcpPort,
+    SPEC_DHCP_ENABLED,
+    SPEC_IP_ADDRESS,
+    SPEC_IP_GATEWAY,
+    SPEC_IP_INTERRUPTS_ENABLED,
+    SPEC_IP_NETWORK_MASK,
+    SPEC_MAC_ADDRESS,
+    SPEC_TCP_PORT,
+)
+from .commands.oled import (
+    OledFadeTime,
+    SPEC_OLED_FADE_TIME,
+)
+from .commands.snapshot import SNAPSHOT_COMMANDS, DeviceSnapshot, decode_snapshot
+from .commands.spec import CommandSpec
+from .commands.transaction import Transaction
+from .commands.video import (
+    SPEC_AVI_INFOFRAME_CUSTOM,
+    SPEC_AVI_INFOFRAME_DISABLE,
+    SPEC_HDR_CUSTOM,
+    SPEC_HDR_DISABLE,
+)
+from .exceptions import (
+    ConnectionClosedError,
+    ResponseMissingError,
+    ResponseParsingError,
+    ValueNotChangedError,
+)
+from .protocol import (
+    InterruptCallback,
+    InterruptEvent,
+    InterruptSubscribers,
+    PendingCommand,
+    Response,
+    VrroomProtocol,
+)
+from .recorder import FlightRecorder
+
+
+class _ClientRequest(NamedTuple):
+    """
+    Holds what the reader thread needs to complete a command sent by the client.
+    """
+
+    future: "Future[List[Any]]"
+    spec: CommandSpec
+    desired_values: Optional[List[Any]]
+
+
+class VrroomClient:
+    """
+    Controls a VRROOM switch over a socket that may be shared between threads.
+
+    The client owns the socket and runs a background thread that reads every
+    response and completes the future of the command it belongs to. Threads only
+    serialise the brief act of sending, so commands from many threads are pipelined
+    on the one connection rather than waiting on each other's round trips.
+    Responses are matched to commands by target, so a reply the switch drops fails
+    only its own command, with ResponseMissingError once a later one is answered.
+
+    Interrupt messages are passed to subscribed callbacks on the reader thread.
+    If a flight recorder is given, it records the connection's recent traffic.
+    """
+
+    def __init__(
+        self,
+        socket: socket.socket,
+        validation_level: ValidationLevel = ValidationLevel.STRICT,
+        flight_recorder: Optional[FlightRecorder] = None,
+    ) -> None:
+        self.__socket = socket
+        self.__protocol = VrroomProtocol(validation_level, flight_recorder)
+        self.__protocol_lock = threading.Lock()
+        # Interrupts are collected under the protocol lock, then dispatched outside it
+        self.__interrupt_events: List[InterruptEvent] = []
+        self.__interrupt_subscribers = InterruptSubscribers()
+        self.__protocol.subscribe_interrupts(self.__interrupt_events.append)
+        # Likewise, commands the switch skipped are collected, then failed outside it
+        self.__skipped_commands: List[PendingCommand] = []
+        self.__protocol.on_skipped = self.__skipped_commands.append
+        self.__send_lock = threading.Lock()
+        self.__transactions = threading.local()
+        self.__closed = False
+        self.__reader_thread = threading.Thread(
+            target=self.__read_responses, name="VrroomClientReader", daemon=True
+        )
+        self.__reader_thread.start()
+
+    @staticmethod
+    def connect(
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        validation_level: ValidationLevel = ValidationLevel.STRICT,
+        flight_recorder: Optional[FlightRecorder] = None,
+    ) -> "VrroomClient":
+        """
+        Opens a connection to the switch at the given address.
+        """
+        vrroom_socket = socket.create_connection((host, port), timeout)
+        # The reader thread blocks on the socket; timeouts apply to awaiting futures instead
+        vrroom_socket.settimeout(None)
+        return VrroomClient(vrroom_socket, validation_level, flight_recorder)
+
+    def __enter__(self) -> "VrroomClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the connection, failing any commands still awaiting a response.
+        """
+        self.__closed = True
+        try:
+            self.__socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Already disconnected
+        if self.__reader_thread is not threading.current_thread():
+            self.__reader_thread.join()
+        self.__socket.close()
+
+    def __complete(self, response: Response) -> None:
+        request: _ClientRequest = response.command.context
+        if not request.future.set_running_or_notify_cancel():
+            return  # The caller gave up on this command; drop its response
+
+        try:
+            returned_values = decode_response(
+                self.__protocol,
+                request.spec,
+                response,
+                request.desired_values,
+                annotate=False,
+            )
+        except (ResponseParsingError, ValueNotChangedError) as error:
+            flight_recorder = self.__protocol.flight_recorder
+            if flight_recorder is not None:
+                # Sending threads record to the flight recorder under the protocol lock
+                with self.__protocol_lock:
+                    flight_recorder.annotate(error)
+            request.future.set_exception(error)
+        except Exception as error:
+            request.future.set_exception(error)
+        else:
+            request.future.set_result(returned_values)
+
+    def __fail_pending(self, error: Exception) -> None:
+        with self.__protocol_lock:
+            pending_commands = self.__protocol.pending_commands
+            self.__protocol.clear()
+        for command in pending_commands:
+            if command.context.future.set_running_or_notify_cancel():
+                command.context.future.set_exception(error)
+
+    def __abandon_cancelled(self, future: "Future[List[Any]]") -> None:
+        if not future.cancelled():
+            return
+        with self.__protocol_lock:
+            for command in self.__protocol.pending_commands:
+                if command.context.future is future:
+                    self.__protocol.abandon(command)
+                    break
+
+    def __read_responses(self) -> None:
+        while True:
+            try:
+                received = self.__socket.recv(DEFAULT_RECEIVE_BUFFER_SIZE)
+            except OSError:
+                received = b""
+            if not received:
+                break
+
+            responses = []
+            with self.__protocol_lock:
+                self.__protocol.receive_data(received)
+                response = self.__protocol.next_response()
+                while response is not None:
+                    responses.append(response)
+                    response = self.__protocol.next_response()
+                interrupt_events = self.__interrupt_events[:]
+                self.__interrupt_events.clear()
+                skipped_commands = self.__skipped_commands[:]
+                self.__skipped_commands.clear()
+            for command in skipped_commands:
+                if command.context.future.set_running_or_notify_cancel():
+                    command.context.future.set_exception(
+                        ResponseMissingError(
+                            f"Switch answered later commands, but not '{command.target}'!"
+                        )
+                    )
+            for response in responses:
+                if response.command is not None:
+                    self.__complete(response)
+            for event in interrupt_events:
+                self.__interrupt_subscribers.dispatch(event)
+
+        # Under the send lock, so no command can be sent after the pending ones are failed
+        with self.__send_lock:
+            self.__closed = True
+            self.__fail_pending(
+                ConnectionClosedError("Connection to switch was closed!")
+            )
+
+    def subscribe_interrupts(self, callback: InterruptCallback) -> Callable[[], None]:
+        """
+        Subscribes the callback to every interrupt message subsequently received.
+
+        Callbacks are called on the reader thread, so must not wait on commands sent
+        through this client, which are completed by that same thread.
+
+        Returns a function that unsubscribes the callback when called.
+        """
+        return self.__interrupt_subscribers.subscribe(callback)
+
+    def submit_many(
+        self, commands: Sequence[BatchCommand]
+    ) -> "List[Future[List[Any]]]":
+        """
+        Sends many get/set commands with a single write, without awaiting responses.
+
+        Returns a future for each command, resolving to its decoded values.
+
+        Raises ConnectionClosedError if the client has been closed.
+        """
+        futures = []
+        requests = []
+        with self.__send_lock:
+            if self.__closed:
+                raise ConnectionClosedError("Connection to switch is closed!")
+            with self.__protocol_lock:
+                for command in commands:
+                    request = _ClientRequest(
+                        Future(), command.spec, command.desired_values
+                    )
+                    pending = self.__protocol.send_command(
+                        command.spec.target, command.encode(), request
+                    )
+                    # Cancelled commands are abandoned, so cannot hold up later ones
+                    request.future.add_done_callback(self.__abandon_cancelled)
+                    futures.append(request.future)
+                    requests.append(pending.request)
+            try:
+                self.__socket.sendall(b"".join(requests))
+            except OSError:
+                # Unblock the reader thread, which fails every pending command
+                self.__socket.shutdown(socket.SHUT_RDWR)
+                raise
+        return futures
+
+    def submit(
+        self, spec: CommandSpec, desired_values: Optional[List[Any]] = None
+    ) -> "Future[List[Any]]":
+        """
+        Sends a get command, or a set command if desired values are given.
+
+        Returns a future resolving to the decoded values of the command. Set commands
+        resolve to a ValueNotChangedError if the returned values are not as desired.
+
+        Raises ConnectionClosedError if the client has been closed.
+        """
+        return self.submit_many([BatchCommand(spec, desired_values)])[0]
+
+    def __result(
+        self, future: "Future[List[Any]]", timeout: Optional[float]
+    ) -> List[Any]:
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def get(self, spec: CommandSpec, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Gets the value(s) of the spec's target from the switch.
+        """
+        return self.__result(self.submit(spec), timeout)
+
+    def set(
+        self,
+        spec: CommandSpec,
+        desired_values: List[Any],
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Sets the spec's target on the switch to the desired value(s).
+
+        Within a transaction on the calling thread, the set is buffered until commit.
+
+        Raises ValueNotChangedError if the returned values are different than the desired values.
+        """
+        transaction = getattr(self.__transactions, "current", None)
+        if transaction is not None:
+            transaction.set(spec, desired_values)
+            return
+        self.__result(self.submit(spec, list(desired_values)), timeout)
+
+    @contextmanager
+    def transaction(self, timeout: Optional[float] = None) -> Iterator[Transaction]:
+        """
+        Buffers every set made by the calling thread, then sends them together on exit.
+
+        Buffered sets are coalesced into the fewest commands with the same effect, and
+        are sent with a single write. Nothing is sent if the block raises an exception.
+        Transactions nested within another on the same thread join the outer one.
+
+        Raises ValueNotChangedError if a set returns different than desired values.
+        """
+        transaction = getattr(self.__transactions, "current", None)
+        if transaction is not None:
+            yield transaction
+            return
+
+        transaction = Transaction()
+        self.__transactions.current = transaction
+        try:
+            yield transaction
+        finally:
+            self.__transactions.current = None
+        self.execute_many(transaction.commands(), timeout)
+
+    def execute_many(
+        self, commands: Sequence[BatchCommand], timeout: Optional[float] = None
+    ) -> List[List[Any]]:
+        """
+        Executes many get/set commands with a single write to the switch.
+
+        The timeout applies to the batch as a whole; if it expires, every command of the
+        batch not yet answered is given up on.
+
+        Returns a list holding the decoded values of each command, in command order.
+
+        Raises ValueNotChangedError if a set command returns different than desired values.
+        """
+        futures = self.submit_many(commands)
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+        results = []
+        try:
+            for future in futures:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0.0)
+                results.append(future.result(remaining))
+        except FutureTimeoutError:
+            for future in futures:
+                future.cancel()
+            raise
+        return results
+
+    def read_snapshot(self) -> DeviceSnapshot:
+        """
+        Reads the values of every implemented target from the switch in one batch.
+        """
+        return decode_snapshot(self.execute_many(SNAPSHOT_COMMANDS))
+
+    # Actions
+    def factory_reset(self, reset_data: ResetDataType) -> None:
+        """
+        Resets the requested data on the VRROOM switch.
+        """
+        self.set(SPEC_ACTION_FACTORY_RESET, [reset_data])
+
+    def hotplug(self) -> None:
+        """
+        Sends a hotplug event to the sources on the VRROOM switch.
+        """
+        self.set(SPEC_ACTION_HOTPLUG, [])
+
+    def reboot(self) -> None:
+        """
+        Reboots the VRROOM switch.
+        """
+        self.set(SPEC_ACTION_REBOOT, [])
+
+    # Inputs
+    def get_selected_inputs(self) -> List[Input]:
+        """
+        Gets the currently selected inputs of the switch.
+        """
+        return self.get(SPEC_SELECTED_INPUTS)
+
+    def set_selected_inputs(self, input_tx0: Input, input_tx1: Input) -> None:
+        """
+        Sets the currently selected inputs of the switch.
+        """
+        self.set(SPEC_SELECTED_INPUTS, [input_tx0, input_tx1])
+
+    def get_selected_input_tx0(self) -> Input:
+        """
+        Gets the currently selected input for output TX0.
+        """
+        returned_values = self.get(SPEC_SELECTED_INPUT_TX0)
+        return returned_values[0]
+
+    def get_selected_input_tx1(self) -> Input:
+        """
+        Gets the currently selected input for output TX1.
+        """
+        returned_values = self.get(SPEC_SELECTED_INPUT_TX1)
+        return returned_values[0]
+
+    def set_selected_input_tx0(self, input: Input) -> None:
+        """
+        Sets the currently selected input for output TX0.
+        """
+        self.set(SPEC_SELECTED_INPUT_TX0, [input])
+
+    def set_selected_input_tx1(self, input: Input) -> None:
+        """
+        Sets the currently selected input for output TX1.
+        """
+        self.set(SPEC_SELECTED_INPUT_TX1, [input])
+
+    # Modes
+    def get_operation_mode(self) -> OperationMode:
+        """
+        Gets the current operation mode of the switch.
+        """
+        returned_values = self.get(SPEC_OPERATION_MODE)
+        return returned_values[0]
+
+    def set_operation_mode(self, op_mode: OperationMode) -> None:
+        """
+        Sets the operation mode of the switch.
+        """
+        self.set(SPEC_OPERATION_MODE, [op_mode])
+
+    def get_autoswitch_enabled(self) -> bool:
+        """
+        Gets whether automatic input switching is enabled on the switch.
+        """
+        returned_values = self.get(SPEC_AUTO_SWITCHING)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_autoswitch_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables automatic input switching on the switch.
+        """
+        self.set(SPEC_AUTO_SWITCHING, [OnOffSwitch.from_bool(enabled)])
+
+    # Network
+    def get_ip_address(self) -> IpAddressV4:
+        """
+        Gets the current IP address of the switch.
+        """
+        returned_values = self.get(SPEC_IP_ADDRESS)
+        return returned_values[0]
+
+    def set_ip_address(self, address: IpAddressV4) -> None:
+        """
+        Sets the IP address of the switch.
+        """
+        self.set(SPEC_IP_ADDRESS, [address])
+
+    def get_ip_network_mask(self) -> IpAddressV4:
+        """
+        Gets the current IP network mask of the switch.
+        """
+        returned_values = self.get(SPEC_IP_NETWORK_MASK)
+        return returned_values[0]
+
+    def set_ip_network_mask(self, address: IpAddressV4) -> None:
+        """
+        Sets the IP network mask of the switch.
+        """
+        self.set(SPEC_IP_NETWORK_MASK, [address])
+
+    def get_ip_gateway(self) -> IpAddressV4:
+        """
+        Gets the current IP gateway of the switch.
+        """
+        returned_values = self.get(SPEC_IP_GATEWAY)
+        return returned_values[0]
+
+    def set_ip_gateway(self, address: IpAddressV4) -> None:
+        """
+        Sets the IP gateway of the switch.
+        """
+        self.set(SPEC_IP_GATEWAY, [address])
+
+    def get_dhcp_enabled(self) -> bool:
+        """
+        Gets whether DHCP is enabled on the switch.
+        """
+        returned_values = self.get(SPEC_DHCP_ENABLED)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_dhcp_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables DHCP on the switch.
+        """
+        self.set(SPEC_DHCP_ENABLED, [OnOffSwitch.from_bool(enabled)])
+
+    def get_ip_interrupts_enabled(self) -> bool:
+        """
+        Gets whether IP interrupts are enabled on the switch.
+        """
+        returned_values = self.get(SPEC_IP_INTERRUPTS_ENABLED)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_ip_interrupts_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables IP interrupts on the switch.
+        """
+        self.set(SPEC_IP_INTERRUPTS_ENABLED, [OnOffSwitch.from_bool(enabled)])
+
+    def get_tcp_port(self) -> TcpPort:
+        """
+        Gets what TCP port is being used for commands on the switch.
+        """
+        returned_values = self.get(SPEC_TCP_PORT)
+        return returned_values[0]
+
+    def set_tcp_port(self, port: TcpPort) -> None:
+        """
+        Sets what TCP port is being used for commands on the switch.
+        """
+        self.set(SPEC_TCP_PORT, [port])
+
+    def get_mac_address(self) -> MacAddress:
+        """
+        Gets the MAC address of the switch.
+        """
+        returned_values = self.get(SPEC_MAC_ADDRESS)
+        return returned_values[0]
+
+    # EDID
+    def get_edid_frl_automix_enabled(self) -> bool:
+        """
+        Gets whether the FRL flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = self.get(SPEC_EDID_FRL_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_edid_frl_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the FRL flag into the automix EDID of the switch.
+        """
+        self.set(SPEC_EDID_FRL_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    def get_edid_vrr_automix_enabled(self) -> bool:
+        """
+        Gets whether the VRR flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = self.get(SPEC_EDID_VRR_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_edid_vrr_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the VRR flag into the automix EDID of the switch.
+        """
+        self.set(SPEC_EDID_VRR_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    def get_edid_allm_automix_enabled(self) -> bool:
+        """
+        Gets whether the ALLM flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = self.get(SPEC_EDID_ALLM_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_edid_allm_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the ALLM flag into the automix EDID of the switch.
+        """
+        self.set(SPEC_EDID_ALLM_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    def get_edid_hdr_automix_enabled(self) -> bool:
+        """
+        Gets whether the HDR flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = self.get(SPEC_EDID_HDR_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_edid_hdr_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the HDR flag into the automix EDID of the switch.
+        """
+        self.set(SPEC_EDID_HDR_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    def get_edid_dv_automix_enabled(self) -> bool:
+        """
+        Gets whether the Dolby Vision flag is mixed into the automix EDID of the switch.
+        """
+        returned_values = self.get(SPEC_EDID_DV_AUTOMIX)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_edid_dv_automix_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables mixing the Dolby Vision flag into the automix EDID of the switch.
+        """
+        self.set(SPEC_EDID_DV_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+    # Video
+    def get_hdr_custom_enabled(self) -> bool:
+        """
+        Gets whether the custom HDR infoframe is sent by the switch.
+        """
+        returned_values = self.get(SPEC_HDR_CUSTOM)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_hdr_custom_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables sending the custom HDR infoframe from the switch.
+        """
+        self.set(SPEC_HDR_CUSTOM, [OnOffSwitch.from_bool(enabled)])
+
+    def get_hdr_disabled(self) -> bool:
+        """
+        Gets whether HDR infoframes are removed by the switch.
+        """
+        returned_values = self.get(SPEC_HDR_DISABLE)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_hdr_disabled(self, enabled: bool) -> None:
+        """
+        Enables/disables removing HDR infoframes on the switch.
+        """
+        self.set(SPEC_HDR_DISABLE, [OnOffSwitch.from_bool(enabled)])
+
+    def get_avi_infoframe_custom_enabled(self) -> bool:
+        """
+        Gets whether the custom AVI infoframe is sent by the switch.
+        """
+        returned_values = self.get(SPEC_AVI_INFOFRAME_CUSTOM)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_avi_infoframe_custom_enabled(self, enabled: bool) -> None:
+        """
+        Enables/disables sending the custom AVI infoframe from the switch.
+        """
+        self.set(SPEC_AVI_INFOFRAME_CUSTOM, [OnOffSwitch.from_bool(enabled)])
+
+    def get_avi_infoframe_disabled(self) -> bool:
+        """
+        Gets whether AVI infoframes are removed by the switch.
+        """
+        returned_values = self.get(SPEC_AVI_INFOFRAME_DISABLE)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_avi_infoframe_disabled(self, enabled: bool) -> None:
+        """
+        Enables/disables removing AVI infoframes on the switch.
+        """
+        self.set(SPEC_AVI_INFOFRAME_DISABLE, [OnOffSwitch.from_bool(enabled)])
+
+    # Audio
+    def get_hdmi_audio_muted_tx0(self) -> bool:
+        """
+        Gets whether HDMI audio is muted on output TX0.
+        """
+        returned_values = self.get(SPEC_HDMI_MUTED_TX0)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_hdmi_audio_muted_tx0(self, enabled: bool) -> None:
+        """
+        Mutes/unmutes HDMI audio on output TX0.
+        """
+        self.set(SPEC_HDMI_MUTED_TX0, [OnOffSwitch.from_bool(enabled)])
+
+    def get_hdmi_audio_muted_tx1(self) -> bool:
+        """
+        Gets whether HDMI audio is muted on output TX1.
+        """
+        returned_values = self.get(SPEC_HDMI_MUTED_TX1)
+        return OnOffSwitch.to_bool(returned_values[0])
+
+    def set_hdmi_audio_muted_tx1(self, enabled: bool) -> None:
+        """
+        Mutes/unmutes HDMI audio on output TX1.
+        """
+        self.set(SPEC_HDMI_MUTED_TX1, [OnOffSwitch.from_bool(enabled)])
+
+    def get_analog_volume(self) -> AnalogVolume:
+        """
+        Gets the volume of the analog audio output.
+        """
+        returned_values = self.get(SPEC_ANALOG_VOLUME)
+        return returned_values[0]
+
+    def set_analog_volume(self, volume: AnalogVolume) -> None:
+        """
+        Sets the volume of the analog audio output.
+        """
+        self.set(SPEC_ANALOG_VOLUME, [volume])
+
+    def get_analog_bass(self) -> AnalogTone:
+        """
+        Gets the bass adjustment of the analog audio output.
+        """
+        returned_values = self.get(SPEC_ANALOG_BASS)
+        return returned_values[0]
+
+    def set_analog_bass(self, bass: AnalogTone) -> None:
+        """
+        Sets the bass adjustment of the analog audio output.
+        """
+        self.set(SPEC_ANALOG_BASS, [bass])
+
+    def get_analog_treble(self) -> AnalogTone:
+        """
+        Gets the treble adjustment of the analog audio output.
+        """
+        returned_values = self.get(SPEC_ANALOG_TREBLE)
+        return returned_values[0]
+
+    def set_analog_treble(self, treble: AnalogTone) -> None:
+        """
+        Sets the treble adjustment of the analog audio output.
+        """
+        self.set(SPEC_ANALOG_TREBLE, [treble])
+
+    # OLED
+    def get_oled_fade_time(self) -> OledFadeTime:
+        """
+        Gets the time before the OLED display fades.
+        """
+        returned_values = self.get(SPEC_OLED_FADE_TIME)
+        return returned_values[0]
+
+    def set_oled_fade_time(self, fade_time: OledFadeTime) -> None:
+        """
+        Sets the time before the OLED display fades.
+        """
+        self.set(SPEC_OLED_FADE_TIME, [fade_time])
@@ -4,18 +4,51 @@
 Contains class to encode/decode VRROOM commands for socket recv/send.
 """
 
+from enum import Enum
 import re
-from typing import Any, ByteString, Callable, List
+from typing import Any, ByteString, Callable, Iterable, List, Pattern, Sequence
 
 from .exceptions import ResponseParsingError
 
 
+class ValidationLevel(Enum):
+    """
+    Enumerates how thoroughly responses are validated while being decoded.
+
+    STRICT matches every response against the full regex patterns of its values.
+    FAST only checks the response structure, and is meant for trusted, high-rate polling.
+    """
+
+    STRICT = "strict"
+    FAST = "fast"
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
 class Codec:
     """
     Encodes/decodes VRROOM commands for socket recv/send.
     """
 
     __COMMAND_TERMINATOR = "\n"
+    # Match responses ending in newline, regardless of carriage return beforehand
+    __RESPONSE_RAW_PATTERN = re.compile("([^\r\n]*)\r?\n")
+
+    @staticmethod
+    def compile_response_pattern(
+        target: str, value_patterns: Sequence[str]
+    ) -> Pattern[str]:
+        """
+        Compiles the regex pattern matching a response for the given target and values.
+
+        Returns the compiled pattern, which can be reused for every such response.
+        """
+        response_pattern = f"{target}"
+        if value_patterns:
+            values_pattern = " ".join(value_patterns)
+            response_pattern += f" (?P<values>{values_pattern})"
+        return re.compile(response_pattern)
 
     @staticmethod
     def decode_response(
@@ -37,27 +70,111 @@ class Codec:
             raise ValueError(
                 f"Unequal value pattern and converter arrays were passed to decoding!"
             )
-        # Now that we know the value lengths are equal, we only have to check one list
-        response_has_values = bool(value_patterns)  # Returns false if null or empty
+        response_pattern = Codec.compile_response_pattern(target, value_patterns)
+        return Codec.decode_response_compiled(
+            response, response_pattern, value_converters
+        )
+
+    @staticmethod
+    def decode_response_compiled(
+        response: ByteString,
+        response_pattern: Pattern[str],
+        value_converters: Sequence[Callable],
+    ) -> List[Any]:
+        """
+        Decodes a response from the VRROOM switch using a precompiled response pattern.
+
+        Returns a list of values equal to the number of converters passed.
 
+        Raises ResponseParsingError if the response is unable to be parsed.
+        """
         response_raw = Codec.decode_response_raw(response)
-        response_pattern = f"{target}"
-        if response_has_values:
-            values_pattern = " ".join(value_patterns)
-            response_pattern += f" (?P<values>{values_pattern})"
-        response_match = re.match(response_pattern, response_raw)
+        response_match = response_pattern.match(response_raw)
         if response_match is None:
             raise ResponseParsingError(
                 f"Unable to parse response '{response}' from VRROOM command!"
             )
 
-        if response_has_values:
-            response_value_strs = response_match.groupdict()["values"].split(" ")
+        if value_converters:
+            response_value_strs = response_match.group("values").split(" ")
             converter_response_pairs = zip(value_converters, response_value_strs)
-            return [converter(value) for converter, value in converter_response_pairs]
+            try:
+                return [
+                    converter(value) for converter, value in converter_response_pairs
+                ]
+            except (KeyError, ValueError) as error:
+                raise ResponseParsingError(
+                    f"Unable to parse values of response '{response}' from VRROOM command!"
+                ) from error
         else:
             return []
 
+    @staticmethod
+    def decode_response_fast(
+        response: ByteString,
+        response_prefix: bytes,
+        value_decoders: Sequence[Callable[[bytes], Any]],
+    ) -> List[Any]:
+        """
+        Decodes a response from the VRROOM switch without the use of regexes.
+
+        The response prefix is compared on bytes and the values are split on spaces.
+        Each raw value is then passed to its decoder, which takes bytes rather than a
+        string so that lookup tables can be used directly, e.g. via dict.__getitem__.
+
+        Returns a list of values equal to the number of decoders passed.
+
+        Raises ResponseParsingError if the response is structurally invalid.
+        """
+        if not response.startswith(response_prefix):
+            raise ResponseParsingError(
+                f"Unable to parse response '{response}' from VRROOM command!"
+            )
+        response_values = response[len(response_prefix) :].rstrip(b"\r\n")
+        if not value_decoders:
+            if response_values:
+                raise ResponseParsingError(
+                    f"Unexpected values in response '{response}' from VRROOM command!"
+                )
+            return []
+
+        value_strs = response_values[1:].split(b" ")
+        if response_values[:1] != b" " or len(value_strs) != len(value_decoders):
+            raise ResponseParsingError(
+                f"Unable to parse response '{response}' from VRROOM command!"
+            )
+
+        try:
+            return [
+                decoder(value) for decoder, value in zip(value_decoders, value_strs)
+            ]
+        except (KeyError, ValueError) as error:
+            raise ResponseParsingError(
+                f"Unable to parse values of response '{response}' from VRROOM command!"
+            ) from error
+
+    @staticmethod
+    def decoder_from_converter(
+        converter: Callable[[str], Any]
+    ) -> Callable[[bytes], Any]:
+        """
+        Wraps a string converter function into a decoder that takes raw bytes.
+        """
+
+        def decoder(value: bytes) -> Any:
+            return converter(value.decode())
+
+        return decoder
+
+    @staticmethod
+    def decoder_from_lookup(lookup: Iterable[Any]) -> Callable[[bytes], Any]:
+        """
+        Builds a decoder that looks up raw bytes among a finite set of values.
+
+        Each value is matched by the encoding of its string form, so this suits enums.
+        """
+        return {str(value).encode(): value for value in lookup}.__getitem__
+
     @staticmethod
     def decode_response_raw(response: ByteString) -> str:
         """
@@ -65,8 +182,7 @@ class Codec:
 
         Returns a string with the terminators removed.
         """
-        # Match responses ending in newline, regardless of carriage return beforehand
-        return re.match("([^\r\n]*)\r?\n", response.decode()).group(1)
+        return Codec.__RESPONSE_RAW_PATTERN.match(response.decode()).group(1)
 
     @staticmethod
     def encode_command_get(target: str) -> ByteString:
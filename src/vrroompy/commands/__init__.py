@@ -1,11 +1,25 @@
 #!/usr/bin/env python3
 
+from functools import lru_cache
+import select
 import socket
-from typing import Any, Callable, List
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+import weakref
 
-from ..codec import Codec
-from ..exceptions import InvalidTargetError, ValueNotChangedError
+from ..exceptions import (
+    ConnectionClosedError,
+    InvalidTargetError,
+    ResponseParsingError,
+    ValueNotChangedError,
+    VrroomError,
+)
+from ..protocol import PendingCommand, Response, VrroomProtocol
+from ..recorder import FlightRecorder
+from .cache import StateCache
+from .instrumentation import CommandTiming, Instrumentation
 from .enums import Target
+from .spec import CommandSpec
 
 """
 Contains base free functions used by specific getter/setter commands.
@@ -13,6 +27,362 @@ Contains base free functions used by specific getter/setter commands.
 
 DEFAULT_RECEIVE_BUFFER_SIZE = 256
 
+__PROTOCOLS: "weakref.WeakKeyDictionary[socket.socket, VrroomProtocol]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_protocol(socket: socket.socket) -> VrroomProtocol:
+    """
+    Gets the protocol state machine that frames responses received on the socket.
+
+    The same protocol is returned for as long as the socket is alive, so that bytes
+    received past the end of one response are kept for the next command. Settings
+    such as the protocol's validation level therefore also persist with the socket.
+    """
+    try:
+        return __PROTOCOLS[socket]
+    except KeyError:
+        protocol = VrroomProtocol()
+        __PROTOCOLS[socket] = protocol
+        return protocol
+    except TypeError:
+        # Sockets that cannot be weakly referenced get a fresh protocol every time
+        return VrroomProtocol()
+
+
+__CACHES: "weakref.WeakKeyDictionary[socket.socket, StateCache]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def enable_cache(
+    socket: socket.socket, cache: Optional[StateCache] = None
+) -> StateCache:
+    """
+    Enables caching of the values read from and written to the switch on the socket.
+
+    Once enabled, get commands on the socket return cached values for as long as they
+    are fresh, and set commands update the cache with the values they confirm.
+
+    Returns the cache in use, which is a new cache with default TTLs if none is given.
+    """
+    if cache is None:
+        cache = StateCache()
+    __CACHES[socket] = cache
+    return cache
+
+
+def disable_cache(socket: socket.socket) -> None:
+    """
+    Disables caching of values for the socket, discarding any cached values.
+    """
+    __CACHES.pop(socket, None)
+
+
+def get_cache(socket: socket.socket) -> Optional[StateCache]:
+    """
+    Gets the cache enabled for the socket, or None if caching is not enabled.
+    """
+    try:
+        return __CACHES.get(socket)
+    except TypeError:
+        return None  # Sockets that cannot be weakly referenced are never cached
+
+
+__INSTRUMENTATIONS: "weakref.WeakKeyDictionary[socket.socket, Instrumentation]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def enable_instrumentation(
+    socket: socket.socket, instrumentation: Optional[Instrumentation] = None
+) -> Instrumentation:
+    """
+    Enables instrumentation of the get and set commands sent on the socket.
+
+    Once enabled, the latency of every command is recorded and its hooks are called.
+    Instrumentation is off by default, when it costs a single lookup per command.
+
+    Returns the instrumentation in use, which is a new instance if none is given.
+    """
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    __INSTRUMENTATIONS[socket] = instrumentation
+    return instrumentation
+
+
+def disable_instrumentation(socket: socket.socket) -> None:
+    """
+    Disables instrumentation of the commands sent on the socket.
+    """
+    __INSTRUMENTATIONS.pop(socket, None)
+
+
+def get_instrumentation(socket: socket.socket) -> Optional[Instrumentation]:
+    """
+    Gets the instrumentation enabled for the socket, or None if it is not enabled.
+    """
+    try:
+        return __INSTRUMENTATIONS.get(socket)
+    except TypeError:
+        return None  # Sockets that cannot be weakly referenced are never instrumented
+
+
+def enable_flight_recorder(
+    socket: socket.socket, flight_recorder: Optional[FlightRecorder] = None
+) -> FlightRecorder:
+    """
+    Enables recording of the recent traffic on the socket into a flight recorder.
+
+    Once enabled, parsing errors and unchanged values raised by commands on the
+    socket carry the recording in their flight_recording attribute.
+
+    Returns the flight recorder in use, which is a new recorder if none is given.
+    """
+    if flight_recorder is None:
+        flight_recorder = FlightRecorder()
+    get_protocol(socket).flight_recorder = flight_recorder
+    return flight_recorder
+
+
+def disable_flight_recorder(socket: socket.socket) -> None:
+    """
+    Disables recording of the traffic on the socket.
+    """
+    get_protocol(socket).flight_recorder = None
+
+
+def get_flight_recorder(socket: socket.socket) -> Optional[FlightRecorder]:
+    """
+    Gets the flight recorder enabled for the socket, or None if it is not enabled.
+    """
+    return get_protocol(socket).flight_recorder
+
+
+def can_receive_interrupts(socket: socket.socket) -> bool:
+    """
+    Returns whether the socket can be listened to for interrupts between commands.
+
+    Listening waits on the socket's file descriptor, so stand-ins without a real one,
+    such as a ReplaySocket, can only receive interrupts alongside responses.
+    """
+    try:
+        file_descriptor = socket.fileno()
+    except (AttributeError, OSError):
+        return False
+    return isinstance(file_descriptor, int) and file_descriptor >= 0
+
+
+def receive_interrupts(socket: socket.socket, timeout: float = 0.0) -> int:
+    """
+    Receives whatever the switch has sent, waiting up to the timeout for it to arrive.
+
+    Interrupt messages received are passed to the callbacks subscribed to the socket's
+    protocol, so this may be called in a loop to listen for interrupts on a socket that
+    is not otherwise in use.
+
+    Returns the number of interrupt messages received.
+
+    Raises ConnectionClosedError if the switch has closed the connection.
+    Raises ValueError if the socket cannot be listened to for interrupts.
+    """
+    if not can_receive_interrupts(socket):
+        raise ValueError("Socket has no file descriptor to receive interrupts from!")
+    protocol = get_protocol(socket)
+    interrupt_count = protocol.interrupt_count
+    readable, _, _ = select.select([socket], [], [], timeout)
+    while readable:
+        received = socket.recv(DEFAULT_RECEIVE_BUFFER_SIZE)
+        if not received:
+            raise ConnectionClosedError(
+                "Connection was closed while receiving interrupts!"
+            )
+        protocol.receive_data(received)
+        readable, _, _ = select.select([socket], [], [], 0)
+    return protocol.interrupt_count - interrupt_count
+
+
+def receive_response(
+    socket: socket.socket, protocol: VrroomProtocol, command: PendingCommand
+) -> Response:
+    """
+    Receives from the socket until the response to the given command is framed.
+
+    Responses to older commands are discarded, as their callers have given up on them.
+    If receiving fails, e.g. on a socket timeout or the connection closing, the command
+    is abandoned, so that it cannot hold up later commands on its target.
+
+    Raises ConnectionClosedError if the switch closes the connection first.
+    """
+    try:
+        while True:
+            response = protocol.next_response()
+            while response is not None:
+                if response.command is command:
+                    return response
+                response = protocol.next_response()
+
+            received = socket.recv(DEFAULT_RECEIVE_BUFFER_SIZE)
+            if not received:
+                raise ConnectionClosedError(
+                    f"Connection was closed while awaiting a response to '{command.target}'!"
+                )
+            protocol.receive_data(received)
+    except (OSError, ConnectionClosedError):
+        protocol.abandon(command)
+        raise
+
+
+def decode_response(
+    protocol: VrroomProtocol,
+    spec: CommandSpec,
+    response: Response,
+    desired_values: Optional[List[Any]] = None,
+    annotate: bool = True,
+) -> List[Any]:
+    """
+    Decodes the values of a response, verifying them against any desired values.
+
+    Failures are annotated with the recent traffic of the protocol's flight recorder,
+    unless annotate is off for callers that must hold a lock while reading it.
+
+    Returns the decoded values.
+
+    Raises ResponseParsingError if the response cannot be decoded.
+    Raises ValueNotChangedError if the returned values are different than the desired values.
+    """
+    try:
+        returned_values = spec.decode(response.line, protocol.validation_level)
+        if desired_values is not None:
+            verify_values_changed(returned_values, desired_values)
+    except (ResponseParsingError, ValueNotChangedError) as error:
+        if annotate and protocol.flight_recorder is not None:
+            protocol.flight_recorder.annotate(error)
+        raise
+    return returned_values
+
+
+@lru_cache(maxsize=256)
+def __get_cached_spec(
+    target: str,
+    value_patterns: Tuple[str, ...],
+    value_converters: Tuple[Callable, ...],
+) -> CommandSpec:
+    return CommandSpec.create(target, value_patterns, value_converters)
+
+
+def get_spec(
+    target: str, value_patterns: Sequence[str], value_converters: Sequence[Callable]
+) -> CommandSpec:
+    """
+    Gets a command spec for the given target and values, creating it only once.
+
+    Raises InvalidTargetError if an invalid command target is specified.
+    """
+    return __get_cached_spec(target, tuple(value_patterns), tuple(value_converters))
+
+
+def __execute_instrumented(
+    socket: socket.socket,
+    protocol: VrroomProtocol,
+    command: PendingCommand,
+    spec: CommandSpec,
+    desired_values: Optional[List[Any]],
+    instrumentation: Instrumentation,
+) -> List[Any]:
+    """
+    Sends the command and decodes its response, recording its timing or failure.
+
+    Returns the decoded values, which are verified against any desired values.
+    """
+    try:
+        start_time = time.perf_counter()
+        socket.sendall(command.request)
+        sent_time = time.perf_counter()
+        instrumentation.record_send(spec.target, command.request)
+        # Time spent in send hooks is excluded from the wait
+        wait_start_time = time.perf_counter()
+        response = receive_response(socket, protocol, command)
+        received_time = time.perf_counter()
+        returned_values = decode_response(protocol, spec, response, desired_values)
+        decoded_time = time.perf_counter()
+    except (OSError, VrroomError) as error:
+        instrumentation.record_error(spec.target, error)
+        raise
+
+    instrumentation.record_response(
+        spec.target,
+        response.line,
+        CommandTiming(
+            sent_time - start_time,
+            received_time - wait_start_time,
+            decoded_time - received_time,
+        ),
+    )
+    return returned_values
+
+
+def get_command(socket: socket.socket, spec: CommandSpec) -> List[Any]:
+    """
+    Gets the value(s) of the spec's target from the switch.
+
+    If caching is enabled for the socket, fresh cached values are returned instead.
+    """
+    protocol = get_protocol(socket)
+    cache = get_cache(socket)
+    if cache is not None:
+        if cache.interrupts_enabled and can_receive_interrupts(socket):
+            # Interrupts already waiting on the socket must be seen before the cache
+            receive_interrupts(socket)
+        cache.observe_interrupts(protocol.interrupt_count)
+        cached_values = cache.get(spec.target)
+        if cached_values is not None:
+            return cached_values
+
+    command = protocol.send_command(spec.target, spec.get_request)
+    instrumentation = get_instrumentation(socket)
+    if instrumentation is None:
+        socket.sendall(command.request)
+        response = receive_response(socket, protocol, command)
+        returned_values = decode_response(protocol, spec, response)
+    else:
+        returned_values = __execute_instrumented(
+            socket, protocol, command, spec, None, instrumentation
+        )
+    if cache is not None:
+        cache.observe_interrupts(protocol.interrupt_count)
+        cache.put(spec.target, returned_values)
+    return returned_values
+
+
+def set_command(
+    socket: socket.socket, spec: CommandSpec, desired_values: List[Any]
+) -> None:
+    """
+    Sets the spec's target on the switch to the desired value(s).
+
+    Raises ValueNotChangedError if the returned values are different than the desired values.
+    """
+    protocol = get_protocol(socket)
+    cache = get_cache(socket)
+    if cache is not None:
+        # The target's state is unknown until the set is confirmed
+        cache.invalidate(spec.target)
+    command = protocol.send_command(spec.target, spec.encode_set(desired_values))
+    instrumentation = get_instrumentation(socket)
+    if instrumentation is None:
+        socket.sendall(command.request)
+        response = receive_response(socket, protocol, command)
+        returned_values = decode_response(protocol, spec, response, desired_values)
+    else:
+        returned_values = __execute_instrumented(
+            socket, protocol, command, spec, desired_values, instrumentation
+        )
+    if cache is not None:
+        cache.observe_interrupts(protocol.interrupt_count)
+        cache.put_set(spec.target, returned_values)
+
 
 def get_command_base(
     socket: socket.socket,
@@ -29,9 +399,7 @@ def get_command_base(
         raise InvalidTargetError(
             f"Invalid target '{target}' was passed to get command!"
         )
-    socket.sendall(Codec.encode_command_get(target))
-    response = socket.recv(DEFAULT_RECEIVE_BUFFER_SIZE)
-    return Codec.decode_response(response, target, value_patterns, value_converters)
+    return get_command(socket, get_spec(target, value_patterns, value_converters))
 
 
 def set_command_base(
@@ -51,16 +419,120 @@ def set_command_base(
         raise InvalidTargetError(
             f"Invalid target '{target}' was passed to set command!"
         )
+    set_command(
+        socket, get_spec(target, value_patterns, value_converters), desired_values
+    )
 
-    socket.sendall(Codec.encode_command_set(target, desired_values))
-    response = socket.recv(DEFAULT_RECEIVE_BUFFER_SIZE)
 
-    returned_values = Codec.decode_response(
-        response, target, value_patterns, value_converters
-    )
+def verify_values_changed(
+    returned_values: List[Any], desired_values: List[Any]
+) -> None:
+    """
+    Verifies that the values returned by a set command are the desired values.
+
+    Raises ValueNotChangedError if the returned values are different than the desired values.
+    """
     for returned, desired in zip(returned_values, desired_values):
         if returned != desired:
             returned_type = type(returned).__name__
             raise ValueNotChangedError(
                 f"Returned {returned_type} '{returned}' was different than desired ({desired})!"
             )
+
+
+class BatchCommand(NamedTuple):
+    """
+    Describes a single get or set command to be executed as part of a batch.
+
+    Commands with desired values of None are get commands; all others are set commands.
+    """
+
+    spec: CommandSpec
+    desired_values: Optional[List[Any]] = None
+
+    @staticmethod
+    def get(
+        target: str, value_patterns: List[str], value_converters: List[Callable]
+    ) -> "BatchCommand":
+        """
+        Creates a batch command that gets the value(s) of the target.
+
+        Raises InvalidTargetError if an invalid command target is specified.
+        """
+        return BatchCommand(get_spec(target, value_patterns, value_converters))
+
+    @staticmethod
+    def set(
+        target: str,
+        desired_values: List[Any],
+        value_patterns: List[str],
+        value_converters: List[Callable],
+    ) -> "BatchCommand":
+        """
+        Creates a batch command that sets the target to the desired value(s).
+
+        Raises InvalidTargetError if an invalid command target is specified.
+        """
+        return BatchCommand(
+            get_spec(target, value_patterns, value_converters), list(desired_values)
+        )
+
+    def encode(self) -> bytes:
+        """
+        Encodes this command for sending to the switch.
+
+        Returns the bytestring for the command.
+        """
+        if self.desired_values is None:
+            return self.spec.get_request
+        return self.spec.encode_set(self.desired_values)
+
+
+def execute_many(
+    socket: socket.socket, commands: Sequence[BatchCommand]
+) -> List[List[Any]]:
+    """
+    Executes many get/set commands with a single write to the socket.
+
+    All commands are encoded into one buffer and sent together, after which the
+    responses are decoded in order. This costs roughly one round trip in total,
+    rather than one round trip per command.
+
+    Returns a list holding the decoded values of each command, in command order.
+
+    Raises ValueNotChangedError if a set command returns different than desired values.
+    """
+    if not commands:
+        return []
+
+    protocol = get_protocol(socket)
+    pending_commands = [
+        protocol.send_command(command.spec.target, command.encode())
+        for command in commands
+    ]
+
+    cache = get_cache(socket)
+    results: List[List[Any]] = []
+    try:
+        socket.sendall(b"".join(pending.request for pending in pending_commands))
+        for command, pending in zip(commands, pending_commands):
+            response = receive_response(socket, protocol, pending)
+            if command.desired_values is not None and cache is not None:
+                cache.invalidate(command.spec.target)
+            returned_values = decode_response(
+                protocol, command.spec, response, command.desired_values
+            )
+            results.append(returned_values)
+    finally:
+        # Commands left unanswered by a failure cannot be matched to later responses
+        for unanswered in pending_commands[len(results) :]:
+            protocol.abandon(unanswered)
+
+    if cache is not None:
+        cache.observe_interrupts(protocol.interrupt_count)
+        for command, returned_values in zip(commands, results):
+            if command.desired_values is None:
+                cache.put(command.spec.target, returned_values)
+            else:
+                cache.put_set(command.spec.target, returned_values)
+    return results
@@ -7,8 +7,9 @@ Contains free functions for executing actions on the VRROOM switch.
 from enum import IntEnum
 import socket
 
-from . import set_command_base
+from . import set_command
 from .enums import Target
+from .spec import CommandSpec
 
 
 class ResetDataType(IntEnum):
@@ -38,28 +39,32 @@ class ResetDataType(IntEnum):
         return f"[{ResetDataType.RESET_SETTINGS}-{ResetDataType.RESET_ALL}]"
 
 
+SPEC_ACTION_FACTORY_RESET = CommandSpec.create(
+    Target.ACTION_FACTORY_RESET,
+    [ResetDataType.pattern()],
+    [ResetDataType.from_string],
+    [ResetDataType],
+)
+SPEC_ACTION_HOTPLUG = CommandSpec.create(Target.ACTION_HOTPLUG, [], [])
+SPEC_ACTION_REBOOT = CommandSpec.create(Target.ACTION_REBOOT, [], [])
+
+
 def factory_reset(socket: socket.socket, reset_data: ResetDataType) -> None:
     """
     Resets the requested data on the VRROOM switch.
     """
-    set_command_base(
-        socket,
-        Target.ACTION_FACTORY_RESET,
-        [reset_data],
-        [ResetDataType.pattern()],
-        [ResetDataType.from_string],
-    )
+    set_command(socket, SPEC_ACTION_FACTORY_RESET, [reset_data])
 
 
 def hotplug(socket: socket.socket) -> None:
     """
     Sends a hotplug event to the sources on the VRROOM switch.
     """
-    set_command_base(socket, Target.ACTION_HOTPLUG, [], [], [])
+    set_command(socket, SPEC_ACTION_HOTPLUG, [])
 
 
 def reboot(socket: socket.socket) -> None:
     """
     Reboots the VRROOM switch.
     """
-    set_command_base(socket, Target.ACTION_REBOOT, [], [], [])
+    set_command(socket, SPEC_ACTION_REBOOT, [])
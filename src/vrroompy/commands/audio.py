@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+"""
+Contains free functions for getting/setting VRROOM audio settings.
+"""
+
+import socket
+from . import get_command, set_command
+from .enums import OnOffSwitch, Target
+from .spec import CommandSpec
+from .values import BoundedInteger
+
+
+SPEC_HDMI_MUTED_TX0 = CommandSpec.create(
+    Target.HDMI_MUTED_TX0,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_hdmi_audio_muted_tx0(socket: socket.socket) -> bool:
+    """
+    Gets whether HDMI audio is muted on output TX0.
+    """
+    returned_values = get_command(socket, SPEC_HDMI_MUTED_TX0)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_hdmi_audio_muted_tx0(socket: socket.socket, enabled: bool) -> None:
+    """
+    Mutes/unmutes HDMI audio on output TX0.
+    """
+    set_command(socket, SPEC_HDMI_MUTED_TX0, [OnOffSwitch.from_bool(enabled)])
+
+
+SPEC_HDMI_MUTED_TX1 = CommandSpec.create(
+    Target.HDMI_MUTED_TX1,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_hdmi_audio_muted_tx1(socket: socket.socket) -> bool:
+    """
+    Gets whether HDMI audio is muted on output TX1.
+    """
+    returned_values = get_command(socket, SPEC_HDMI_MUTED_TX1)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_hdmi_audio_muted_tx1(socket: socket.socket, enabled: bool) -> None:
+    """
+    Mutes/unmutes HDMI audio on output TX1.
+    """
+    set_command(socket, SPEC_HDMI_MUTED_TX1, [OnOffSwitch.from_bool(enabled)])
+
+
+class AnalogVolume(BoundedInteger):
+    """
+    Defines valid volumes of the analog audio output, in dB.
+    """
+
+    MINIMUM = -30
+    MAXIMUM = 10
+
+
+class AnalogTone(BoundedInteger):
+    """
+    Defines valid bass/treble adjustments of the analog audio output, in dB.
+    """
+
+    MINIMUM = -10
+    MAXIMUM = 10
+
+
+SPEC_ANALOG_VOLUME = CommandSpec.create(
+    Target.ANALOG_VOLUME, [AnalogVolume.pattern()], [AnalogVolume.from_string]
+)
+
+
+def get_analog_volume(socket: socket.socket) -> AnalogVolume:
+    """
+    Gets the volume of the analog audio output.
+    """
+    returned_values = get_command(socket, SPEC_ANALOG_VOLUME)
+    return returned_values[0]
+
+
+def set_analog_volume(socket: socket.socket, volume: AnalogVolume) -> None:
+    """
+    Sets the volume of the analog audio output.
+    """
+    set_command(socket, SPEC_ANALOG_VOLUME, [volume])
+
+
+SPEC_ANALOG_BASS = CommandSpec.create(
+    Target.ANALOG_BASS, [AnalogTone.pattern()], [AnalogTone.from_string]
+)
+
+
+def get_analog_bass(socket: socket.socket) -> AnalogTone:
+    """
+    Gets the bass adjustment of the analog audio output.
+    """
+    returned_values = get_command(socket, SPEC_ANALOG_BASS)
+    return returned_values[0]
+
+
+def set_analog_bass(socket: socket.socket, bass: AnalogTone) -> None:
+    """
+    Sets the bass adjustment of the analog audio output.
+    """
+    set_command(socket, SPEC_ANALOG_BASS, [bass])
+
+
+SPEC_ANALOG_TREBLE = CommandSpec.create(
+    Target.ANALOG_TREBLE, [AnalogTone.pattern()], [AnalogTone.from_string]
+)
+
+
+def get_analog_treble(socket: socket.socket) -> AnalogTone:
+    """
+    Gets the treble adjustment of the analog audio output.
+    """
+    returned_values = get_command(socket, SPEC_ANALOG_TREBLE)
+    return returned_values[0]
+
+
+def set_analog_treble(socket: socket.socket, treble: AnalogTone) -> None:
+    """
+    Sets the treble adjustment of the analog audio output.
+    """
+    set_command(socket, SPEC_ANALOG_TREBLE, [treble])
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""
+Contains a time-to-live cache of the values last read from or written to a switch.
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .enums import OnOffSwitch, Target
+
+# Seconds that values of each target stay fresh; targets not listed are never cached
+DEFAULT_TTLS: Mapping[Target, float] = {
+    Target.MAC_ADDRESS: math.inf,
+    Target.IP_ADDRESS: 300.0,
+    Target.IP_NETWORK_MASK: 300.0,
+    Target.IP_GATEWAY: 300.0,
+    Target.DHCP_ENABLED: 300.0,
+    Target.IP_INTERRUPTS_ENABLED: 300.0,
+    Target.TCP_PORT: 300.0,
+    Target.AUTO_SWITCHING: 30.0,
+    Target.OPERATION_MODE: 2.0,
+    Target.SELECTED_INPUTS: 1.0,
+    Target.SELECTED_INPUT_TX0: 1.0,
+    Target.SELECTED_INPUT_TX1: 1.0,
+}
+
+# Targets whose values change without a command, e.g. via the remote or autoswitching
+STREAM_DEPENDENT_TARGETS = frozenset(
+    [
+        Target.OPERATION_MODE,
+        Target.SELECTED_INPUTS,
+        Target.SELECTED_INPUT_TX0,
+        Target.SELECTED_INPUT_TX1,
+    ]
+)
+
+# Targets whose values are also changed by a set of the key target
+_OVERLAPPING_TARGETS: Mapping[Target, Tuple[Target, ...]] = {
+    Target.SELECTED_INPUTS: (Target.SELECTED_INPUT_TX0, Target.SELECTED_INPUT_TX1),
+    Target.SELECTED_INPUT_TX0: (Target.SELECTED_INPUTS,),
+    Target.SELECTED_INPUT_TX1: (Target.SELECTED_INPUTS,),
+}
+
+# Targets whose set changes the values of every other target
+_RESETTING_TARGETS = frozenset(
+    [Target.ACTION_FACTORY_RESET, Target.ACTION_REBOOT, Target.ACTION_HOTPLUG]
+)
+
+
+class StateCache:
+    """
+    Caches the values of targets read from or written to a single switch.
+
+    Each target's values are kept for that target's time-to-live, after which they
+    must be read from the switch again. Values confirmed by a set command are cached
+    too, so that reading a target straight after writing it needs no round trip.
+
+    While the switch has IP interrupts enabled, every interrupt message received
+    invalidates the stream-dependent targets, as their values may have changed.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Mapping[Target, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.interrupts_enabled = False
+        self.hit_count = 0
+        self.miss_count = 0
+        self.__clock = clock
+        self.__entries: Dict[Target, Tuple[float, List[Any]]] = {}
+        self.__interrupt_count = 0
+
+    def get(self, target: Target) -> Optional[List[Any]]:
+        """
+        Gets the cached values of the target.
+
+        Returns a copy of the values, or None if the target's values are not fresh.
+        """
+        entry = self.__entries.get(target)
+        if entry is None or entry[0] <= self.__clock():
+            self.miss_count += 1
+            return None
+        self.hit_count += 1
+        return list(entry[1])
+
+    def put(self, target: Target, values: List[Any]) -> None:
+        """
+        Caches values of the target that were just read from the switch.
+        """
+        ttl = self.ttls.get(target, 0.0)
+        if ttl > 0:
+            self.__entries[target] = (self.__clock() + ttl, list(values))
+        if target == Target.IP_INTERRUPTS_ENABLED:
+            self.interrupts_enabled = values[0] == OnOffSwitch.ON
+
+    def put_set(self, target: Target, values: List[Any]) -> None:
+        """
+        Caches values of the target that were just confirmed by a set command.
+
+        Overlapping targets are invalidated, and action targets invalidate everything.
+        """
+        if target in _RESETTING_TARGETS:
+            self.invalidate()
+            return
+        for overlapping_target in _OVERLAPPING_TARGETS.get(target, ()):
+            self.__entries.pop(overlapping_target, None)
+        self.put(target, values)
+
+    def invalidate(self, target: Optional[Target] = None) -> None:
+        """
+        Discards the cached values of the target, or of every target if None.
+        """
+        if target is None:
+            self.__entries.clear()
+        else:
+            self.__entries.pop(target, None)
+
+    def observe_interrupts(self, interrupt_count: int) -> None:
+        """
+        Invalidates the stream-dependent targets if any interrupts arrived since last observed.
+
+        The count is the total number of interrupts received, e.g. from the protocol.
+        """
+        if interrupt_count != self.__interrupt_count:
+            self.__interrupt_count = interrupt_count
+            for target in STREAM_DEPENDENT_TARGETS:
+                self.__entries.pop(target, None)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+"""
+Contains free functions for getting/setting VRROOM EDID automix flags.
+"""
+
+import socket
+from . import get_command, set_command
+from .enums import OnOffSwitch, Target
+from .spec import CommandSpec
+
+
+SPEC_EDID_FRL_AUTOMIX = CommandSpec.create(
+    Target.EDID_FRL_AUTOMIX,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_edid_frl_automix_enabled(socket: socket.socket) -> bool:
+    """
+    Gets whether the FRL flag is mixed into the automix EDID of the switch.
+    """
+    returned_values = get_command(socket, SPEC_EDID_FRL_AUTOMIX)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_edid_frl_automix_enabled(socket: socket.socket, enabled: bool) -> None:
+    """
+    Enables/disables mixing the FRL flag into the automix EDID of the switch.
+    """
+    set_command(socket, SPEC_EDID_FRL_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+
+SPEC_EDID_VRR_AUTOMIX = CommandSpec.create(
+    Target.EDID_VRR_AUTOMIX,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_edid_vrr_automix_enabled(socket: socket.socket) -> bool:
+    """
+    Gets whether the VRR flag is mixed into the automix EDID of the switch.
+    """
+    returned_values = get_command(socket, SPEC_EDID_VRR_AUTOMIX)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_edid_vrr_automix_enabled(socket: socket.socket, enabled: bool) -> None:
+    """
+    Enables/disables mixing the VRR flag into the automix EDID of the switch.
+    """
+    set_command(socket, SPEC_EDID_VRR_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+
+SPEC_EDID_ALLM_AUTOMIX = CommandSpec.create(
+    Target.EDID_ALLM_AUTOMIX,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_edid_allm_automix_enabled(socket: socket.socket) -> bool:
+    """
+    Gets whether the ALLM flag is mixed into the automix EDID of the switch.
+    """
+    returned_values = get_command(socket, SPEC_EDID_ALLM_AUTOMIX)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_edid_allm_automix_enabled(socket: socket.socket, enabled: bool) -> None:
+    """
+    Enables/disables mixing the ALLM flag into the automix EDID of the switch.
+    """
+    set_command(socket, SPEC_EDID_ALLM_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+
+SPEC_EDID_HDR_AUTOMIX = CommandSpec.create(
+    Target.EDID_HDR_AUTOMIX,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_edid_hdr_automix_enabled(socket: socket.socket) -> bool:
+    """
+    Gets whether the HDR flag is mixed into the automix EDID of the switch.
+    """
+    returned_values = get_command(socket, SPEC_EDID_HDR_AUTOMIX)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_edid_hdr_automix_enabled(socket: socket.socket, enabled: bool) -> None:
+    """
+    Enables/disables mixing the HDR flag into the automix EDID of the switch.
+    """
+    set_command(socket, SPEC_EDID_HDR_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
+
+
+SPEC_EDID_DV_AUTOMIX = CommandSpec.create(
+    Target.EDID_DVF_AUTOMIX,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_edid_dv_automix_enabled(socket: socket.socket) -> bool:
+    """
+    Gets whether the Dolby Vision flag is mixed into the automix EDID of the switch.
+    """
+    returned_values = get_command(socket, SPEC_EDID_DV_AUTOMIX)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_edid_dv_automix_enabled(socket: socket.socket, enabled: bool) -> None:
+    """
+    Enables/disables mixing the Dolby Vision flag into the automix EDID of the switch.
+    """
+    set_command(socket, SPEC_EDID_DV_AUTOMIX, [OnOffSwitch.from_bool(enabled)])
@@ -207,8 +207,7 @@ class Target(Enum):
         """
         Returns whether the named target is valid for use in VRROOM commands.
         """
-        try:
-            Target(target_name)
-        except ValueError:
-            return False
-        return True
+        return isinstance(target_name, Target) or target_name in _TARGET_NAMES
+
+
+_TARGET_NAMES = frozenset(target.value for target in Target)
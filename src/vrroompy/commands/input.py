@@ -7,8 +7,9 @@ Contains free functions for getting/setting VRROOM inputs.
 from enum import IntEnum
 import socket
 from typing import List
-from . import get_command_base, set_command_base
+from . import get_command, set_command
 from .enums import Target
+from .spec import CommandSpec
 
 
 class Input(IntEnum):
@@ -40,20 +41,19 @@ class Input(IntEnum):
         return f"[{Input.RX0}-{Input.FOLLOW}]"
 
 
-__VALUE_CONVERTERS_SELECTED_INPUTS = [Input.from_string, Input.from_string]
-__VALUE_PATTERNS_SELECTED_INPUTS = [Input.pattern(), Input.pattern()]
+SPEC_SELECTED_INPUTS = CommandSpec.create(
+    Target.SELECTED_INPUTS,
+    [Input.pattern(), Input.pattern()],
+    [Input.from_string, Input.from_string],
+    [Input, Input],
+)
 
 
 def get_selected_inputs(socket: socket.socket) -> List[Input]:
     """
     Gets the currently selected inputs of the switch.
     """
-    return get_command_base(
-        socket,
-        Target.SELECTED_INPUTS,
-        __VALUE_PATTERNS_SELECTED_INPUTS,
-        __VALUE_CONVERTERS_SELECTED_INPUTS,
-    )
+    return get_command(socket, SPEC_SELECTED_INPUTS)
 
 
 def set_selected_inputs(
@@ -62,29 +62,22 @@ def set_selected_inputs(
     """
     Sets the currently selected inputs of the switch.
     """
-    set_command_base(
-        socket,
-        Target.SELECTED_INPUTS,
-        [input_tx0, input_tx1],
-        __VALUE_PATTERNS_SELECTED_INPUTS,
-        __VALUE_CONVERTERS_SELECTED_INPUTS,
-    )
+    set_command(socket, SPEC_SELECTED_INPUTS, [input_tx0, input_tx1])
 
 
-__VALUE_CONVERTERS_SELECTED_INPUT_TXN = [Input.from_string]
-__VALUE_PATTERNS_SELECTED_INPUT_TXN = [Input.pattern()]
+SPEC_SELECTED_INPUT_TX0 = CommandSpec.create(
+    Target.SELECTED_INPUT_TX0, [Input.pattern()], [Input.from_string], [Input]
+)
+SPEC_SELECTED_INPUT_TX1 = CommandSpec.create(
+    Target.SELECTED_INPUT_TX1, [Input.pattern()], [Input.from_string], [Input]
+)
 
 
 def get_selected_input_tx0(socket: socket.socket) -> Input:
     """
     Gets the currently selected input for output TX0.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.SELECTED_INPUT_TX0,
-        __VALUE_PATTERNS_SELECTED_INPUT_TXN,
-        __VALUE_CONVERTERS_SELECTED_INPUT_TXN,
-    )
+    returned_values = get_command(socket, SPEC_SELECTED_INPUT_TX0)
     return returned_values[0]
 
 
@@ -92,12 +85,7 @@ def get_selected_input_tx1(socket: socket.socket) -> Input:
     """
     Gets the currently selected input for output TX1.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.SELECTED_INPUT_TX1,
-        __VALUE_PATTERNS_SELECTED_INPUT_TXN,
-        __VALUE_CONVERTERS_SELECTED_INPUT_TXN,
-    )
+    returned_values = get_command(socket, SPEC_SELECTED_INPUT_TX1)
     return returned_values[0]
 
 
@@ -105,23 +93,11 @@ def set_selected_input_tx0(socket: socket.socket, input: Input) -> None:
     """
     Sets the currently selected input for output TX0.
     """
-    set_command_base(
-        socket,
-        Target.SELECTED_INPUT_TX0,
-        [input],
-        __VALUE_PATTERNS_SELECTED_INPUT_TXN,
-        __VALUE_CONVERTERS_SELECTED_INPUT_TXN,
-    )
+    set_command(socket, SPEC_SELECTED_INPUT_TX0, [input])
 
 
 def set_selected_input_tx1(socket: socket.socket, input: Input) -> None:
     """
     Sets the currently selected input for output TX1.
     """
-    set_command_base(
-        socket,
-        Target.SELECTED_INPUT_TX1,
-        [input],
-        __VALUE_PATTERNS_SELECTED_INPUT_TXN,
-        __VALUE_CONVERTERS_SELECTED_INPUT_TXN,
-    )
+    set_command(socket, SPEC_SELECTED_INPUT_TX1, [input])
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+
+"""
+Contains latency histograms, error counters and hooks that instrument the commands sent to a switch.
+"""
+
+from bisect import bisect_left
+import logging
+import math
+import socket
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from ..exceptions import ResponseParsingError, ValueNotChangedError
+from .enums import Target
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets in seconds, past which latencies overflow
+DEFAULT_BUCKET_BOUNDS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class CommandTiming(NamedTuple):
+    """
+    Splits the latency of a single command into its phases, in seconds.
+
+    Send time is spent writing the request to the socket, wait time is spent until the
+    response is framed, i.e. on the network and the switch, and decode time is spent
+    decoding and verifying the response values.
+    """
+
+    send: float
+    wait: float
+    decode: float
+
+    @property
+    def total(self) -> float:
+        """
+        Returns the total latency of the command.
+        """
+        return self.send + self.wait + self.decode
+
+
+SendHook = Callable[[Target, bytes], None]
+ResponseHook = Callable[[Target, bytes, CommandTiming], None]
+ErrorHook = Callable[[Target, Exception], None]
+
+
+class LatencyHistogram:
+    """
+    Counts latencies into buckets with fixed bounds, so that memory stays fixed
+    however many latencies are recorded.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKET_BOUNDS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    @property
+    def mean(self) -> float:
+        """
+        Returns the mean of the recorded latencies, or NaN if none were recorded.
+        """
+        return self.total / self.count if self.count else math.nan
+
+    def record(self, latency: float) -> None:
+        """
+        Counts a latency, in seconds.
+        """
+        self.counts[bisect_left(self.bounds, latency)] += 1
+        self.count += 1
+        self.total += latency
+        if latency > self.maximum:
+            self.maximum = latency
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the given fraction of latencies.
+
+        Latencies past the last bound are reported as the maximum recorded latency, and
+        NaN is returned if no latencies were recorded.
+        """
+        rank = max(math.ceil(self.count * fraction), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.maximum)
+                return self.maximum
+        return math.nan
+
+
+class TargetLatencies(NamedTuple):
+    """
+    Holds the latency histograms of each phase of the commands on a single target.
+    """
+
+    send: LatencyHistogram
+    wait: LatencyHistogram
+    decode: LatencyHistogram
+
+    def record(self, timing: CommandTiming) -> None:
+        """
+        Counts the latency of each phase of a command.
+        """
+        self.send.record(timing.send)
+        self.wait.record(timing.wait)
+        self.decode.record(timing.decode)
+
+
+class Instrumentation:
+    """
+    Measures the commands sent to one or more switches, and calls hooks around them.
+
+    Every command that completes is recorded into per-target histograms of its send,
+    wait and decode time, which tell apart time lost on the network or switch from
+    time lost decoding. Failed commands are counted by cause. The same instance may
+    be enabled on many sockets, including from many threads, to aggregate them.
+
+    Hooks are called on the thread sending the command, after it has been recorded.
+    Any exception raised by a hook is logged, and neither stops the other hooks nor
+    fails the command.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKET_BOUNDS) -> None:
+        self.bounds = tuple(bounds)
+        self.command_count = 0
+        self.error_count = 0
+        self.parsing_error_count = 0
+        self.not_changed_count = 0
+        self.timeout_count = 0
+        self.__lock = threading.Lock()
+        self.__latencies: Dict[Target, TargetLatencies] = {}
+        self.__send_hooks: List[SendHook] = []
+        self.__response_hooks: List[ResponseHook] = []
+        self.__error_hooks: List[ErrorHook] = []
+
+    @property
+    def targets(self) -> List[Target]:
+        """
+        Returns every target with recorded latencies.
+        """
+        with self.__lock:
+            return list(self.__latencies.keys())
+
+    def latencies(self, target: Target) -> Optional[TargetLatencies]:
+        """
+        Gets the latency histograms of the target, or None if none were recorded.
+        """
+        return self.__latencies.get(target)
+
+    def reset(self) -> None:
+        """
+        Discards every recorded latency and count, keeping the hooks.
+        """
+        with self.__lock:
+            self.__latencies.clear()
+            self.command_count = 0
+            self.error_count = 0
+            self.parsing_error_count = 0
+            self.not_changed_count = 0
+            self.timeout_count = 0
+
+    @staticmethod
+    def __call_hooks(hooks: List, *args: Any) -> None:
+        # Copy the hooks, as they may remove themselves
+        for hook in list(hooks):
+            try:
+                hook(*args)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Instrumentation hook %r raised an exception", hook)
+
+    @staticmethod
+    def __add_hook(hooks: List, hook: Callable) -> Callable[[], None]:
+        hooks.append(hook)
+
+        def remove() -> None:
+            if hook in hooks:
+                hooks.remove(hook)
+
+        return remove
+
+    def on_send(self, hook: SendHook) -> Callable[[], None]:
+        """
+        Adds a hook called with the target and request of every command sent.
+
+        Returns a function that removes the hook when called.
+        """
+        return self.__add_hook(self.__send_hooks, hook)
+
+    def on_response(self, hook: ResponseHook) -> Callable[[], None]:
+        """
+        Adds a hook called with the target, response line and timing of every command
+        that completes.
+
+        Returns a function that removes the hook when called.
+        """
+        return self.__add_hook(self.__response_hooks, hook)
+
+    def on_error(self, hook: ErrorHook) -> Callable[[], None]:
+        """
+        Adds a hook called with the target and exception of every command that fails.
+
+        Returns a function that removes the hook when called.
+        """
+        return self.__add_hook(self.__error_hooks, hook)
+
+    def record_send(self, target: Target, request: bytes) -> None:
+        """
+        Records that the request of a command on the target was sent.
+        """
+        self.__call_hooks(self.__send_hooks, target, request)
+
+    def record_response(
+        self, target: Target, line: bytes, timing: CommandTiming
+    ) -> None:
+        """
+        Records the timing of a command on the target that completed.
+        """
+        with self.__lock:
+            latencies = self.__latencies.get(target)
+            if latencies is None:
+                latencies = TargetLatencies(
+                    LatencyHistogram(self.bounds),
+                    LatencyHistogram(self.bounds),
+                    LatencyHistogram(self.bounds),
+                )
+                self.__latencies[target] = latencies
+            latencies.record(timing)
+            self.command_count += 1
+        self.__call_hooks(self.__response_hooks, target, line, timing)
+
+    def record_error(self, target: Target, error: Exception) -> None:
+        """
+        Records a command on the target that failed with the given exception.
+        """
+        with self.__lock:
+            self.error_count += 1
+            if isinstance(error, ResponseParsingError):
+                self.parsing_error_count += 1
+            elif isinstance(error, ValueNotChangedError):
+                self.not_changed_count += 1
+            elif isinstance(error, socket.timeout):
+                self.timeout_count += 1
+        self.__call_hooks(self.__error_hooks, target, error)
@@ -6,8 +6,9 @@ Contains free functions for getting/setting various VRROOM modes.
 
 from enum import IntEnum
 import socket
-from . import get_command_base, set_command_base
+from . import get_command, set_command
 from .enums import OnOffSwitch, Target
+from .spec import CommandSpec
 
 
 class OperationMode(IntEnum):
@@ -39,20 +40,19 @@ class OperationMode(IntEnum):
         return f"[{OperationMode.SPLITTER_VRR}-{OperationMode.MATRIX_FRL5_TMDS}]"
 
 
-__VALUE_CONVERTERS_MODE_OPERATION = [OperationMode.from_string]
-__VALUE_PATTERNS_MODE_OPERATION = [OperationMode.pattern()]
+SPEC_OPERATION_MODE = CommandSpec.create(
+    Target.OPERATION_MODE,
+    [OperationMode.pattern()],
+    [OperationMode.from_string],
+    [OperationMode],
+)
 
 
 def get_operation_mode(socket: socket) -> OperationMode:
     """
     Gets the current operation mode of the switch.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.OPERATION_MODE,
-        __VALUE_PATTERNS_MODE_OPERATION,
-        __VALUE_CONVERTERS_MODE_OPERATION,
-    )
+    returned_values = get_command(socket, SPEC_OPERATION_MODE)
     return returned_values[0]
 
 
@@ -60,29 +60,22 @@ def set_operation_mode(socket: socket, op_mode: OperationMode) -> None:
     """
     Sets the operation mode of the switch.
     """
-    set_command_base(
-        socket,
-        Target.OPERATION_MODE,
-        [op_mode],
-        __VALUE_PATTERNS_MODE_OPERATION,
-        __VALUE_CONVERTERS_MODE_OPERATION,
-    )
+    set_command(socket, SPEC_OPERATION_MODE, [op_mode])
 
 
-__VALUE_CONVERTERS_MODE_AUTOSWITCH = [OnOffSwitch.from_string]
-__VALUE_PATTERNS_MODE_AUTOSWITCH = [OnOffSwitch.pattern()]
+SPEC_AUTO_SWITCHING = CommandSpec.create(
+    Target.AUTO_SWITCHING,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
 
 
 def get_autoswitch_enabled(socket: socket) -> bool:
     """
     Gets whether automatic input switching is enabled on the switch.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.AUTO_SWITCHING,
-        __VALUE_PATTERNS_MODE_AUTOSWITCH,
-        __VALUE_CONVERTERS_MODE_AUTOSWITCH,
-    )
+    returned_values = get_command(socket, SPEC_AUTO_SWITCHING)
     return OnOffSwitch.to_bool(returned_values[0])
 
 
@@ -90,10 +83,4 @@ def set_autoswitch_enabled(socket: socket, enabled: bool) -> None:
     """
     Enables/disables automatic input switching on the switch.
     """
-    set_command_base(
-        socket,
-        Target.AUTO_SWITCHING,
-        [OnOffSwitch.from_bool(enabled)],
-        __VALUE_PATTERNS_MODE_AUTOSWITCH,
-        __VALUE_CONVERTERS_MODE_AUTOSWITCH,
-    )
+    set_command(socket, SPEC_AUTO_SWITCHING, [OnOffSwitch.from_bool(enabled)])
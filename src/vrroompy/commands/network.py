@@ -6,8 +6,9 @@ Contains free functions for getting/setting VRROOM network settings.
 
 import socket
 from typing import Any
-from . import get_command_base, set_command_base
+from . import get_command, set_command
 from .enums import OnOffSwitch, Target
+from .spec import CommandSpec
 
 
 class IpAddressV4:
@@ -39,20 +40,22 @@ class IpAddressV4:
         return "((25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.){3}(25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
 
 
-__VALUE_CONVERTERS_IP_ADDRESS = [IpAddressV4.from_string]
-__VALUE_PATTERNS_IP_ADDRESS = [IpAddressV4.pattern()]
+SPEC_IP_ADDRESS = CommandSpec.create(
+    Target.IP_ADDRESS, [IpAddressV4.pattern()], [IpAddressV4.from_string]
+)
+SPEC_IP_NETWORK_MASK = CommandSpec.create(
+    Target.IP_NETWORK_MASK, [IpAddressV4.pattern()], [IpAddressV4.from_string]
+)
+SPEC_IP_GATEWAY = CommandSpec.create(
+    Target.IP_GATEWAY, [IpAddressV4.pattern()], [IpAddressV4.from_string]
+)
 
 
 def get_ip_address(socket: socket) -> IpAddressV4:
     """
     Gets the current IP address of the switch.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.IP_ADDRESS,
-        __VALUE_PATTERNS_IP_ADDRESS,
-        __VALUE_CONVERTERS_IP_ADDRESS,
-    )
+    returned_values = get_command(socket, SPEC_IP_ADDRESS)
     return returned_values[0]
 
 
@@ -60,25 +63,14 @@ def set_ip_address(socket: socket, address: IpAddressV4) -> None:
     """
     Sets the IP address of the switch.
     """
-    set_command_base(
-        socket,
-        Target.IP_ADDRESS,
-        [address],
-        __VALUE_PATTERNS_IP_ADDRESS,
-        __VALUE_CONVERTERS_IP_ADDRESS,
-    )
+    set_command(socket, SPEC_IP_ADDRESS, [address])
 
 
 def get_ip_network_mask(socket: socket) -> IpAddressV4:
     """
     Gets the current IP network mask of the switch.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.IP_NETWORK_MASK,
-        __VALUE_PATTERNS_IP_ADDRESS,
-        __VALUE_CONVERTERS_IP_ADDRESS,
-    )
+    returned_values = get_command(socket, SPEC_IP_NETWORK_MASK)
     return returned_values[0]
 
 
@@ -86,25 +78,14 @@ def set_ip_network_mask(socket: socket, address: IpAddressV4) -> None:
     """
     Sets the IP network mask of the switch.
     """
-    set_command_base(
-        socket,
-        Target.IP_NETWORK_MASK,
-        [address],
-        __VALUE_PATTERNS_IP_ADDRESS,
-        __VALUE_CONVERTERS_IP_ADDRESS,
-    )
+    set_command(socket, SPEC_IP_NETWORK_MASK, [address])
 
 
 def get_ip_gateway(socket: socket) -> IpAddressV4:
     """
     Gets the current IP gateway of the switch.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.IP_GATEWAY,
-        __VALUE_PATTERNS_IP_ADDRESS,
-        __VALUE_CONVERTERS_IP_ADDRESS,
-    )
+    returned_values = get_command(socket, SPEC_IP_GATEWAY)
     return returned_values[0]
 
 
@@ -112,29 +93,28 @@ def set_ip_gateway(socket: socket, address: IpAddressV4) -> None:
     """
     Sets the IP gateway of the switch.
     """
-    set_command_base(
-        socket,
-        Target.IP_GATEWAY,
-        [address],
-        __VALUE_PATTERNS_IP_ADDRESS,
-        __VALUE_CONVERTERS_IP_ADDRESS,
-    )
+    set_command(socket, SPEC_IP_GATEWAY, [address])
 
 
-__VALUE_CONVERTERS_ONOFF = [OnOffSwitch.from_string]
-__VALUE_PATTERNS_ONOFF = [OnOffSwitch.pattern()]
+SPEC_DHCP_ENABLED = CommandSpec.create(
+    Target.DHCP_ENABLED,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+SPEC_IP_INTERRUPTS_ENABLED = CommandSpec.create(
+    Target.IP_INTERRUPTS_ENABLED,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
 
 
 def get_dhcp_enabled(socket: socket) -> bool:
     """
     Gets whether DHCP is enabled on the switch.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.DHCP_ENABLED,
-        __VALUE_PATTERNS_ONOFF,
-        __VALUE_CONVERTERS_ONOFF,
-    )
+    returned_values = get_command(socket, SPEC_DHCP_ENABLED)
     return OnOffSwitch.to_bool(returned_values[0])
 
 
@@ -142,25 +122,14 @@ def set_dhcp_enabled(socket: socket, enabled: bool) -> None:
     """
     Enables/disables DHCP on the switch.
     """
-    set_command_base(
-        socket,
-        Target.DHCP_ENABLED,
-        [OnOffSwitch.from_bool(enabled)],
-        __VALUE_PATTERNS_ONOFF,
-        __VALUE_CONVERTERS_ONOFF,
-    )
+    set_command(socket, SPEC_DHCP_ENABLED, [OnOffSwitch.from_bool(enabled)])
 
 
 def get_ip_interrupts_enabled(socket: socket) -> bool:
     """
     Gets whether IP interrupts are enabled on the switch.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.IP_INTERRUPTS_ENABLED,
-        __VALUE_PATTERNS_ONOFF,
-        __VALUE_CONVERTERS_ONOFF,
-    )
+    returned_values = get_command(socket, SPEC_IP_INTERRUPTS_ENABLED)
     return OnOffSwitch.to_bool(returned_values[0])
 
 
@@ -168,13 +137,7 @@ def set_ip_interrupts_enabled(socket: socket, enabled: bool) -> None:
     """
     Enables/disables IP interrupts on the switch.
     """
-    set_command_base(
-        socket,
-        Target.IP_INTERRUPTS_ENABLED,
-        [OnOffSwitch.from_bool(enabled)],
-        __VALUE_PATTERNS_ONOFF,
-        __VALUE_CONVERTERS_ONOFF,
-    )
+    set_command(socket, SPEC_IP_INTERRUPTS_ENABLED, [OnOffSwitch.from_bool(enabled)])
 
 
 class TcpPort:
@@ -206,20 +169,16 @@ class TcpPort:
         return "([1-9][0-9]{0,3}|[1-5][0-9]{4}|6[0-4][0-9]{3}|65[0-4][0-9]{2}|655[0-2][0-9]|6553[0-5])"
 
 
-__VALUE_CONVERTERS_TCP_PORT = [TcpPort.from_string]
-__VALUE_PATTERNS_TCP_PORT = [TcpPort.pattern()]
+SPEC_TCP_PORT = CommandSpec.create(
+    Target.TCP_PORT, [TcpPort.pattern()], [TcpPort.from_string]
+)
 
 
 def get_tcp_port(socket: socket) -> TcpPort:
     """
     Gets what TCP port is being used for commands on the switch.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.TCP_PORT,
-        __VALUE_PATTERNS_TCP_PORT,
-        __VALUE_CONVERTERS_TCP_PORT,
-    )
+    returned_values = get_command(socket, SPEC_TCP_PORT)
     return returned_values[0]
 
 
@@ -227,13 +186,7 @@ def set_tcp_port(socket: socket, port: TcpPort) -> None:
     """
     Sets what TCP port is being used for commands on the switch.
     """
-    set_command_base(
-        socket,
-        Target.TCP_PORT,
-        [port],
-        __VALUE_PATTERNS_TCP_PORT,
-        __VALUE_CONVERTERS_TCP_PORT,
-    )
+    set_command(socket, SPEC_TCP_PORT, [port])
 
 
 class MacAddress:
@@ -265,18 +218,14 @@ class MacAddress:
         return "([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})"
 
 
-__VALUE_CONVERTERS_MAC_ADDRESS = [MacAddress.from_string]
-__VALUE_PATTERNS_MAC_ADDRESS = [MacAddress.pattern()]
+SPEC_MAC_ADDRESS = CommandSpec.create(
+    Target.MAC_ADDRESS, [MacAddress.pattern()], [MacAddress.from_string]
+)
 
 
 def get_mac_address(socket: socket) -> MacAddress:
     """
     Gets the MAC address of the switch.
     """
-    returned_values = get_command_base(
-        socket,
-        Target.MAC_ADDRESS,
-        __VALUE_PATTERNS_MAC_ADDRESS,
-        __VALUE_CONVERTERS_MAC_ADDRESS,
-    )
+    returned_values = get_command(socket, SPEC_MAC_ADDRESS)
     return returned_values[0]
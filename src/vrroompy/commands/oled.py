@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+"""
+Contains free functions for getting/setting VRROOM OLED display settings.
+"""
+
+import socket
+from . import get_command, set_command
+from .enums import Target
+from .spec import CommandSpec
+from .values import BoundedInteger
+
+
+class OledFadeTime(BoundedInteger):
+    """
+    Defines valid times before the OLED display fades, in seconds.
+    """
+
+    MINIMUM = 0
+    MAXIMUM = 255
+
+
+SPEC_OLED_FADE_TIME = CommandSpec.create(
+    Target.OLED_FADE_TIME, [OledFadeTime.pattern()], [OledFadeTime.from_string]
+)
+
+
+def get_oled_fade_time(socket: socket.socket) -> OledFadeTime:
+    """
+    Gets the time before the OLED display fades.
+    """
+    returned_values = get_command(socket, SPEC_OLED_FADE_TIME)
+    return returned_values[0]
+
+
+def set_oled_fade_time(socket: socket.socket, fade_time: OledFadeTime) -> None:
+    """
+    Sets the time before the OLED display fades.
+    """
+    set_command(socket, SPEC_OLED_FADE_TIME, [fade_time])
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+"""
+Contains free functions for bringing a switch's settings in line with a desired state.
+"""
+
+import socket
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from . import BatchCommand, execute_many
+from .audio import (
+    AnalogTone,
+    AnalogVolume,
+    SPEC_ANALOG_BASS,
+    SPEC_ANALOG_TREBLE,
+    SPEC_ANALOG_VOLUME,
+    SPEC_HDMI_MUTED_TX0,
+    SPEC_HDMI_MUTED_TX1,
+)
+from .edid import (
+    SPEC_EDID_ALLM_AUTOMIX,
+    SPEC_EDID_DV_AUTOMIX,
+    SPEC_EDID_FRL_AUTOMIX,
+    SPEC_EDID_HDR_AUTOMIX,
+    SPEC_EDID_VRR_AUTOMIX,
+)
+from .input import Input, SPEC_SELECTED_INPUTS
+from .modes import OperationMode, SPEC_AUTO_SWITCHING, SPEC_OPERATION_MODE
+from .network import (
+    IpAddressV4,
+    TcpPort,
+    SPEC_DHCP_ENABLED,
+    SPEC_IP_ADDRESS,
+    SPEC_IP_GATEWAY,
+    SPEC_IP_INTERRUPTS_ENABLED,
+    SPEC_IP_NETWORK_MASK,
+    SPEC_TCP_PORT,
+)
+from .oled import OledFadeTime, SPEC_OLED_FADE_TIME
+from .spec import CommandSpec
+from .values import (
+    first_value,
+    first_value_as_bool,
+    single_value,
+    single_value_from_bool,
+)
+from .video import (
+    SPEC_AVI_INFOFRAME_CUSTOM,
+    SPEC_AVI_INFOFRAME_DISABLE,
+    SPEC_HDR_CUSTOM,
+    SPEC_HDR_DISABLE,
+)
+
+
+class DesiredState(NamedTuple):
+    """
+    Holds the typed values that a switch's settings should have.
+
+    Fields left as None are not managed, and are neither read nor changed.
+    """
+
+    operation_mode: Optional[OperationMode] = None
+    selected_inputs: Optional[Tuple[Input, Input]] = None
+    autoswitch_enabled: Optional[bool] = None
+    edid_frl_automix_enabled: Optional[bool] = None
+    edid_vrr_automix_enabled: Optional[bool] = None
+    edid_allm_automix_enabled: Optional[bool] = None
+    edid_hdr_automix_enabled: Optional[bool] = None
+    edid_dv_automix_enabled: Optional[bool] = None
+    hdr_custom_enabled: Optional[bool] = None
+    hdr_disabled: Optional[bool] = None
+    avi_infoframe_custom_enabled: Optional[bool] = None
+    avi_infoframe_disabled: Optional[bool] = None
+    hdmi_audio_muted_tx0: Optional[bool] = None
+    hdmi_audio_muted_tx1: Optional[bool] = None
+    analog_volume: Optional[AnalogVolume] = None
+    analog_bass: Optional[AnalogTone] = None
+    analog_treble: Optional[AnalogTone] = None
+    oled_fade_time: Optional[OledFadeTime] = None
+    ip_interrupts_enabled: Optional[bool] = None
+    tcp_port: Optional[TcpPort] = None
+    ip_network_mask: Optional[IpAddressV4] = None
+    ip_gateway: Optional[IpAddressV4] = None
+    dhcp_enabled: Optional[bool] = None
+    ip_address: Optional[IpAddressV4] = None
+
+
+class ReconcileReport(NamedTuple):
+    """
+    Describes the settings that differed from the desired state, and were changed.
+
+    Changes map the names of changed fields to their (old, new) values. Some changes,
+    such as to the TCP port, only take effect once the switch is rebooted, and changes
+    to the EDID only once the sources are hotplugged.
+    """
+
+    changes: Dict[str, Tuple[Any, Any]]
+    reboot_required: bool
+    hotplug_required: bool = False
+
+    @property
+    def changed(self) -> bool:
+        """
+        Returns whether any setting was changed.
+        """
+        return bool(self.changes)
+
+
+class _DesiredField(NamedTuple):
+    """
+    Describes how a single desired state field is read from and written to the switch.
+    """
+
+    spec: CommandSpec
+    convert: Callable[[List[Any]], Any]
+    encode: Callable[[Any], List[Any]]
+    requires_reboot: bool = False
+    requires_hotplug: bool = False
+
+
+# Fields must be listed in the same order as they are declared in DesiredState. This is
+# also the order that changes are sent in: network settings are changed last, as they
+# may cut the connection, and the address last of all as it is certain to.
+__DESIRED_FIELDS = (
+    _DesiredField(SPEC_OPERATION_MODE, first_value, single_value),
+    _DesiredField(SPEC_SELECTED_INPUTS, tuple, list),
+    _DesiredField(SPEC_AUTO_SWITCHING, first_value_as_bool, single_value_from_bool),
+    _DesiredField(
+        SPEC_EDID_FRL_AUTOMIX,
+        first_value_as_bool,
+        single_value_from_bool,
+        requires_hotplug=True,
+    ),
+    _DesiredField(
+        SPEC_EDID_VRR_AUTOMIX,
+        first_value_as_bool,
+        single_value_from_bool,
+        requires_hotplug=True,
+    ),
+    _DesiredField(
+        SPEC_EDID_ALLM_AUTOMIX,
+        first_value_as_bool,
+        single_value_from_bool,
+        requires_hotplug=True,
+    ),
+    _DesiredField(
+        SPEC_EDID_HDR_AUTOMIX,
+        first_value_as_bool,
+        single_value_from_bool,
+        requires_hotplug=True,
+    ),
+    _DesiredField(
+        SPEC_EDID_DV_AUTOMIX,
+        first_value_as_bool,
+        single_value_from_bool,
+        requires_hotplug=True,
+    ),
+    _DesiredField(SPEC_HDR_CUSTOM, first_value_as_bool, single_value_from_bool),
+    _DesiredField(SPEC_HDR_DISABLE, first_value_as_bool, single_value_from_bool),
+    _DesiredField(
+        SPEC_AVI_INFOFRAME_CUSTOM, first_value_as_bool, single_value_from_bool
+    ),
+    _DesiredField(
+        SPEC_AVI_INFOFRAME_DISABLE, first_value_as_bool, single_value_from_bool
+    ),
+    _DesiredField(SPEC_HDMI_MUTED_TX0, first_value_as_bool, single_value_from_bool),
+    _DesiredField(SPEC_HDMI_MUTED_TX1, first_value_as_bool, single_value_from_bool),
+    _DesiredField(SPEC_ANALOG_VOLUME, first_value, single_value),
+    _DesiredField(SPEC_ANALOG_BASS, first_value, single_value),
+    _DesiredField(SPEC_ANALOG_TREBLE, first_value, single_value),
+    _DesiredField(SPEC_OLED_FADE_TIME, first_value, single_value),
+    _DesiredField(
+        SPEC_IP_INTERRUPTS_ENABLED, first_value_as_bool, single_value_from_bool
+    ),
+    _DesiredField(SPEC_TCP_PORT, first_value, single_value, requires_reboot=True),
+    _DesiredField(SPEC_IP_NETWORK_MASK, first_value, single_value),
+    _DesiredField(SPEC_IP_GATEWAY, first_value, single_value),
+    _DesiredField(SPEC_DHCP_ENABLED, first_value_as_bool, single_value_from_bool),
+    _DesiredField(SPEC_IP_ADDRESS, first_value, single_value),
+)
+
+
+def reconcile(
+    socket: socket.socket, desired: DesiredState, dry_run: bool = False
+) -> ReconcileReport:
+    """
+    Changes the switch's settings that differ from the desired state.
+
+    Every managed setting is read in one batch, after which only the differing
+    settings are set in a second batch. When nothing differs, this costs a single
+    round trip. With dry run set, the differences are reported but not changed.
+
+    Returns a report of the settings that were changed.
+
+    Raises ValueNotChangedError if the switch does not accept a changed setting.
+    """
+    managed_fields = [
+        (name, field, value)
+        for name, field, value in zip(desired._fields, __DESIRED_FIELDS, desired)
+        if value is not None
+    ]
+    current_values = execute_many(
+        socket, [BatchCommand(field.spec) for _, field, _ in managed_fields]
+    )
+
+    changes = {}
+    commands = []
+    reboot_required = False
+    hotplug_required = False
+    for (name, field, value), values in zip(managed_fields, current_values):
+        current = field.convert(values)
+        # Normalised as if read back, so that e.g. a list of inputs equals a tuple
+        desired_value = field.convert(field.encode(value))
+        if current != desired_value:
+            changes[name] = (current, desired_value)
+            commands.append(BatchCommand(field.spec, field.encode(desired_value)))
+            reboot_required = reboot_required or field.requires_reboot
+            hotplug_required = hotplug_required or field.requires_hotplug
+
+    if commands and not dry_run:
+        execute_many(socket, commands)
+    return ReconcileReport(changes, reboot_required, hotplug_required)
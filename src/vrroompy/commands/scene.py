@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+"""
+Contains a scene engine that switches many VRROOM settings at once with the fewest resyncs.
+"""
+
+import socket
+import time
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from . import BatchCommand, execute_many
+from .actions import SPEC_ACTION_HOTPLUG
+from .enums import OnOffSwitch, Target
+from .spec import CommandSpec
+from .transaction import Transaction
+
+# The stage at which each target is set during a scene change, where lower stages are
+# set first. Sinks may resync on any change, so every change to what the sources
+# advertise or send is made before the inputs are switched, to resync only once.
+__TARGET_STAGES: Dict[Target, int] = {
+    Target.OPERATION_MODE: 1,
+    Target.EDID_MODE: 2,
+    Target.EDID_FRL_AUTOMIX: 2,
+    Target.EDID_VRR_AUTOMIX: 2,
+    Target.EDID_ALLM_AUTOMIX: 2,
+    Target.EDID_HDR_AUTOMIX: 2,
+    Target.EDID_DVF_AUTOMIX: 2,
+    Target.HDR_CUSTOM: 3,
+    Target.HDR_DISABLE: 3,
+    Target.AVI_INFOFRAME_CUSTOM: 3,
+    Target.AVI_INFOFRAME_DISABLE: 3,
+    Target.SELECTED_INPUTS: 4,
+    Target.SELECTED_INPUT_TX0: 4,
+    Target.SELECTED_INPUT_TX1: 4,
+}
+# Audio is muted before anything else changes, and unmuted after everything has
+__MUTE_STAGE = 0
+__UNMUTE_STAGE = 5
+__DEFAULT_STAGE = 5
+__MUTE_TARGETS = frozenset([Target.HDMI_MUTED_TX0, Target.HDMI_MUTED_TX1])
+# Sources only re-read the EDID after a hotplug
+__HOTPLUG_STAGE = 2
+# Targets whose changes only take effect once the sources are hotplugged
+HOTPLUG_TARGETS = frozenset(
+    target for target, stage in __TARGET_STAGES.items() if stage == __HOTPLUG_STAGE
+)
+
+
+class Scene(NamedTuple):
+    """
+    Describes a named set of settings to switch to at once.
+
+    Settings are pairs of a spec and the desired values to set it to. A hotplug of
+    None sends a hotplug only if an EDID setting differs from the switch's current
+    values, while True or False always or never sends one.
+    """
+
+    name: str
+    settings: Sequence[Tuple[CommandSpec, List[Any]]]
+    hotplug: Optional[bool] = None
+
+
+class SceneActivation(NamedTuple):
+    """
+    Describes the activation of a scene, and how long it took end to end.
+    """
+
+    scene: Scene
+    commands: List[BatchCommand]
+    elapsed: float
+
+
+def __stage(command: BatchCommand) -> int:
+    target = command.spec.target
+    if target in __MUTE_TARGETS:
+        muted = command.desired_values[0] == OnOffSwitch.ON
+        return __MUTE_STAGE if muted else __UNMUTE_STAGE
+    return __TARGET_STAGES.get(target, __DEFAULT_STAGE)
+
+
+def compile_scene(
+    scene: Scene, current_values: Optional[Mapping[Target, List[Any]]] = None
+) -> List[BatchCommand]:
+    """
+    Compiles a scene into the ordered commands that switch to it.
+
+    Settings are coalesced into the fewest set commands, then ordered so that sinks
+    resync as few times as possible: audio is muted first, then the operation mode,
+    EDID and infoframe overrides are set before the inputs are switched, and audio is
+    unmuted last. At most one hotplug is sent, after everything else.
+
+    With a hotplug of None, the hotplug is only sent if an EDID setting differs from
+    its current values. If current values are not given, any EDID setting is taken
+    as a change.
+
+    Returns the commands in the order that they should be sent.
+    """
+    transaction = Transaction()
+    for spec, desired_values in scene.settings:
+        transaction.set(spec, desired_values)
+    # Sorting is stable, so commands within a stage keep the order they were set in
+    commands = sorted(transaction.commands(), key=__stage)
+
+    hotplug = scene.hotplug
+    if hotplug is None:
+        hotplug = any(
+            command.spec.target in HOTPLUG_TARGETS
+            and (
+                current_values is None
+                or current_values.get(command.spec.target) != command.desired_values
+            )
+            for command in commands
+        )
+    if hotplug:
+        commands.append(BatchCommand(SPEC_ACTION_HOTPLUG, []))
+    return commands
+
+
+class SceneEngine:
+    """
+    Holds named scenes, and activates them on a switch with a single write.
+
+    Scenes that hotplug only on EDID changes first read the current EDID settings,
+    so that activating a scene whose EDID is already in place does not hotplug.
+    """
+
+    def __init__(self, scenes: Sequence[Scene] = ()) -> None:
+        self.__scenes: Dict[str, Scene] = {}
+        self.__plans: Dict[str, List[BatchCommand]] = {}
+        for scene in scenes:
+            self.add(scene)
+
+    @property
+    def scene_names(self) -> List[str]:
+        """
+        Returns the names of every scene held, in the order they were added.
+        """
+        return list(self.__scenes.keys())
+
+    def add(self, scene: Scene) -> None:
+        """
+        Adds the scene, compiling it ahead of activation and replacing any of the same name.
+        """
+        self.__scenes[scene.name] = scene
+        self.__plans[scene.name] = compile_scene(scene)
+
+    def plan(self, name: str) -> List[BatchCommand]:
+        """
+        Gets the compiled commands of the named scene, as if every EDID setting changes.
+
+        Raises KeyError if no scene has the given name.
+        """
+        return list(self.__plans[name])
+
+    def activate(self, socket: socket.socket, name: str) -> SceneActivation:
+        """
+        Activates the named scene, sending every command with a single write.
+
+        If the scene hotplugs only on EDID changes, its EDID settings are read first,
+        and the hotplug is left out if none of them would change.
+
+        Returns the activation, timed from the first write to the last confirmation.
+
+        Raises KeyError if no scene has the given name.
+        Raises ValueNotChangedError if the switch does not accept a setting.
+        """
+        scene = self.__scenes[name]
+        commands = self.__plans[name]
+        start_time = time.perf_counter()
+        if scene.hotplug is None:
+            edid_specs = [
+                command.spec
+                for command in commands
+                if command.spec.target in HOTPLUG_TARGETS
+            ]
+            if edid_specs:
+                current_values = execute_many(
+                    socket, [BatchCommand(spec) for spec in edid_specs]
+                )
+                commands = compile_scene(
+                    scene,
+                    {
+                        spec.target: values
+                        for spec, values in zip(edid_specs, current_values)
+                    },
+                )
+        execute_many(socket, commands)
+        elapsed = time.perf_counter() - start_time
+        return SceneActivation(scene, list(commands), elapsed)
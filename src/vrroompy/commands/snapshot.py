@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+"""
+Contains free functions for reading every implemented VRROOM value in one burst.
+"""
+
+import socket
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+from . import BatchCommand, execute_many
+from .audio import (
+    AnalogTone,
+    AnalogVolume,
+    SPEC_ANALOG_BASS,
+    SPEC_ANALOG_TREBLE,
+    SPEC_ANALOG_VOLUME,
+    SPEC_HDMI_MUTED_TX0,
+    SPEC_HDMI_MUTED_TX1,
+)
+from .edid import (
+    SPEC_EDID_ALLM_AUTOMIX,
+    SPEC_EDID_DV_AUTOMIX,
+    SPEC_EDID_FRL_AUTOMIX,
+    SPEC_EDID_HDR_AUTOMIX,
+    SPEC_EDID_VRR_AUTOMIX,
+)
+from .input import Input, SPEC_SELECTED_INPUTS
+from .modes import OperationMode, SPEC_AUTO_SWITCHING, SPEC_OPERATION_MODE
+from .network import (
+    IpAddressV4,
+    MacAddress,
+    TcpPort,
+    SPEC_DHCP_ENABLED,
+    SPEC_IP_ADDRESS,
+    SPEC_IP_GATEWAY,
+    SPEC_IP_INTERRUPTS_ENABLED,
+    SPEC_IP_NETWORK_MASK,
+    SPEC_MAC_ADDRESS,
+    SPEC_TCP_PORT,
+)
+from .oled import OledFadeTime, SPEC_OLED_FADE_TIME
+from .values import first_value, first_value_as_bool
+from .video import (
+    SPEC_AVI_INFOFRAME_CUSTOM,
+    SPEC_AVI_INFOFRAME_DISABLE,
+    SPEC_HDR_CUSTOM,
+    SPEC_HDR_DISABLE,
+)
+
+
+class DeviceSnapshot(NamedTuple):
+    """
+    Holds the typed values of every implemented target, as read at a single moment.
+
+    Snapshots are immutable and compare equal when all of their values are equal.
+    """
+
+    operation_mode: OperationMode
+    selected_inputs: Tuple[Input, Input]
+    ip_address: IpAddressV4
+    ip_network_mask: IpAddressV4
+    ip_gateway: IpAddressV4
+    dhcp_enabled: bool
+    ip_interrupts_enabled: bool
+    tcp_port: TcpPort
+    mac_address: MacAddress
+    autoswitch_enabled: bool
+    edid_frl_automix_enabled: bool
+    edid_vrr_automix_enabled: bool
+    edid_allm_automix_enabled: bool
+    edid_hdr_automix_enabled: bool
+    edid_dv_automix_enabled: bool
+    hdr_custom_enabled: bool
+    hdr_disabled: bool
+    avi_infoframe_custom_enabled: bool
+    avi_infoframe_disabled: bool
+    hdmi_audio_muted_tx0: bool
+    hdmi_audio_muted_tx1: bool
+    analog_volume: AnalogVolume
+    analog_bass: AnalogTone
+    analog_treble: AnalogTone
+    oled_fade_time: OledFadeTime
+
+    def diff(self, other: "DeviceSnapshot") -> Dict[str, Tuple[Any, Any]]:
+        """
+        Compares this snapshot against another, newer snapshot.
+
+        Returns a dictionary of the names of differing fields to their (old, new) values.
+        """
+        return {
+            field: (old, new)
+            for field, old, new in zip(self._fields, self, other)
+            if old != new
+        }
+
+
+class _SnapshotField(NamedTuple):
+    """
+    Describes how a single snapshot field is read from the switch.
+    """
+
+    command: BatchCommand
+    convert: Callable[[List[Any]], Any]
+
+
+# Fields must be listed in the same order as they are declared in DeviceSnapshot
+__SNAPSHOT_FIELDS = (
+    _SnapshotField(BatchCommand(SPEC_OPERATION_MODE), first_value),
+    _SnapshotField(BatchCommand(SPEC_SELECTED_INPUTS), tuple),
+    _SnapshotField(BatchCommand(SPEC_IP_ADDRESS), first_value),
+    _SnapshotField(BatchCommand(SPEC_IP_NETWORK_MASK), first_value),
+    _SnapshotField(BatchCommand(SPEC_IP_GATEWAY), first_value),
+    _SnapshotField(BatchCommand(SPEC_DHCP_ENABLED), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_IP_INTERRUPTS_ENABLED), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_TCP_PORT), first_value),
+    _SnapshotField(BatchCommand(SPEC_MAC_ADDRESS), first_value),
+    _SnapshotField(BatchCommand(SPEC_AUTO_SWITCHING), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_EDID_FRL_AUTOMIX), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_EDID_VRR_AUTOMIX), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_EDID_ALLM_AUTOMIX), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_EDID_HDR_AUTOMIX), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_EDID_DV_AUTOMIX), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_HDR_CUSTOM), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_HDR_DISABLE), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_AVI_INFOFRAME_CUSTOM), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_AVI_INFOFRAME_DISABLE), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_HDMI_MUTED_TX0), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_HDMI_MUTED_TX1), first_value_as_bool),
+    _SnapshotField(BatchCommand(SPEC_ANALOG_VOLUME), first_value),
+    _SnapshotField(BatchCommand(SPEC_ANALOG_BASS), first_value),
+    _SnapshotField(BatchCommand(SPEC_ANALOG_TREBLE), first_value),
+    _SnapshotField(BatchCommand(SPEC_OLED_FADE_TIME), first_value),
+)
+
+
+SNAPSHOT_COMMANDS = tuple(field.command for field in __SNAPSHOT_FIELDS)
+
+
+def decode_snapshot(returned_values: List[List[Any]]) -> DeviceSnapshot:
+    """
+    Decodes a snapshot from the values returned by executing SNAPSHOT_COMMANDS.
+    """
+    return DeviceSnapshot._make(
+        field.convert(values)
+        for field, values in zip(__SNAPSHOT_FIELDS, returned_values)
+    )
+
+
+def read_snapshot(socket: socket.socket) -> DeviceSnapshot:
+    """
+    Reads the values of every implemented target from the switch in one batch.
+    """
+    return decode_snapshot(execute_many(socket, SNAPSHOT_COMMANDS))
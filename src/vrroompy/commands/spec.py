@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+"""
+Contains the class describing the prebuilt encoding/decoding of a command target.
+"""
+
+from typing import (
+    Any,
+    ByteString,
+    Callable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+from ..codec import Codec, ValidationLevel
+from ..exceptions import InvalidTargetError
+from .enums import Target
+
+
+class CommandSpec(NamedTuple):
+    """
+    Holds the prebuilt requests and response pattern for commands on a single target.
+
+    Specs should be created once, e.g. at import time, and then reused for every
+    command, so that no strings are built and no regexes are compiled per command.
+    Specs also hold the decoders used when decoding at ValidationLevel.FAST.
+    """
+
+    target: Target
+    value_patterns: Tuple[str, ...]
+    value_converters: Tuple[Callable, ...]
+    response_pattern: Pattern[str]
+    get_request: bytes
+    set_request_prefix: str
+    response_prefix: bytes
+    value_decoders: Tuple[Callable[[bytes], Any], ...]
+
+    @staticmethod
+    def create(
+        target: str,
+        value_patterns: Sequence[str],
+        value_converters: Sequence[Callable],
+        value_lookups: Optional[Sequence[Optional[Iterable[Any]]]] = None,
+    ) -> "CommandSpec":
+        """
+        Creates the spec for commands on the given target and values.
+
+        Value lookups optionally list every possible value of each value, such as an
+        enumeration class. Values with lookups are decoded at ValidationLevel.FAST via
+        a table lookup; all other values are decoded via their converter.
+
+        Raises InvalidTargetError if an invalid command target is specified.
+        Raises ValueError if the value pattern and converter lists are not the same length.
+        """
+        if not Target.is_valid(target):
+            raise InvalidTargetError(
+                f"Invalid target '{target}' was passed to command spec!"
+            )
+        if len(value_patterns) != len(value_converters):
+            raise ValueError(
+                f"Unequal value pattern and converter arrays were passed to command spec!"
+            )
+
+        if value_lookups is None:
+            value_lookups = [None] * len(value_converters)
+        value_decoders = tuple(
+            Codec.decoder_from_converter(converter)
+            if lookup is None
+            else Codec.decoder_from_lookup(lookup)
+            for converter, lookup in zip(value_converters, value_lookups)
+        )
+
+        target = Target(target)
+        return CommandSpec(
+            target,
+            tuple(value_patterns),
+            tuple(value_converters),
+            Codec.compile_response_pattern(target, value_patterns),
+            Codec.encode_command_get(target),
+            f"set {target}",
+            str(target).encode(),
+            value_decoders,
+        )
+
+    def decode(
+        self,
+        response: ByteString,
+        validation_level: ValidationLevel = ValidationLevel.STRICT,
+    ) -> List[Any]:
+        """
+        Decodes a response to a command on this spec's target.
+
+        Raises ResponseParsingError if the response is unable to be parsed.
+        """
+        if validation_level is ValidationLevel.FAST:
+            return Codec.decode_response_fast(
+                response, self.response_prefix, self.value_decoders
+            )
+        return Codec.decode_response_compiled(
+            response, self.response_pattern, self.value_converters
+        )
+
+    def encode_set(self, values: List[Any]) -> bytes:
+        """
+        Encodes a command to set this spec's target to the given value(s).
+
+        Returns the bytestring for the command.
+        """
+        if not values:
+            return Codec.encode_command_raw(self.set_request_prefix)
+        values_str = " ".join([str(val) for val in values])
+        return Codec.encode_command_raw(f"{self.set_request_prefix} {values_str}")
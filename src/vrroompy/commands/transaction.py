@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+"""
+Contains a buffer that coalesces set commands into the fewest commands with the same effect.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from . import BatchCommand
+from .enums import Target
+from .input import SPEC_SELECTED_INPUTS
+from .spec import CommandSpec
+
+# The index of each single-output input target within the values of insel
+_SELECTED_INPUT_INDICES: Dict[Target, int] = {
+    Target.SELECTED_INPUT_TX0: 0,
+    Target.SELECTED_INPUT_TX1: 1,
+}
+
+
+class Transaction:
+    """
+    Buffers set commands so that they can be sent to the switch together.
+
+    Setting a target supersedes any earlier buffered set of the same target, so that
+    only the last value set is sent. Sets of the selected inputs of both outputs are
+    merged into a single set of both inputs at once. Otherwise, commands keep the
+    order in which their targets were last set.
+    """
+
+    def __init__(self) -> None:
+        self.__writes: "OrderedDict[Target, Tuple[CommandSpec, List[Any]]]" = (
+            OrderedDict()
+        )
+        self.set_count = 0
+
+    def __len__(self) -> int:
+        return len(self.__writes)
+
+    def set(self, spec: CommandSpec, desired_values: List[Any]) -> None:
+        """
+        Buffers a set of the spec's target to the desired value(s).
+        """
+        self.set_count += 1
+        desired_values = list(desired_values)
+
+        input_index = _SELECTED_INPUT_INDICES.get(spec.target)
+        if input_index is not None and Target.SELECTED_INPUTS in self.__writes:
+            # Fold the single output into the already buffered set of both outputs
+            _, selected_inputs = self.__writes.pop(Target.SELECTED_INPUTS)
+            selected_inputs[input_index] = desired_values[0]
+            self.__writes[Target.SELECTED_INPUTS] = (
+                SPEC_SELECTED_INPUTS,
+                selected_inputs,
+            )
+            return
+
+        if spec.target == Target.SELECTED_INPUTS:
+            for target in _SELECTED_INPUT_INDICES:
+                self.__writes.pop(target, None)
+        self.__writes.pop(spec.target, None)
+        self.__writes[spec.target] = (spec, desired_values)
+
+    def commands(self) -> List[BatchCommand]:
+        """
+        Gets the fewest set commands that have the effect of every buffered set.
+
+        Returns the commands in the order that they should be sent.
+        """
+        writes = OrderedDict(self.__writes)
+        if all(target in writes for target in _SELECTED_INPUT_INDICES):
+            _, (input_tx0,) = writes[Target.SELECTED_INPUT_TX0]
+            _, (input_tx1,) = writes[Target.SELECTED_INPUT_TX1]
+            # The merged set takes the place of whichever output was set last
+            last_target = [
+                target for target in writes if target in _SELECTED_INPUT_INDICES
+            ][-1]
+            writes[last_target] = (SPEC_SELECTED_INPUTS, [input_tx0, input_tx1])
+            first_target = (
+                Target.SELECTED_INPUT_TX1
+                if last_target == Target.SELECTED_INPUT_TX0
+                else Target.SELECTED_INPUT_TX0
+            )
+            del writes[first_target]
+
+        return [BatchCommand(spec, values) for spec, values in writes.values()]
+
+    def clear(self) -> None:
+        """
+        Discards every buffered set.
+        """
+        self.__writes.clear()
+        self.set_count = 0
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+Contains value classes and value list conversions that are used across multiple commands.
+"""
+
+from typing import Any, List
+
+from .enums import OnOffSwitch
+
+
+class BoundedInteger:
+    """
+    Defines integers valid within an inclusive range, set by subclasses.
+
+    Out-of-range values are rejected on construction, rather than by the switch.
+    """
+
+    MINIMUM = 0
+    MAXIMUM = 0
+
+    def __init__(self, value: int) -> None:
+        if not self.MINIMUM <= value <= self.MAXIMUM:
+            raise ValueError(
+                f"{type(self).__name__} of {value} is outside of the valid range "
+                f"[{self.MINIMUM}, {self.MAXIMUM}]!"
+            )
+        self.__value = value
+
+    def __eq__(self, obj: Any) -> bool:
+        return type(obj) is type(self) and (self.__value == obj.__value)
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.__value))
+
+    def __int__(self) -> int:
+        return self.__value
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.__value})"
+
+    def __str__(self) -> str:
+        return str(self.__value)
+
+    @classmethod
+    def from_string(cls, string: str) -> "BoundedInteger":
+        """
+        Converts a string into an instance of this class, if valid.
+
+        Raises ValueError if the string is not an integer within the valid range.
+        """
+        return cls(int(string))
+
+    @staticmethod
+    def pattern() -> str:
+        """
+        Returns a regex pattern that matches integers of this class' magnitude.
+        """
+        return "-?[0-9]{1,3}"
+
+
+def first_value(values: List[Any]) -> Any:
+    """
+    Returns the first of the values decoded from a response.
+    """
+    return values[0]
+
+
+def first_value_as_bool(values: List[Any]) -> bool:
+    """
+    Returns the first of the values decoded from a response, an on/off switch, as bool.
+    """
+    return OnOffSwitch.to_bool(values[0])
+
+
+def single_value(value: Any) -> List[Any]:
+    """
+    Returns the values to send for a command that takes a single value.
+    """
+    return [value]
+
+
+def single_value_from_bool(value: bool) -> List[Any]:
+    """
+    Returns the values to send for a command that takes a single on/off switch.
+    """
+    return [OnOffSwitch.from_bool(value)]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""
+Contains free functions for getting/setting VRROOM video infoframe overrides.
+"""
+
+import socket
+from . import get_command, set_command
+from .enums import OnOffSwitch, Target
+from .spec import CommandSpec
+
+
+SPEC_HDR_CUSTOM = CommandSpec.create(
+    Target.HDR_CUSTOM,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_hdr_custom_enabled(socket: socket.socket) -> bool:
+    """
+    Gets whether the custom HDR infoframe is sent by the switch.
+    """
+    returned_values = get_command(socket, SPEC_HDR_CUSTOM)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_hdr_custom_enabled(socket: socket.socket, enabled: bool) -> None:
+    """
+    Enables/disables sending the custom HDR infoframe from the switch.
+    """
+    set_command(socket, SPEC_HDR_CUSTOM, [OnOffSwitch.from_bool(enabled)])
+
+
+SPEC_HDR_DISABLE = CommandSpec.create(
+    Target.HDR_DISABLE,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_hdr_disabled(socket: socket.socket) -> bool:
+    """
+    Gets whether HDR infoframes are removed by the switch.
+    """
+    returned_values = get_command(socket, SPEC_HDR_DISABLE)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_hdr_disabled(socket: socket.socket, enabled: bool) -> None:
+    """
+    Enables/disables removing HDR infoframes on the switch.
+    """
+    set_command(socket, SPEC_HDR_DISABLE, [OnOffSwitch.from_bool(enabled)])
+
+
+SPEC_AVI_INFOFRAME_CUSTOM = CommandSpec.create(
+    Target.AVI_INFOFRAME_CUSTOM,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_avi_infoframe_custom_enabled(socket: socket.socket) -> bool:
+    """
+    Gets whether the custom AVI infoframe is sent by the switch.
+    """
+    returned_values = get_command(socket, SPEC_AVI_INFOFRAME_CUSTOM)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_avi_infoframe_custom_enabled(socket: socket.socket, enabled: bool) -> None:
+    """
+    Enables/disables sending the custom AVI infoframe from the switch.
+    """
+    set_command(socket, SPEC_AVI_INFOFRAME_CUSTOM, [OnOffSwitch.from_bool(enabled)])
+
+
+SPEC_AVI_INFOFRAME_DISABLE = CommandSpec.create(
+    Target.AVI_INFOFRAME_DISABLE,
+    [OnOffSwitch.pattern()],
+    [OnOffSwitch.from_string],
+    [OnOffSwitch],
+)
+
+
+def get_avi_infoframe_disabled(socket: socket.socket) -> bool:
+    """
+    Gets whether AVI infoframes are removed by the switch.
+    """
+    returned_values = get_command(socket, SPEC_AVI_INFOFRAME_DISABLE)
+    return OnOffSwitch.to_bool(returned_values[0])
+
+
+def set_avi_infoframe_disabled(socket: socket.socket, enabled: bool) -> None:
+    """
+    Enables/disables removing AVI infoframes on the switch.
+    """
+    set_command(socket, SPEC_AVI_INFOFRAME_DISABLE, [OnOffSwitch.from_bool(enabled)])
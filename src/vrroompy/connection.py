@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""
+Contains a manager that keeps long-lived connections to VRROOM switches for reuse.
+"""
+
+from contextlib import contextmanager
+import socket
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from .commands import BatchCommand, execute_many
+from .commands.modes import SPEC_OPERATION_MODE
+from .exceptions import VrroomError
+
+# Either ESC (0x1b) or ETX (0x03) asks the switch to close the connection
+CLOSE_CONNECTION_CHARACTER = b"\x1b"
+
+
+class _ManagedConnection:
+    """
+    Holds the socket kept open to a single switch, along with its usage state.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.socket: Optional[socket.socket] = None
+        self.last_used = 0.0
+        self.connect_count = 0
+
+
+class ConnectionManager:
+    """
+    Keeps one long-lived connection per (host, port) for commands to borrow.
+
+    Connections are opened on first use and reused afterwards, so that scripts
+    running many small operations do not pay the TCP handshake every time. A
+    connection left idle for longer than the keepalive interval is probed with a
+    cheap 'get opmode' before it is lent out, and is transparently re-opened with
+    exponential backoff if the switch has gone away in the meantime.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 5.0,
+        keepalive_interval: float = 30.0,
+        connect_attempts: int = 5,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.connect_timeout = connect_timeout
+        self.keepalive_interval = keepalive_interval
+        self.connect_attempts = connect_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.__connections: Dict[Tuple[str, int], _ManagedConnection] = {}
+        self.__connections_lock = threading.Lock()
+
+    def __enter__(self) -> "ConnectionManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close_all()
+
+    def __get_managed(self, host: str, port: int) -> _ManagedConnection:
+        with self.__connections_lock:
+            return self.__connections.setdefault((host, port), _ManagedConnection())
+
+    def __open(self, host: str, port: int, managed: _ManagedConnection) -> None:
+        backoff = self.initial_backoff
+        for attempt in range(self.connect_attempts):
+            try:
+                managed.socket = socket.create_connection(
+                    (host, port), self.connect_timeout
+                )
+                managed.connect_count += 1
+                return
+            except OSError:
+                if attempt + 1 == self.connect_attempts:
+                    raise
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    @staticmethod
+    def __close(managed: _ManagedConnection) -> None:
+        if managed.socket is None:
+            return
+        try:
+            managed.socket.sendall(CLOSE_CONNECTION_CHARACTER)
+        except OSError:
+            pass  # Already disconnected, so nothing to close gracefully
+        managed.socket.close()
+        managed.socket = None
+
+    def __is_alive(self, managed: _ManagedConnection) -> bool:
+        # Executed as a batch, so that the probe reaches the switch even when cached
+        try:
+            execute_many(managed.socket, [BatchCommand(SPEC_OPERATION_MODE)])
+        except (OSError, VrroomError):
+            return False
+        return True
+
+    def close(self, host: str, port: int) -> None:
+        """
+        Gracefully closes the connection to the given switch, if one is open.
+        """
+        managed = self.__get_managed(host, port)
+        with managed.lock:
+            self.__close(managed)
+
+    def close_all(self) -> None:
+        """
+        Gracefully closes the connections to every switch.
+        """
+        with self.__connections_lock:
+            connections = list(self.__connections.values())
+        for managed in connections:
+            with managed.lock:
+                self.__close(managed)
+
+    def connect_count(self, host: str, port: int) -> int:
+        """
+        Returns how many times a connection has been opened to the given switch.
+        """
+        return self.__get_managed(host, port).connect_count
+
+    @contextmanager
+    def connection(self, host: str, port: int) -> Iterator[socket.socket]:
+        """
+        Lends out the connection to the given switch for exclusive use.
+
+        The connection is opened, or re-opened after a failed keepalive, as needed.
+        If a command fails with a connection or protocol error while borrowed, the
+        connection is discarded so that the next borrower gets a fresh one.
+
+        Raises OSError if the switch is unreachable after every connect attempt.
+        """
+        managed = self.__get_managed(host, port)
+        with managed.lock:
+            if managed.socket is not None:
+                idle_time = time.monotonic() - managed.last_used
+                if idle_time >= self.keepalive_interval and not self.__is_alive(
+                    managed
+                ):
+                    self.__close(managed)
+            if managed.socket is None:
+                self.__open(host, port, managed)
+
+            try:
+                yield managed.socket
+            except (OSError, VrroomError):
+                self.__close(managed)
+                raise
+            finally:
+                managed.last_used = time.monotonic()
+
+    def keepalive(self) -> None:
+        """
+        Probes every connection that has been idle for longer than the keepalive interval.
+
+        Connections that fail the probe are closed, to be re-opened on next use.
+        Connections currently lent out are skipped.
+        """
+        with self.__connections_lock:
+            connections = list(self.__connections.values())
+        for managed in connections:
+            if not managed.lock.acquire(blocking=False):
+                continue
+            try:
+                idle_time = time.monotonic() - managed.last_used
+                if managed.socket is None or idle_time < self.keepalive_interval:
+                    continue
+                if self.__is_alive(managed):
+                    managed.last_used = time.monotonic()
+                else:
+                    self.__close(managed)
+            finally:
+                managed.lock.release()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+"""
+Contains a setter that coalesces rapid writes to continuous controls, such as volume.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .commands.audio import (
+    AnalogTone,
+    AnalogVolume,
+    SPEC_ANALOG_BASS,
+    SPEC_ANALOG_TREBLE,
+    SPEC_ANALOG_VOLUME,
+)
+from .commands.enums import Target
+from .commands.oled import OledFadeTime, SPEC_OLED_FADE_TIME
+from .commands.spec import CommandSpec
+
+AnyFuture = Union["concurrent.futures.Future[Any]", "asyncio.Future[Any]"]
+SubmitFunction = Callable[[CommandSpec, List[Any]], AnyFuture]
+
+
+class _TargetWrites:
+    """
+    Holds the write in flight to a single target, and the latest value waiting behind it.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight: Optional[AnyFuture] = None
+        self.pending: Optional[List[Any]] = None
+        self.pending_spec: Optional[CommandSpec] = None
+
+
+class CoalescingSetter:
+    """
+    Sets continuous controls with at most one write in flight per target.
+
+    While a write to a target is in flight, further sets of that target only replace
+    the value waiting to be written, so a burst of sets (e.g. from dragging a slider)
+    costs one write per round trip rather than one per set. The waiting value is
+    written as soon as the write in flight is confirmed, so the last value set is
+    always applied promptly, and the switch never falls behind.
+
+    Writes are submitted via the submit() method of either VrroomClient or
+    AsyncVrroomClient. With the latter, sets must be made from its event loop.
+    """
+
+    def __init__(self, client: Any) -> None:
+        self.__submit: SubmitFunction = client.submit
+        # Reentrant, as callbacks run immediately when added to a finished future
+        self.__lock = threading.RLock()
+        self.__targets: Dict[Target, _TargetWrites] = {}
+        self.__errors: List[Exception] = []
+        self.set_count = 0
+        self.write_count = 0
+
+    @property
+    def in_flight(self) -> List[AnyFuture]:
+        """
+        Returns the futures of every write currently in flight.
+        """
+        with self.__lock:
+            return [
+                writes.in_flight
+                for writes in self.__targets.values()
+                if writes.in_flight is not None
+            ]
+
+    def set(self, spec: CommandSpec, desired_values: List[Any]) -> None:
+        """
+        Sets the spec's target to the desired value(s), without waiting for the write.
+
+        Failed writes are reported by the next call to flush() or flush_async().
+        """
+        with self.__lock:
+            self.set_count += 1
+            writes = self.__targets.setdefault(spec.target, _TargetWrites())
+            if writes.in_flight is not None:
+                writes.pending = list(desired_values)
+                writes.pending_spec = spec
+                return
+            self.__write(writes, spec, list(desired_values))
+
+    def __write(
+        self, writes: _TargetWrites, spec: CommandSpec, desired_values: List[Any]
+    ) -> None:
+        # Must be called with the lock held
+        self.write_count += 1
+        writes.in_flight = self.__submit(spec, desired_values)
+        writes.in_flight.add_done_callback(
+            lambda future: self.__on_written(writes, future)
+        )
+
+    def __on_written(self, writes: _TargetWrites, future: AnyFuture) -> None:
+        with self.__lock:
+            if not future.cancelled() and future.exception() is not None:
+                self.__errors.append(future.exception())
+            writes.in_flight = None
+            if writes.pending is not None:
+                spec, desired_values = writes.pending_spec, writes.pending
+                writes.pending = None
+                writes.pending_spec = None
+                try:
+                    self.__write(writes, spec, desired_values)
+                except Exception as error:  # pylint: disable=broad-except
+                    self.__errors.append(error)
+
+    def __raise_errors(self) -> None:
+        with self.__lock:
+            errors = self.__errors
+            self.__errors = []
+        if errors:
+            raise errors[-1]
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits until every value set has been written, for use with VrroomClient.
+
+        Raises the last error of any write that failed since the previous flush.
+        Raises concurrent.futures.TimeoutError if the writes do not finish in time.
+        """
+        # Waiting values are written as earlier writes finish, all within the one timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        in_flight = self.in_flight
+        while in_flight:
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0.0)
+            _, not_done = concurrent.futures.wait(in_flight, remaining)
+            if not_done:
+                raise concurrent.futures.TimeoutError("Writes did not finish in time!")
+            in_flight = self.in_flight
+        self.__raise_errors()
+
+    async def flush_async(self) -> None:
+        """
+        Waits until every value set has been written, for use with AsyncVrroomClient.
+
+        Raises the last error of any write that failed since the previous flush.
+        """
+        in_flight = self.in_flight
+        while in_flight:
+            await asyncio.wait(in_flight)
+            in_flight = self.in_flight
+        self.__raise_errors()
+
+    def set_analog_volume(self, volume: AnalogVolume) -> None:
+        """
+        Sets the volume of the analog audio output.
+        """
+        self.set(SPEC_ANALOG_VOLUME, [volume])
+
+    def set_analog_bass(self, bass: AnalogTone) -> None:
+        """
+        Sets the bass adjustment of the analog audio output.
+        """
+        self.set(SPEC_ANALOG_BASS, [bass])
+
+    def set_analog_treble(self, treble: AnalogTone) -> None:
+        """
+        Sets the treble adjustment of the analog audio output.
+        """
+        self.set(SPEC_ANALOG_TREBLE, [treble])
+
+    def set_oled_fade_time(self, fade_time: OledFadeTime) -> None:
+        """
+        Sets the time before the OLED display fades.
+        """
+        self.set(SPEC_OLED_FADE_TIME, [fade_time])
@@ -4,10 +4,15 @@
 Contains custom exception classes raised by the VRROOM package.
 """
 
+from typing import Any, List, Optional
+
 
 class VrroomError(Exception):
     """Raised when a non-specific Vrroom exception occurs."""
 
+    # Recent traffic of the connection, attached by its flight recorder if it has one
+    flight_recording: Optional[List[Any]] = None
+
 
 class InvalidTargetError(VrroomError):
     """Raised when a command is called with an invalid target."""
@@ -19,3 +24,15 @@ class ResponseParsingError(VrroomError):
 
 class ValueNotChangedError(VrroomError):
     """Raised when a set command fails to set the desired value."""
+
+
+class ConnectionClosedError(VrroomError):
+    """Raised when the switch closes the connection while a response is awaited."""
+
+
+class ResponseMissingError(VrroomError):
+    """Raised when the switch answers later commands without answering this one."""
+
+
+class ReplayMismatchError(VrroomError):
+    """Raised when a replayed connection is sent other bytes than those captured."""
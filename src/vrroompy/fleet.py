@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+
+"""
+Contains pollers for reading the state of many VRROOM switches at once.
+"""
+
+import errno
+import multiprocessing
+from multiprocessing.connection import Connection, wait
+import os
+import selectors
+import socket
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import zlib
+
+from .codec import ValidationLevel
+from .commands import DEFAULT_RECEIVE_BUFFER_SIZE, BatchCommand
+from .commands.snapshot import SNAPSHOT_COMMANDS, decode_snapshot
+from .exceptions import ConnectionClosedError, VrroomError
+from .protocol import VrroomProtocol
+
+DeviceAddress = Tuple[str, int]
+
+
+class DevicePollResult(NamedTuple):
+    """
+    Holds the outcome of polling a single switch.
+
+    Exactly one of the snapshot and the error is set. Switches that did not respond
+    in time have an error of type TimeoutError.
+    """
+
+    snapshot: Any
+    error: Optional[Exception]
+
+
+class _Device:
+    """
+    Holds the connection and in-progress poll state of a single switch.
+    """
+
+    def __init__(self, address: DeviceAddress, validation_level: ValidationLevel):
+        self.address = address
+        self.socket: Optional[socket.socket] = None
+        self.connecting = False
+        self.protocol = VrroomProtocol(validation_level)
+        self.outgoing = b""
+        self.returned_values: List[List[Any]] = []
+        self.result: Optional[DevicePollResult] = None
+
+
+class FleetPoller:
+    """
+    Polls many switches from one thread by multiplexing non-blocking sockets.
+
+    Each poll pipelines the whole poll set to every switch at once and then reads
+    all of the responses as they arrive, so a poll of the fleet costs roughly one
+    round trip rather than one per command per switch. Connections are kept open
+    between polls and re-opened on the next poll after any failure.
+
+    By default the poll set reads every implemented target into a DeviceSnapshot.
+    """
+
+    def __init__(
+        self,
+        addresses: Sequence[DeviceAddress],
+        timeout: float = 5.0,
+        commands: Sequence[BatchCommand] = SNAPSHOT_COMMANDS,
+        decode: Callable[[List[List[Any]]], Any] = decode_snapshot,
+        validation_level: ValidationLevel = ValidationLevel.STRICT,
+    ) -> None:
+        self.timeout = timeout
+        self.__commands = tuple(commands)
+        self.__decode = decode
+        self.__request = b"".join(command.encode() for command in self.__commands)
+        self.__selector = selectors.DefaultSelector()
+        self.__devices = {
+            tuple(address): _Device(tuple(address), validation_level)
+            for address in addresses
+        }
+
+    def __enter__(self) -> "FleetPoller":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def addresses(self) -> List[DeviceAddress]:
+        """
+        Returns the addresses of every switch polled, in the order they were given.
+        """
+        return list(self.__devices.keys())
+
+    def close(self) -> None:
+        """
+        Closes the connections to every switch.
+        """
+        for device in self.__devices.values():
+            self.__disconnect(device)
+        self.__selector.close()
+
+    def __unwatch(self, device: _Device) -> None:
+        # Connections are only watched while polled, so that bytes or a hang up between
+        # polls cannot keep waking the selector
+        if device.socket in self.__selector.get_map():
+            self.__selector.unregister(device.socket)
+
+    def __disconnect(self, device: _Device) -> None:
+        if device.socket is not None:
+            self.__unwatch(device)
+            device.socket.close()
+            device.socket = None
+        device.protocol.clear()
+
+    def __fail(self, device: _Device, error: Exception) -> None:
+        self.__disconnect(device)
+        device.result = DevicePollResult(None, error)
+
+    def __start(self, device: _Device) -> None:
+        device.result = None
+        device.returned_values = []
+        if device.socket is None:
+            device.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            device.socket.setblocking(False)
+            connect_error = device.socket.connect_ex(device.address)
+            if connect_error not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                device.socket.close()
+                device.socket = None
+                raise OSError(connect_error, f"Unable to connect to {device.address}")
+            device.connecting = True
+
+        for command in self.__commands:
+            device.protocol.send_command(command.spec.target, command.encode(), command)
+        device.outgoing = self.__request
+        self.__selector.register(
+            device.socket, selectors.EVENT_READ | selectors.EVENT_WRITE, device
+        )
+
+    def __on_writable(self, device: _Device) -> None:
+        if device.connecting:
+            connect_error = device.socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if connect_error:
+                raise OSError(connect_error, f"Unable to connect to {device.address}")
+            device.connecting = False
+
+        sent_count = device.socket.send(device.outgoing)
+        device.outgoing = device.outgoing[sent_count:]
+        if not device.outgoing:
+            self.__selector.modify(device.socket, selectors.EVENT_READ, device)
+
+    def __on_readable(self, device: _Device) -> None:
+        received = device.socket.recv(DEFAULT_RECEIVE_BUFFER_SIZE)
+        if not received:
+            raise ConnectionClosedError("Connection was closed during poll!")
+        device.protocol.receive_data(received)
+
+        response = device.protocol.next_response()
+        while response is not None:
+            if response.command is not None:
+                command: BatchCommand = response.command.context
+                device.returned_values.append(
+                    command.spec.decode(response.line, device.protocol.validation_level)
+                )
+            response = device.protocol.next_response()
+
+        if len(device.returned_values) == len(self.__commands):
+            self.__unwatch(device)
+            device.result = DevicePollResult(
+                self.__decode(device.returned_values), None
+            )
+
+    def poll(self) -> Dict[DeviceAddress, DevicePollResult]:
+        """
+        Polls every switch once, waiting no longer than the timeout in total.
+
+        Returns a dictionary of each switch's address to the result of its poll.
+        """
+        outstanding = 0
+        for device in self.__devices.values():
+            try:
+                self.__start(device)
+                outstanding += 1
+            except OSError as error:
+                self.__fail(device, error)
+
+        deadline = time.monotonic() + self.timeout
+        while outstanding:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, events in self.__selector.select(remaining):
+                device: _Device = key.data
+                if device.result is not None:
+                    continue
+                try:
+                    if events & selectors.EVENT_WRITE:
+                        self.__on_writable(device)
+                    if events & selectors.EVENT_READ:
+                        self.__on_readable(device)
+                except BlockingIOError:
+                    pass  # Spurious readiness; wait for the next event
+                except (OSError, VrroomError) as error:
+                    self.__fail(device, error)
+                if device.result is not None:
+                    outstanding -= 1
+
+        for device in self.__devices.values():
+            if device.result is None:
+                self.__fail(
+                    device, TimeoutError(f"Poll of {device.address} timed out!")
+                )
+        return {address: device.result for address, device in self.__devices.items()}
+
+
+CompactValues = Tuple[Tuple[str, ...], ...]
+
+
+def encode_compact(returned_values: List[List[Any]]) -> CompactValues:
+    """
+    Encodes the values returned by a poll into the compact form sent between processes.
+
+    Every value type encodes to its string form on the wire, so the compact form is
+    simply those strings, which are cheap to pickle and to convert back.
+    """
+    return tuple(tuple(str(value) for value in values) for values in returned_values)
+
+
+def decode_compact(
+    compact_values: CompactValues, commands: Sequence[BatchCommand]
+) -> List[List[Any]]:
+    """
+    Decodes values from their compact form via the converters of their commands.
+
+    No validation is done here, as the values were validated when first decoded.
+    """
+    return [
+        [
+            converter(value)
+            for converter, value in zip(command.spec.value_converters, values)
+        ]
+        for command, values in zip(commands, compact_values)
+    ]
+
+
+def shard_for(address: DeviceAddress, shard_count: int) -> int:
+    """
+    Returns the shard that polls the given switch, stable across runs and processes.
+    """
+    host, port = address
+    return zlib.crc32(f"{host}:{port}".encode()) % shard_count
+
+
+def _poll_worker(
+    connection: Connection,
+    addresses: List[DeviceAddress],
+    timeout: float,
+    validation_level: ValidationLevel,
+) -> None:
+    with FleetPoller(
+        addresses, timeout, decode=encode_compact, validation_level=validation_level
+    ) as poller:
+        while connection.recv():
+            connection.send(poller.poll())
+
+
+class ShardedFleetPoller:
+    """
+    Polls thousands of switches by sharding them across a pool of worker processes.
+
+    Each worker process runs its own FleetPoller with persistent connections to its
+    shard of the switches, so response decoding is spread across every core. Switches
+    are assigned to workers by a stable hash of their address, and results stream
+    back to the parent in compact form. A worker that dies is restarted with the same
+    shard, and its switches report a VrroomError for the poll that it failed.
+    """
+
+    def __init__(
+        self,
+        addresses: Sequence[DeviceAddress],
+        worker_count: Optional[int] = None,
+        timeout: float = 5.0,
+        validation_level: ValidationLevel = ValidationLevel.STRICT,
+    ) -> None:
+        self.timeout = timeout
+        self.validation_level = validation_level
+        self.__worker_count = worker_count or os.cpu_count() or 1
+        self.__shards: List[List[DeviceAddress]] = [
+            [] for _ in range(self.__worker_count)
+        ]
+        for address in addresses:
+            address = tuple(address)
+            self.__shards[shard_for(address, self.__worker_count)].append(address)
+        self.__addresses = [tuple(address) for address in addresses]
+        self.__workers: List[Optional[multiprocessing.Process]] = [
+            None
+        ] * self.__worker_count
+        self.__connections: List[Optional[Connection]] = [None] * self.__worker_count
+        self.restart_count = 0
+
+    def __enter__(self) -> "ShardedFleetPoller":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def shards(self) -> List[List[DeviceAddress]]:
+        """
+        Returns the addresses of the switches polled by each worker process.
+        """
+        return [list(shard) for shard in self.__shards]
+
+    def __start_worker(self, index: int) -> None:
+        parent_connection, worker_connection = multiprocessing.Pipe()
+        worker = multiprocessing.Process(
+            target=_poll_worker,
+            args=(
+                worker_connection,
+                self.__shards[index],
+                self.timeout,
+                self.validation_level,
+            ),
+            name=f"VrroomFleetWorker-{index}",
+            daemon=True,
+        )
+        worker.start()
+        worker_connection.close()
+        self.__workers[index] = worker
+        self.__connections[index] = parent_connection
+
+    def __stop_worker(self, index: int) -> None:
+        worker = self.__workers[index]
+        connection = self.__connections[index]
+        if connection is not None:
+            try:
+                connection.send(False)
+            except OSError:
+                pass  # Worker has already gone away
+            connection.close()
+        if worker is not None:
+            worker.join(self.timeout)
+            if worker.is_alive():
+                worker.kill()
+                worker.join()
+        self.__workers[index] = None
+        self.__connections[index] = None
+
+    def close(self) -> None:
+        """
+        Stops every worker process, closing their connections to the switches.
+        """
+        for index in range(self.__worker_count):
+            self.__stop_worker(index)
+
+    def poll(self) -> Dict[DeviceAddress, DevicePollResult]:
+        """
+        Polls every switch once across all worker processes.
+
+        Returns a dictionary of each switch's address to the result of its poll.
+        """
+        requested = {}
+        for index, shard in enumerate(self.__shards):
+            if not shard:
+                continue
+            worker = self.__workers[index]
+            if worker is None or not worker.is_alive():
+                self.__stop_worker(index)
+                self.__start_worker(index)
+            try:
+                self.__connections[index].send(True)
+                requested[self.__connections[index]] = index
+            except OSError:
+                self.__restart_failed(index)
+
+        results: Dict[DeviceAddress, DevicePollResult] = {}
+        # Workers time out their own polls, so only allow extra time for overheads
+        deadline = time.monotonic() + self.timeout * 2
+        while requested:
+            remaining = deadline - time.monotonic()
+            ready = wait(list(requested.keys()), max(remaining, 0))
+            if not ready:
+                break
+            for connection in ready:
+                index = requested.pop(connection)
+                try:
+                    shard_results = connection.recv()
+                except (EOFError, OSError):
+                    self.__restart_failed(index)
+                    continue
+                results.update(self.__expand(shard_results))
+        for index in requested.values():
+            self.__restart_failed(index)
+
+        for address in self.__addresses:
+            if address not in results:
+                results[address] = DevicePollResult(
+                    None, VrroomError(f"Poll worker for {address} failed!")
+                )
+        return {address: results[address] for address in self.__addresses}
+
+    def __restart_failed(self, index: int) -> None:
+        self.restart_count += 1
+        self.__stop_worker(index)
+        self.__start_worker(index)
+
+    @staticmethod
+    def __expand(
+        shard_results: Dict[DeviceAddress, DevicePollResult]
+    ) -> Dict[DeviceAddress, DevicePollResult]:
+        return {
+            address: DevicePollResult(
+                decode_snapshot(decode_compact(result.snapshot, SNAPSHOT_COMMANDS)),
+                None,
+            )
+            if result.error is None
+            else result
+            for address, result in shard_results.items()
+        }
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+
+"""
+Contains an adaptive poller that reads each target of many switches only as often as it changes.
+"""
+
+import asyncio
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from enum import Enum
+import logging
+import math
+import random
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .async_client import AsyncVrroomClient
+from .client import VrroomClient
+from .commands import BatchCommand
+from .commands.enums import Target
+from .commands.spec import CommandSpec
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Volatility(Enum):
+    """
+    Defines how often the values of a target are expected to change.
+    """
+
+    STATIC = "static"
+    SLOW = "slow"
+    NORMAL = "normal"
+    FAST = "fast"
+
+
+class PollRate(NamedTuple):
+    """
+    Describes how often a target is polled, in seconds between polls.
+
+    A target is polled at the minimum interval after its values change, and the
+    interval grows by the decay factor after every poll that finds them unchanged,
+    up to the maximum. Targets with an infinite minimum interval are read only once.
+    """
+
+    min_interval: float
+    max_interval: float
+    decay: float = 1.5
+
+
+DEFAULT_POLL_RATES: Mapping[Volatility, PollRate] = {
+    Volatility.STATIC: PollRate(math.inf, math.inf),
+    Volatility.SLOW: PollRate(60.0, 600.0, 2.0),
+    Volatility.NORMAL: PollRate(5.0, 60.0),
+    Volatility.FAST: PollRate(1.0, 10.0),
+}
+
+# Targets not listed are of normal volatility
+DEFAULT_VOLATILITIES: Mapping[Target, Volatility] = {
+    Target.MAC_ADDRESS: Volatility.STATIC,
+    Target.IP_ADDRESS: Volatility.SLOW,
+    Target.IP_NETWORK_MASK: Volatility.SLOW,
+    Target.IP_GATEWAY: Volatility.SLOW,
+    Target.DHCP_ENABLED: Volatility.SLOW,
+    Target.IP_INTERRUPTS_ENABLED: Volatility.SLOW,
+    Target.TCP_PORT: Volatility.SLOW,
+    Target.OPERATION_MODE: Volatility.FAST,
+    Target.SELECTED_INPUTS: Volatility.FAST,
+    Target.SELECTED_INPUT_TX0: Volatility.FAST,
+    Target.SELECTED_INPUT_TX1: Volatility.FAST,
+}
+
+
+class TimerWheel:
+    """
+    Holds items until they are due, in slots of a fixed tick length.
+
+    Scheduling and expiring an item costs constant time however many are held, as
+    items are only ever compared against the slot of their due tick. Items due beyond
+    one turn of the wheel wait in their slot until the turn in which they fall due.
+    """
+
+    def __init__(self, tick: float, slot_count: int, start: float) -> None:
+        if tick <= 0 or slot_count < 1:
+            raise ValueError("Timer wheel must have a positive tick and slot count!")
+        self.tick = tick
+        self.__start = start
+        self.__slots: List[List[Tuple[int, Any]]] = [[] for _ in range(slot_count)]
+        self.__next_tick = 0
+        self.__count = 0
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def schedule(self, when: float, item: Any) -> None:
+        """
+        Holds the item until the tick holding the given time, or the next if that has passed.
+        """
+        due_tick = max(math.floor((when - self.__start) / self.tick), self.__next_tick)
+        self.__slots[due_tick % len(self.__slots)].append((due_tick, item))
+        self.__count += 1
+
+    def advance(self, now: float) -> List[Any]:
+        """
+        Expires every item due at or before the given time.
+
+        Returns the expired items, in order of their due tick.
+        """
+        last_tick = math.floor((now - self.__start) / self.tick)
+        if last_tick < self.__next_tick:
+            return []
+
+        expired: List[Tuple[int, Any]] = []
+        # A jump of more than one turn only needs to visit every slot once
+        slot_count = min(last_tick - self.__next_tick + 1, len(self.__slots))
+        for tick in range(self.__next_tick, self.__next_tick + slot_count):
+            slot = self.__slots[tick % len(self.__slots)]
+            remaining = [entry for entry in slot if entry[0] > last_tick]
+            if len(remaining) != len(slot):
+                expired.extend(entry for entry in slot if entry[0] <= last_tick)
+                slot[:] = remaining
+        self.__next_tick = last_tick + 1
+        self.__count -= len(expired)
+        expired.sort(key=lambda entry: entry[0])
+        return [item for _, item in expired]
+
+
+class ChangeEvent(NamedTuple):
+    """
+    Describes a change in the values of a target of a switch, found by polling.
+
+    The old values are None for the first read of each target.
+    """
+
+    device: Hashable
+    target: Target
+    old_values: Optional[List[Any]]
+    new_values: List[Any]
+
+
+ChangeCallback = Callable[[ChangeEvent], None]
+
+
+class _PollState:
+    """
+    Holds the last values and current poll interval of one target of one switch.
+    """
+
+    def __init__(self, device: Hashable, spec: CommandSpec, rate: PollRate) -> None:
+        self.device = device
+        self.spec = spec
+        self.rate = rate
+        self.interval = rate.min_interval
+        self.values: Optional[List[Any]] = None
+        self.removed = False
+
+
+class AdaptivePoller:
+    """
+    Polls the targets of many switches, each at a rate adapted to how often it changes.
+
+    Every target has a volatility class that sets the range of its poll interval.
+    Intervals shrink to the minimum as soon as a change is seen, then decay back
+    towards the maximum while the values stay the same, so bandwidth goes to the
+    targets that are actually changing. Polls are held on a timer wheel, and every
+    interval is jittered, so that the polls of many switches spread out over time
+    rather than falling due in lockstep.
+
+    Subscribers are notified of changes, rather than being passed every poll result.
+    Any exception raised by a subscriber is logged, so that it cannot stop polling.
+    A poll not answered within the poll timeout fails, and is retried like any other.
+    """
+
+    def __init__(
+        self,
+        specs: Sequence[CommandSpec],
+        volatilities: Optional[Mapping[Target, Volatility]] = None,
+        rates: Optional[Mapping[Volatility, PollRate]] = None,
+        tick: float = 0.1,
+        slot_count: int = 1024,
+        jitter: float = 0.1,
+        retry_interval: float = 5.0,
+        poll_timeout: Optional[float] = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.__specs = tuple(specs)
+        self.__volatilities = dict(
+            DEFAULT_VOLATILITIES if volatilities is None else volatilities
+        )
+        self.__rates = dict(DEFAULT_POLL_RATES if rates is None else rates)
+        self.__jitter = jitter
+        self.__retry_interval = retry_interval
+        self.__poll_timeout = poll_timeout
+        self.__clock = clock
+        self.__random = random.Random(seed)
+        self.__wheel = TimerWheel(tick, slot_count, clock())
+        self.__devices: Dict[Hashable, Dict[Target, _PollState]] = {}
+        self.__subscribers: List[ChangeCallback] = []
+        self.poll_count = 0
+        self.change_count = 0
+
+    @property
+    def devices(self) -> List[Hashable]:
+        """
+        Returns the keys of every switch polled, in the order they were added.
+        """
+        return list(self.__devices.keys())
+
+    @property
+    def scheduled_count(self) -> int:
+        """
+        Returns the number of polls waiting on the timer wheel.
+        """
+        return len(self.__wheel)
+
+    def volatility(self, target: Target) -> Volatility:
+        """
+        Returns the volatility class of the target.
+        """
+        return self.__volatilities.get(target, Volatility.NORMAL)
+
+    def interval(self, device: Hashable, target: Target) -> float:
+        """
+        Returns the current poll interval of the target of the switch.
+        """
+        return self.__devices[device][target].interval
+
+    def values(self, device: Hashable, target: Target) -> Optional[List[Any]]:
+        """
+        Returns the values of the target of the switch last polled, if any.
+        """
+        return self.__devices[device][target].values
+
+    def subscribe(self, callback: ChangeCallback) -> Callable[[], None]:
+        """
+        Subscribes the callback to every change subsequently found by polling.
+
+        Returns a function that unsubscribes the callback when called.
+        """
+        self.__subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self.__subscribers:
+                self.__subscribers.remove(callback)
+
+        return unsubscribe
+
+    def __jittered(self, interval: float) -> float:
+        return interval * (1 + self.__random.uniform(-self.__jitter, self.__jitter))
+
+    def __schedule(self, state: _PollState, delay: float) -> None:
+        if math.isfinite(delay):
+            self.__wheel.schedule(self.__clock() + delay, state)
+
+    def add_device(self, device: Hashable) -> None:
+        """
+        Starts polling the switch, reading every target once within the next tick.
+        """
+        if device in self.__devices:
+            return
+        states = {}
+        for spec in self.__specs:
+            rate = self.__rates[self.volatility(spec.target)]
+            state = _PollState(device, spec, rate)
+            states[spec.target] = state
+            self.__schedule(state, 0.0)
+        self.__devices[device] = states
+
+    def remove_device(self, device: Hashable) -> None:
+        """
+        Stops polling the switch.
+        """
+        for state in self.__devices.pop(device, {}).values():
+            state.removed = True
+
+    def due(self) -> Dict[Hashable, List[CommandSpec]]:
+        """
+        Takes every poll that has fallen due off the timer wheel.
+
+        Each poll taken must be passed back to observe() or fail() to be rescheduled.
+
+        Returns a dictionary of each switch with due polls to the specs to read.
+        """
+        polls: Dict[Hashable, List[CommandSpec]] = {}
+        for state in self.__wheel.advance(self.__clock()):
+            if not state.removed:
+                polls.setdefault(state.device, []).append(state.spec)
+        return polls
+
+    def observe(self, device: Hashable, target: Target, values: List[Any]) -> bool:
+        """
+        Records the values read by a poll, adapting and rescheduling the next poll.
+
+        Returns whether the values changed since the previous poll.
+        """
+        state = self.__devices.get(device, {}).get(target)
+        if state is None:
+            return False  # The switch was removed while being polled
+        self.poll_count += 1
+        changed = state.values != values
+        old_values = state.values
+        state.values = values
+        if changed and old_values is not None:
+            state.interval = state.rate.min_interval
+        elif not changed:
+            state.interval = min(
+                state.interval * state.rate.decay, state.rate.max_interval
+            )
+        self.__schedule(state, self.__jittered(state.interval))
+
+        if changed:
+            self.change_count += 1
+            event = ChangeEvent(device, target, old_values, values)
+            for callback in list(self.__subscribers):
+                try:
+                    callback(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Change subscriber %r raised an exception", callback
+                    )
+        return changed
+
+    def fail(self, device: Hashable, target: Target) -> None:
+        """
+        Reschedules a poll that could not be read, retrying no later than the retry interval.
+        """
+        state = self.__devices.get(device, {}).get(target)
+        if state is not None:
+            delay = min(state.interval, self.__retry_interval)
+            self.__schedule(state, self.__jittered(delay))
+
+    def __observe_all(
+        self,
+        device: Hashable,
+        specs: List[CommandSpec],
+        results: Sequence[Any],
+    ) -> None:
+        for spec, result in zip(specs, results):
+            if isinstance(result, Exception):
+                self.fail(device, spec.target)
+            else:
+                self.observe(device, spec.target, result)
+
+    def poll(self, clients: Mapping[Hashable, VrroomClient]) -> int:
+        """
+        Reads every due target of the switches, with one write to each switch.
+
+        Every switch is written to before any response is awaited, so the due polls
+        of the fleet cost roughly one round trip.
+
+        Returns the number of targets polled.
+        """
+        polls = self.due()
+        pending = []
+        for device, specs in polls.items():
+            try:
+                futures = clients[device].submit_many(
+                    [BatchCommand(spec) for spec in specs]
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                self.__observe_all(device, specs, [error] * len(specs))
+                continue
+            pending.append((device, specs, futures))
+
+        deadline = None
+        if self.__poll_timeout is not None:
+            deadline = self.__clock() + self.__poll_timeout
+        for device, specs, futures in pending:
+            results = []
+            for future in futures:
+                timeout = None
+                if deadline is not None:
+                    timeout = max(deadline - self.__clock(), 0.0)
+                try:
+                    results.append(future.result(timeout))
+                except FutureTimeoutError as error:
+                    future.cancel()
+                    results.append(error)
+                except Exception as error:  # pylint: disable=broad-except
+                    results.append(error)
+            self.__observe_all(device, specs, results)
+        return sum(len(specs) for specs in polls.values())
+
+    async def __poll_device_async(
+        self,
+        clients: Mapping[Hashable, AsyncVrroomClient],
+        device: Hashable,
+        specs: List[CommandSpec],
+    ) -> None:
+        try:
+            results: Sequence[Any] = await asyncio.wait_for(
+                clients[device].execute_many([BatchCommand(spec) for spec in specs]),
+                self.__poll_timeout,
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            results = [error] * len(specs)
+        self.__observe_all(device, specs, results)
+
+    async def poll_async(self, clients: Mapping[Hashable, AsyncVrroomClient]) -> int:
+        """
+        Reads every due target of the switches, polling every switch concurrently.
+
+        Returns the number of targets polled.
+        """
+        polls = self.due()
+        await asyncio.gather(
+            *[
+                self.__poll_device_async(clients, device, specs)
+                for device, specs in polls.items()
+            ]
+        )
+        return sum(len(specs) for specs in polls.values())
+
+    async def run_async(self, clients: Mapping[Hashable, AsyncVrroomClient]) -> None:
+        """
+        Polls the switches once per tick of the timer wheel, until cancelled.
+        """
+        while True:
+            await self.poll_async(clients)
+            await asyncio.sleep(self.__wheel.tick)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+
+"""
+Contains a sans-IO state machine that frames VRROOM responses from a byte stream.
+"""
+
+from collections import deque
+from enum import Enum
+import logging
+from typing import (
+    Any,
+    ByteString,
+    Callable,
+    Deque,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .codec import Codec, ValidationLevel
+from .recorder import FlightRecorder
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PendingCommand(NamedTuple):
+    """
+    Describes a command that has been sent to the switch and awaits its response.
+
+    The context field is opaque to the protocol and is handed back with the response.
+    """
+
+    target: str
+    request: bytes
+    context: Any = None
+
+
+class Response(NamedTuple):
+    """
+    Describes a complete, terminated response received from the switch.
+
+    The command field is None if the response was not matched to a sent command.
+    """
+
+    command: Optional[PendingCommand]
+    line: bytes
+
+    def decode(
+        self, value_patterns: List[str], value_converters: List[Callable]
+    ) -> List[Any]:
+        """
+        Decodes the values of this response against the target of its command.
+
+        Raises ResponseParsingError if the response is unable to be parsed.
+        """
+        target = self.command.target if self.command is not None else ""
+        return Codec.decode_response(
+            self.line, target, value_patterns, value_converters
+        )
+
+
+class InterruptEvent(NamedTuple):
+    """
+    Describes an unsolicited interrupt message sent by the switch.
+
+    The name is the first word after 'int', such as a target or a port, and the
+    values are the remaining words of the message.
+    """
+
+    name: str
+    values: Tuple[str, ...]
+    line: bytes
+
+    @staticmethod
+    def decode(line: bytes) -> "InterruptEvent":
+        """
+        Decodes an interrupt message, including its 'int' prefix and terminator.
+        """
+        words = line.decode("ascii", errors="replace").split()[1:]
+        name = words[0] if words else ""
+        return InterruptEvent(name, tuple(words[1:]), line)
+
+
+InterruptCallback = Callable[[InterruptEvent], None]
+
+
+class InterruptSubscribers:
+    """
+    Holds the callbacks subscribed to interrupt events, and calls them on dispatch.
+    """
+
+    def __init__(self) -> None:
+        self.__callbacks: List[InterruptCallback] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.__callbacks)
+
+    def subscribe(self, callback: InterruptCallback) -> Callable[[], None]:
+        """
+        Subscribes the callback to every event subsequently dispatched.
+
+        Returns a function that unsubscribes the callback when called.
+        """
+        self.__callbacks.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self.__callbacks:
+                self.__callbacks.remove(callback)
+
+        return unsubscribe
+
+    def dispatch(self, event: InterruptEvent) -> None:
+        """
+        Calls every subscribed callback with the event, in order of subscription.
+
+        Any exception raised by a callback is logged, and does not stop the dispatch.
+        """
+        # Copy the callbacks, as they may unsubscribe themselves
+        for callback in list(self.__callbacks):
+            try:
+                callback(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Interrupt callback %r raised an exception", callback)
+
+
+class VrroomProtocol:
+    """
+    Frames VRROOM responses from a byte stream without performing any I/O.
+
+    Callers encode commands through this class and write the returned bytes to their
+    transport of choice. Bytes read from the transport are then fed back via
+    receive_data(), and complete responses are pulled out via next_response().
+    Each response is matched to the oldest pending command on the target named by
+    its first word. Older pending commands passed over by the match are discarded,
+    as the switch did not answer them, and handed to the on_skipped callback if set.
+
+    Unsolicited interrupt messages, sent by the switch while IP interrupts are enabled,
+    are never matched to a command. They are instead counted and passed as events to
+    every subscribed callback, from within receive_data().
+
+    The validation level chooses how thoroughly callers should decode the responses.
+    If a flight recorder is given, every command sent and every byte received through
+    the protocol is recorded into it.
+    """
+
+    INTERRUPT_PREFIX = b"int "
+    __RESPONSE_TERMINATOR = b"\n"
+
+    def __init__(
+        self,
+        validation_level: ValidationLevel = ValidationLevel.STRICT,
+        flight_recorder: Optional[FlightRecorder] = None,
+    ) -> None:
+        self.validation_level = validation_level
+        self.flight_recorder = flight_recorder
+        self.on_skipped: Optional[Callable[[PendingCommand], None]] = None
+        self.__buffer = bytearray()
+        self.__scan_offset = 0
+        self.__pending: Deque[PendingCommand] = deque()
+        # The target name each pending command's response starts with, in step
+        self.__pending_names: Deque[bytes] = deque()
+        self.__responses: Deque[Response] = deque()
+        self.__interrupt_count = 0
+        self.__interrupt_subscribers = InterruptSubscribers()
+
+    @property
+    def buffered_byte_count(self) -> int:
+        """
+        Returns the number of received bytes not yet framed into a response.
+        """
+        return len(self.__buffer)
+
+    @property
+    def interrupt_count(self) -> int:
+        """
+        Returns the number of interrupt messages received over the protocol's lifetime.
+        """
+        return self.__interrupt_count
+
+    @property
+    def pending_commands(self) -> List[PendingCommand]:
+        """
+        Returns the sent commands that have not yet received a response, oldest first.
+        """
+        return list(self.__pending)
+
+    def clear(self) -> None:
+        """
+        Discards all buffered bytes, pending commands and unread responses.
+
+        This should be called whenever the underlying transport is reconnected.
+        """
+        self.__buffer.clear()
+        self.__scan_offset = 0
+        self.__pending.clear()
+        self.__pending_names.clear()
+        self.__responses.clear()
+
+    def next_response(self) -> Optional[Response]:
+        """
+        Returns the oldest complete response not yet read, or None if there are none.
+        """
+        if self.__responses:
+            return self.__responses.popleft()
+        return None
+
+    def receive_data(self, data: ByteString) -> int:
+        """
+        Feeds bytes received from the transport into the protocol.
+
+        Returns the number of new complete responses framed from the data, excluding
+        interrupt messages.
+        """
+        if self.flight_recorder is not None:
+            self.flight_recorder.record_received(data)
+        buffer = self.__buffer
+        buffer += data
+
+        framed_count = 0
+        line_start = 0
+        # Only scan bytes that have not been scanned already on a previous call
+        line_end = buffer.find(self.__RESPONSE_TERMINATOR, self.__scan_offset)
+        while line_end != -1:
+            line_end += 1
+            if buffer.startswith(self.INTERRUPT_PREFIX, line_start):
+                self.__interrupt_count += 1
+                if self.__interrupt_subscribers:
+                    line = bytes(buffer[line_start:line_end])
+                    self.__interrupt_subscribers.dispatch(InterruptEvent.decode(line))
+            else:
+                line = bytes(buffer[line_start:line_end])
+                self.__responses.append(Response(self.__match(line), line))
+                framed_count += 1
+            line_start = line_end
+            line_end = buffer.find(self.__RESPONSE_TERMINATOR, line_start)
+
+        if line_start:
+            del buffer[:line_start]
+        self.__scan_offset = len(buffer)
+        return framed_count
+
+    def __match(self, line: bytes) -> Optional[PendingCommand]:
+        pending_names = self.__pending_names
+        if not pending_names:
+            return None
+        words = line.split(None, 1)
+        name = words[0] if words else b""
+        if pending_names[0] != name:
+            if name not in pending_names:
+                return None  # Answers no pending command, e.g. an abandoned one
+            for _ in range(pending_names.index(name)):
+                pending_names.popleft()
+                skipped = self.__pending.popleft()
+                if self.on_skipped is not None:
+                    self.on_skipped(skipped)
+        pending_names.popleft()
+        return self.__pending.popleft()
+
+    def abandon(self, command: PendingCommand) -> bool:
+        """
+        Forgets a pending command whose caller has given up on it, e.g. on a timeout.
+
+        A newer command on the same target is then matched to the next response on
+        that target, rather than waiting behind a command whose reply may never come.
+
+        Returns whether the command was still pending.
+        """
+        for index, pending in enumerate(self.__pending):
+            if pending is command:
+                del self.__pending[index]
+                del self.__pending_names[index]
+                return True
+        return False
+
+    def subscribe_interrupts(self, callback: InterruptCallback) -> Callable[[], None]:
+        """
+        Subscribes the callback to every interrupt message subsequently received.
+
+        Callbacks are called from receive_data(), so must not block. Any exception
+        they raise is logged rather than interrupting the framing of responses.
+
+        Returns a function that unsubscribes the callback when called.
+        """
+        return self.__interrupt_subscribers.subscribe(callback)
+
+    def send_command(
+        self, target: str, request: ByteString, context: Any = None
+    ) -> PendingCommand:
+        """
+        Registers an already-encoded command as sent to the switch.
+
+        Returns the pending command that its response will be matched against.
+        """
+        command = PendingCommand(target, bytes(request), context)
+        if self.flight_recorder is not None:
+            self.flight_recorder.record_sent(command.request)
+        name = target.value if isinstance(target, Enum) else target
+        self.__pending_names.append(name.split(" ", 1)[0].encode("ascii"))
+        self.__pending.append(command)
+        return command
+
+    def send_get(self, target: str, context: Any = None) -> PendingCommand:
+        """
+        Encodes and registers a command to get a value for the given target.
+
+        Returns the pending command, whose request field holds the bytes to send.
+        """
+        return self.send_command(target, Codec.encode_command_get(target), context)
+
+    def send_set(
+        self, target: str, values: List[Any], context: Any = None
+    ) -> PendingCommand:
+        """
+        Encodes and registers a command to set a target to the given value(s).
+
+        Returns the pending command, whose request field holds the bytes to send.
+        """
+        return self.send_command(
+            target, Codec.encode_command_set(target, values), context
+        )
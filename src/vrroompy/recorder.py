@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+"""
+Contains a flight recorder that keeps the most recent wire traffic of a connection in fixed memory.
+"""
+
+from array import array
+import time
+from typing import ByteString, Callable, List
+
+from .capture import CaptureDirection, CaptureRecord, write_capture
+
+_SENT = CaptureDirection.SENT.value[0]
+_RECEIVED = CaptureDirection.RECEIVED.value[0]
+
+
+class FlightRecorder:
+    """
+    Keeps the most recent commands sent and bytes received on a connection.
+
+    Bytes are copied into a ring buffer within an arena preallocated at creation,
+    alongside fixed arrays of each record's direction, timestamp and position, so
+    recording never grows memory however long the connection lives. The oldest
+    records are overwritten once either the record capacity or the arena is full;
+    a single record larger than the arena keeps only its last bytes.
+
+    Recordings are read out only when something goes wrong: attached to an exception,
+    formatted as text, or dumped to a capture file that ReplaySocket can replay.
+    Timestamps are seconds since the recorder was created.
+    """
+
+    def __init__(
+        self,
+        record_capacity: int = 256,
+        arena_size: int = 65536,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if record_capacity < 1 or arena_size < 1:
+            raise ValueError(
+                "Flight recorder capacity and arena size must be positive!"
+            )
+        self.__clock = clock
+        self.__start_time = clock()
+        self.__arena = bytearray(arena_size)
+        self.__directions = bytearray(record_capacity)
+        self.__timestamps = array("d", bytes(8 * record_capacity))
+        self.__offsets = array("Q", bytes(8 * record_capacity))
+        self.__lengths = array("Q", bytes(8 * record_capacity))
+        self.record_count = 0
+        self.byte_count = 0
+
+    def record_sent(self, data: ByteString) -> None:
+        """
+        Records bytes sent to the switch.
+        """
+        self.__record(_SENT, data)
+
+    def record_received(self, data: ByteString) -> None:
+        """
+        Records bytes received from the switch.
+        """
+        self.__record(_RECEIVED, data)
+
+    def __record(self, direction: int, data: ByteString) -> None:
+        arena = self.__arena
+        arena_size = len(arena)
+        length = len(data)
+        if length > arena_size:
+            data = memoryview(data)[length - arena_size :]
+            self.byte_count += length - arena_size
+            length = arena_size
+
+        offset = self.byte_count % arena_size
+        wrapped_length = offset + length - arena_size
+        if wrapped_length <= 0:
+            arena[offset : offset + length] = data
+        else:
+            view = memoryview(data)
+            arena[offset:] = view[: length - wrapped_length]
+            arena[:wrapped_length] = view[length - wrapped_length :]
+
+        index = self.record_count % len(self.__directions)
+        self.__directions[index] = direction
+        self.__timestamps[index] = self.__clock()
+        self.__offsets[index] = self.byte_count
+        self.__lengths[index] = length
+        self.record_count += 1
+        self.byte_count += length
+
+    def clear(self) -> None:
+        """
+        Discards every record.
+        """
+        self.record_count = 0
+        self.byte_count = 0
+
+    def records(self) -> List[CaptureRecord]:
+        """
+        Returns the records still held, oldest first.
+        """
+        arena = self.__arena
+        arena_size = len(arena)
+        capacity = len(self.__directions)
+        records = []
+        for number in range(max(self.record_count - capacity, 0), self.record_count):
+            index = number % capacity
+            position = self.__offsets[index]
+            if position < self.byte_count - arena_size:
+                continue  # Its bytes have since been overwritten
+            length = self.__lengths[index]
+            offset = position % arena_size
+            data = bytes(arena[offset : offset + length])
+            if len(data) < length:
+                data += bytes(arena[: length - len(data)])
+            records.append(
+                CaptureRecord(
+                    CaptureDirection(bytes([self.__directions[index]])),
+                    self.__timestamps[index] - self.__start_time,
+                    data,
+                )
+            )
+        return records
+
+    def format(self) -> str:
+        """
+        Returns the records still held as text, one per line, oldest first.
+        """
+        records = self.records()
+        lines = [f"Flight recording of the last {len(records)} of {self.record_count}:"]
+        for record in records:
+            lines.append(
+                f"{record.timestamp:12.6f} {record.direction.value.decode()} {record.data!r}"
+            )
+        return "\n".join(lines)
+
+    def annotate(self, error: Exception) -> None:
+        """
+        Attaches the records still held to the exception as its flight_recording.
+
+        On Python 3.11 and later, the formatted records are also added as a note, so
+        that they appear in the exception's traceback.
+        """
+        error.flight_recording = self.records()  # type: ignore[attr-defined]
+        if hasattr(error, "add_note"):
+            error.add_note(self.format())
+
+    def dump(self, capture_path: str) -> None:
+        """
+        Writes the records still held to a new capture file.
+        """
+        write_capture(capture_path, self.records())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+
+"""
+Contains a scheduler that orders commands on one connection by priority class.
+"""
+
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from enum import IntEnum
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Sequence
+
+from .client import VrroomClient
+from .commands import BatchCommand
+from .commands.spec import CommandSpec
+
+
+class Priority(IntEnum):
+    """
+    Defines the priority classes of commands, from most to least urgent.
+    """
+
+    INTERACTIVE = 0
+    AUTOMATION = 1
+    POLL = 2
+    BULK = 3
+
+
+class SchedulerMetrics(NamedTuple):
+    """
+    Describes the commands of one priority class, and how long they waited to be sent.
+    """
+
+    queue_depth: int
+    sent_count: int
+    mean_wait: float
+    max_wait: float
+
+
+class _QueuedCommand(NamedTuple):
+    """
+    Holds a command waiting to be sent, and the future its caller awaits.
+    """
+
+    command: BatchCommand
+    future: "Future[List[Any]]"
+    queued_time: float
+
+
+class _PriorityQueue:
+    """
+    Holds the commands waiting in one priority class, and their wait times.
+    """
+
+    def __init__(self) -> None:
+        self.commands: Deque[_QueuedCommand] = deque()
+        self.bypass_count = 0
+        self.sent_count = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+def _copy_outcome(source: "Future[List[Any]]", target: "Future[List[Any]]") -> None:
+    if source.cancelled():
+        target.set_exception(CancelledError())
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class CommandScheduler:
+    """
+    Sends commands through a VrroomClient in order of priority class.
+
+    Commands wait in a queue per class, and at most max_in_flight commands are sent
+    but unanswered at once. Whenever room frees up, the waiting commands of the most
+    urgent class are sent together in a single write, so commands stay pipelined
+    within a class. Reordering only happens between commands that have not yet been
+    sent, so an interactive command waits behind at most max_in_flight others, however
+    many background commands are queued.
+
+    Less urgent classes are not starved: once the head of a queue has been passed
+    over max_bypass times, it is sent before any more urgent command.
+    """
+
+    def __init__(
+        self,
+        client: VrroomClient,
+        max_in_flight: int = 4,
+        max_bypass: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("At least one command must be allowed in flight!")
+        self.__client = client
+        self.__max_in_flight = max_in_flight
+        self.__max_bypass = max_bypass
+        self.__clock = clock
+        # Reentrant, as callbacks run immediately when added to a finished future
+        self.__lock = threading.RLock()
+        self.__queues: Dict[Priority, _PriorityQueue] = {
+            priority: _PriorityQueue() for priority in Priority
+        }
+        self.__in_flight = 0
+        # The client future of each command in flight, by the future its caller awaits
+        self.__client_futures: "Dict[Future[List[Any]], Future[List[Any]]]" = {}
+        self.__dispatching = False
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Returns the number of commands sent but not yet answered.
+        """
+        with self.__lock:
+            return self.__in_flight
+
+    def queue_depth(self, priority: Priority) -> int:
+        """
+        Returns the number of commands of the priority class waiting to be sent.
+        """
+        with self.__lock:
+            return len(self.__queues[priority].commands)
+
+    def metrics(self, priority: Priority) -> SchedulerMetrics:
+        """
+        Returns the queue depth and wait times of the priority class.
+        """
+        with self.__lock:
+            queue = self.__queues[priority]
+            mean_wait = queue.total_wait / queue.sent_count if queue.sent_count else 0.0
+            return SchedulerMetrics(
+                len(queue.commands), queue.sent_count, mean_wait, queue.max_wait
+            )
+
+    def submit_many(
+        self,
+        commands: Sequence[BatchCommand],
+        priority: Priority = Priority.AUTOMATION,
+    ) -> "List[Future[List[Any]]]":
+        """
+        Queues many get/set commands in the priority class, without awaiting responses.
+
+        Returns a future for each command, resolving to its decoded values.
+        """
+        futures: "List[Future[List[Any]]]" = []
+        with self.__lock:
+            queue = self.__queues[priority]
+            queued_time = self.__clock()
+            for command in commands:
+                future: "Future[List[Any]]" = Future()
+                queue.commands.append(_QueuedCommand(command, future, queued_time))
+                futures.append(future)
+            self.__dispatch()
+        return futures
+
+    def submit(
+        self,
+        spec: CommandSpec,
+        desired_values: Optional[List[Any]] = None,
+        priority: Priority = Priority.AUTOMATION,
+    ) -> "Future[List[Any]]":
+        """
+        Queues a get command, or a set command if desired values are given.
+
+        Returns a future resolving to the decoded values of the command.
+        """
+        return self.submit_many([BatchCommand(spec, desired_values)], priority)[0]
+
+    def get(
+        self,
+        spec: CommandSpec,
+        priority: Priority = Priority.AUTOMATION,
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Gets the value(s) of the spec's target from the switch.
+        """
+        return self.__result(self.submit(spec, None, priority), timeout)
+
+    def set(
+        self,
+        spec: CommandSpec,
+        desired_values: List[Any],
+        priority: Priority = Priority.AUTOMATION,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Sets the spec's target on the switch to the desired value(s).
+
+        Raises ValueNotChangedError if the returned values are different than the desired values.
+        """
+        self.__result(self.submit(spec, list(desired_values), priority), timeout)
+
+    def __result(
+        self, future: "Future[List[Any]]", timeout: Optional[float]
+    ) -> List[Any]:
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            if not future.cancel():
+                # Already sent, so give up on it through the client to free its slot
+                with self.__lock:
+                    client_future = self.__client_futures.get(future)
+                if client_future is not None:
+                    client_future.cancel()
+            raise
+
+    def __next_priority(self) -> Optional[Priority]:
+        # Must be called with the lock held
+        waiting = [
+            priority for priority, queue in self.__queues.items() if queue.commands
+        ]
+        if not waiting:
+            return None
+        for priority in waiting:
+            if self.__queues[priority].bypass_count >= self.__max_bypass:
+                return priority
+        return waiting[0]
+
+    def __dispatch(self) -> None:
+        # Must be called with the lock held. Completions during sending return early,
+        # as the outer call keeps sending until the window is full.
+        if self.__dispatching:
+            return
+        self.__dispatching = True
+        try:
+            priority = self.__next_priority()
+            while priority is not None and self.__in_flight < self.__max_in_flight:
+                self.__send_from(priority)
+                priority = self.__next_priority()
+        finally:
+            self.__dispatching = False
+
+    def __send_from(self, priority: Priority) -> None:
+        # Must be called with the lock held
+        queue = self.__queues[priority]
+        now = self.__clock()
+        batch: List[_QueuedCommand] = []
+        while queue.commands and self.__in_flight + len(batch) < self.__max_in_flight:
+            queued = queue.commands.popleft()
+            if not queued.future.set_running_or_notify_cancel():
+                continue  # The caller gave up on this command before it was sent
+            batch.append(queued)
+            wait = now - queued.queued_time
+            queue.sent_count += 1
+            queue.total_wait += wait
+            queue.max_wait = max(queue.max_wait, wait)
+
+        queue.bypass_count = 0
+        for other_priority, other_queue in self.__queues.items():
+            if other_priority > priority and other_queue.commands:
+                other_queue.bypass_count += len(batch)
+        if not batch:
+            return
+
+        self.__in_flight += len(batch)
+        try:
+            client_futures = self.__client.submit_many(
+                [queued.command for queued in batch]
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            self.__in_flight -= len(batch)
+            for queued in batch:
+                queued.future.set_exception(error)
+            return
+        for queued, client_future in zip(batch, client_futures):
+            self.__client_futures[queued.future] = client_future
+            client_future.add_done_callback(
+                lambda done, future=queued.future: self.__on_answered(done, future)
+            )
+
+    def __on_answered(
+        self, client_future: "Future[List[Any]]", future: "Future[List[Any]]"
+    ) -> None:
+        # The slot is freed however the command ended, including by being cancelled
+        try:
+            _copy_outcome(client_future, future)
+        finally:
+            with self.__lock:
+                self.__client_futures.pop(future, None)
+                self.__in_flight -= 1
+                self.__dispatch()
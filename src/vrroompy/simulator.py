@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+
+"""
+Contains a local TCP server that simulates a VRROOM switch, with configurable faults.
+"""
+
+import asyncio
+from collections import deque
+import random
+import re
+import socket
+import threading
+from typing import Any, Deque, Dict, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .commands.cache import STREAM_DEPENDENT_TARGETS
+from .commands.enums import Target
+
+# The state of a freshly reset switch, as the values of each target on the wire
+DEFAULT_STATE: Mapping[str, str] = {
+    str(Target.OPERATION_MODE): "0",
+    str(Target.SELECTED_INPUTS): "0 4",
+    str(Target.IP_ADDRESS): "192.168.1.222",
+    str(Target.IP_NETWORK_MASK): "255.255.255.0",
+    str(Target.IP_GATEWAY): "192.168.1.1",
+    str(Target.DHCP_ENABLED): "off",
+    str(Target.IP_INTERRUPTS_ENABLED): "off",
+    str(Target.TCP_PORT): "2222",
+    str(Target.MAC_ADDRESS): "19:AC:B5:D3:22:F4",
+    str(Target.AUTO_SWITCHING): "on",
+    str(Target.EDID_FRL_AUTOMIX): "on",
+    str(Target.EDID_VRR_AUTOMIX): "on",
+    str(Target.EDID_ALLM_AUTOMIX): "on",
+    str(Target.EDID_HDR_AUTOMIX): "on",
+    str(Target.EDID_DVF_AUTOMIX): "on",
+    str(Target.HDR_CUSTOM): "off",
+    str(Target.HDR_DISABLE): "off",
+    str(Target.AVI_INFOFRAME_CUSTOM): "off",
+    str(Target.AVI_INFOFRAME_DISABLE): "off",
+    str(Target.HDMI_MUTED_TX0): "off",
+    str(Target.HDMI_MUTED_TX1): "off",
+    str(Target.ANALOG_VOLUME): "0",
+    str(Target.ANALOG_BASS): "0",
+    str(Target.ANALOG_TREBLE): "0",
+    str(Target.OLED_FADE_TIME): "30",
+}
+
+# The ports whose EDID tables can be read, each a 256-byte table sent as hex
+EDID_TABLE_PORTS = ("rx0", "rx1", "rx2", "rx3", "tx0", "tx1")
+DEFAULT_EDID_TABLE = bytes.fromhex("00ffffffffffff00") + bytes(range(248))
+
+# Either byte closes the connection, as a typical 'close connection' character
+_CLOSE_BYTES = re.compile(b"[\x1b\x03]")
+_TERMINATORS = re.compile(b"[\r\n]")
+_RS232_HEADER = "#vrroom "
+_SELECTED_INPUT_INDICES = {
+    str(Target.SELECTED_INPUT_TX0): 0,
+    str(Target.SELECTED_INPUT_TX1): 1,
+}
+_STREAM_DEPENDENT_NAMES = frozenset(str(target) for target in STREAM_DEPENDENT_TARGETS)
+_TARGET_NAMES = frozenset(str(target) for target in Target)
+
+
+class SimulatorFaults(NamedTuple):
+    """
+    Describes the network conditions and faults that the simulator injects.
+
+    Every reply is delayed by the latency, plus or minus up to the jitter, in seconds,
+    though replies on a connection are never reordered. Replies falling due within
+    the merge window of each other are sent in a single TCP segment, and replies are
+    split across segments, or dropped entirely, with the given probabilities.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    merge_window: float = 0.0
+    split_probability: float = 0.0
+    drop_probability: float = 0.0
+
+
+class _SimulatorConnection:
+    """
+    Holds the replies waiting to be written to one client connection.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        # Pairs of the loop time a reply is due and its bytes, or None to close
+        self.replies: Deque[Tuple[float, Optional[bytes]]] = deque()
+        self.replies_queued = asyncio.Event()
+        self.last_due = 0.0
+
+    def queue(self, due: float, reply: Optional[bytes]) -> None:
+        self.last_due = max(due, self.last_due)
+        self.replies.append((self.last_due, reply))
+        self.replies_queued.set()
+
+
+class VrroomSimulator:
+    """
+    Serves a simulated VRROOM switch over TCP, from an asyncio event loop.
+
+    The simulator implements the documented IP protocol: get commands reply with the
+    target's values, set commands store and echo them, and every reply ends in \\r\\n.
+    Commands may end in \\r or \\n, and may carry the RS232 #vrroom header. While IP
+    interrupts are enabled, every change to a stream-dependent target sends an 'int'
+    message to every connection. Rebooting drops every connection, and refuses new
+    ones for the reboot time. Commands for targets that are not simulated are not
+    answered, as the protocol does not document an error reply.
+    """
+
+    def __init__(
+        self,
+        faults: SimulatorFaults = SimulatorFaults(),
+        state: Optional[Mapping[str, str]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        reboot_time: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.faults = faults
+        self.reboot_time = reboot_time
+        self.__state: Dict[str, str] = dict(DEFAULT_STATE if state is None else state)
+        self.__host = host
+        self.__port = port
+        self.__random = random.Random(seed)
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__connections: Set[_SimulatorConnection] = set()
+        self.__serving: Set[Any] = set()
+        self.__rebooting_until = 0.0
+        self.request_count = 0
+        self.dropped_count = 0
+        self.connection_count = 0
+
+    async def __aenter__(self) -> "VrroomSimulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """
+        Returns the address that the simulator is listening on.
+
+        Raises RuntimeError if the simulator has not been started.
+        """
+        if self.__server is None:
+            raise RuntimeError("Simulator has not been started!")
+        return self.__server.sockets[0].getsockname()[:2]
+
+    @property
+    def state(self) -> Dict[str, str]:
+        """
+        Returns a copy of the values of every simulated target, as sent on the wire.
+        """
+        return dict(self.__state)
+
+    async def start(self) -> None:
+        """
+        Starts listening for connections.
+        """
+        self.__server = await asyncio.start_server(
+            self.__serve, self.__host, self.__port
+        )
+
+    async def close(self) -> None:
+        """
+        Stops listening, and closes every connection, waiting for each to close.
+        """
+        self.__drop_connections()
+        if self.__server is not None:
+            self.__server.close()
+        serving = list(self.__serving)
+        for task in serving:
+            task.cancel()
+        await asyncio.gather(*serving, return_exceptions=True)
+        if self.__server is not None:
+            await self.__server.wait_closed()
+
+    def change(self, target: str, values: str) -> None:
+        """
+        Changes the values of a target as if from outside, such as a source changing.
+
+        Must be called from the simulator's event loop.
+        """
+        self.__store(target, values)
+
+    def __store(self, target: str, values: str) -> None:
+        input_index = _SELECTED_INPUT_INDICES.get(target)
+        if input_index is not None:
+            selected_inputs = self.__state[str(Target.SELECTED_INPUTS)].split()
+            selected_inputs[input_index] = values
+            self.__store(str(Target.SELECTED_INPUTS), " ".join(selected_inputs))
+            return
+
+        changed = self.__state.get(target) != values
+        self.__state[target] = values
+        interrupts_enabled = self.__state.get(str(Target.IP_INTERRUPTS_ENABLED))
+        if changed and target in _STREAM_DEPENDENT_NAMES and interrupts_enabled == "on":
+            for connection in self.__connections:
+                self.__reply(connection, f"int {target} {values}", droppable=False)
+
+    def __drop_connections(self) -> None:
+        for connection in self.__connections:
+            connection.queue(0.0, None)
+
+    def __delay(self) -> float:
+        faults = self.faults
+        jitter = self.__random.uniform(-faults.jitter, faults.jitter)
+        return max(faults.latency + jitter, 0.0)
+
+    def __reply(
+        self, connection: _SimulatorConnection, reply: str, droppable: bool = True
+    ) -> None:
+        if droppable and self.__random.random() < self.faults.drop_probability:
+            self.dropped_count += 1
+            return
+        due = asyncio.get_running_loop().time() + self.__delay()
+        connection.queue(due, reply.encode("ascii") + b"\r\n")
+
+    @staticmethod
+    def __split_target(words: List[str]) -> Tuple[str, List[str]]:
+        # Some target names span two words, such as 'edid audio'
+        if len(words) > 1 and f"{words[0]} {words[1]}" in _TARGET_NAMES:
+            return f"{words[0]} {words[1]}", words[2:]
+        return words[0], words[1:]
+
+    def __get(
+        self, connection: _SimulatorConnection, target: str, args: List[str]
+    ) -> None:
+        if target == str(Target.EDID_TABLE):
+            if args and args[0] in EDID_TABLE_PORTS:
+                edid_table = DEFAULT_EDID_TABLE.hex()
+                self.__reply(connection, f"{target} {args[0]} {edid_table}")
+            return
+
+        input_index = _SELECTED_INPUT_INDICES.get(target)
+        if input_index is not None:
+            selected_inputs = self.__state[str(Target.SELECTED_INPUTS)].split()
+            self.__reply(connection, f"{target} {selected_inputs[input_index]}")
+        elif target in self.__state:
+            self.__reply(connection, f"{target} {self.__state[target]}")
+
+    def __set(
+        self, connection: _SimulatorConnection, target: str, args: List[str]
+    ) -> None:
+        values = " ".join(args)
+        if target == str(Target.ACTION_REBOOT):
+            self.__reply(connection, target, droppable=False)
+            self.__rebooting_until = (
+                asyncio.get_running_loop().time() + self.reboot_time
+            )
+            self.__drop_connections()
+        elif target in (str(Target.ACTION_HOTPLUG), str(Target.ACTION_FACTORY_RESET)):
+            if target == str(Target.ACTION_FACTORY_RESET):
+                self.__state.update(DEFAULT_STATE)
+            self.__reply(connection, f"{target} {values}".rstrip())
+        elif target in self.__state or target in _SELECTED_INPUT_INDICES:
+            self.__reply(connection, f"{target} {values}")
+            self.__store(target, values)
+
+    def __handle(self, connection: _SimulatorConnection, request: bytes) -> None:
+        self.request_count += 1
+        text = request.decode("ascii", errors="replace").strip()
+        if text.startswith(_RS232_HEADER):
+            text = text[len(_RS232_HEADER) :]
+        words = text.split()
+        if len(words) < 2:
+            return
+        target, args = self.__split_target(words[1:])
+        if words[0] == "get":
+            self.__get(connection, target, args)
+        elif words[0] == "set":
+            self.__set(connection, target, args)
+
+    async def __write_replies(self, connection: _SimulatorConnection) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not connection.replies:
+                connection.replies_queued.clear()
+                await connection.replies_queued.wait()
+            due, reply = connection.replies[0]
+            await asyncio.sleep(max(due - loop.time(), 0.0))
+            if self.faults.merge_window > 0:
+                await asyncio.sleep(self.faults.merge_window)
+
+            # Every reply now due is sent with a single write
+            segment = b""
+            now = max(loop.time(), due)
+            while connection.replies and connection.replies[0][0] <= now:
+                due, reply = connection.replies.popleft()
+                if reply is None:
+                    break
+                segment += reply
+            if segment:
+                await self.__write_segment(connection.writer, segment)
+            if reply is None:
+                # Closing the transport also ends the reading of requests
+                connection.writer.close()
+                return
+
+    async def __write_segment(
+        self, writer: asyncio.StreamWriter, segment: bytes
+    ) -> None:
+        chunks = [segment]
+        if len(segment) > 1 and self.__random.random() < self.faults.split_probability:
+            split_index = self.__random.randint(1, len(segment) - 1)
+            chunks = [segment[:split_index], segment[split_index:]]
+        for index, chunk in enumerate(chunks):
+            if index:
+                # Give the first chunk time to leave in a segment of its own
+                await asyncio.sleep(0.001)
+            writer.write(chunk)
+            await writer.drain()
+
+    async def __serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if asyncio.get_running_loop().time() < self.__rebooting_until:
+            writer.close()
+            await self.__wait_closed(writer)
+            return
+        # Connections are tracked by their serving task, so close() can end them
+        task = asyncio.current_task()
+        self.__serving.add(task)
+        try:
+            await self.__serve_connection(reader, writer)
+        finally:
+            self.__serving.discard(task)
+
+    @staticmethod
+    async def __wait_closed(writer: asyncio.StreamWriter) -> None:
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass  # The client went away first
+
+    async def __serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        client_socket = writer.get_extra_info("socket")
+        if client_socket is not None:
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.connection_count += 1
+        connection = _SimulatorConnection(writer)
+        self.__connections.add(connection)
+        writing = asyncio.ensure_future(self.__write_replies(connection))
+        try:
+            buffered = b""
+            while not writing.done():
+                received = await reader.read(4096)
+                close = _CLOSE_BYTES.search(received)
+                if close is not None:
+                    received = received[: close.start()]
+                buffered += received
+                *requests, buffered = _TERMINATORS.split(buffered)
+                for request in requests:
+                    if request.strip():
+                        self.__handle(connection, request)
+                if not received or close is not None:
+                    break
+        except (ConnectionError, OSError):
+            pass  # The client went away
+        finally:
+            self.__connections.discard(connection)
+            connection.queue(0.0, None)
+            try:
+                await writing
+            except (ConnectionError, OSError):
+                pass  # The client went away before reading every reply
+            finally:
+                writer.close()
+            await self.__wait_closed(writer)
+
+
+class SimulatorThread:
+    """
+    Runs a VrroomSimulator on an event loop of its own, in a background thread.
+
+    This allows blocking clients, such as VrroomClient and the free command
+    functions, to be tested from the main thread against a simulated switch.
+    """
+
+    def __init__(self, simulator: Optional[VrroomSimulator] = None) -> None:
+        self.simulator = simulator or VrroomSimulator()
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(
+            target=self.__loop.run_forever, name="VrroomSimulator", daemon=True
+        )
+
+    def __enter__(self) -> "SimulatorThread":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """
+        Returns the address that the simulator is listening on.
+        """
+        return self.simulator.address
+
+    def start(self) -> None:
+        """
+        Starts the thread, and waits for the simulator to start listening.
+        """
+        self.__thread.start()
+        asyncio.run_coroutine_threadsafe(self.simulator.start(), self.__loop).result()
+
+    def close(self) -> None:
+        """
+        Closes the simulator, then stops the thread.
+        """
+        asyncio.run_coroutine_threadsafe(self.simulator.close(), self.__loop).result()
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+
+    def change(self, target: str, values: str) -> None:
+        """
+        Changes the values of a target as if from outside, from any thread.
+        """
+        self.__loop.call_soon_threadsafe(self.simulator.change, target, values)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+"""
+Contains functions that wait until the state of a VRROOM switch satisfies a predicate.
+"""
+
+import asyncio
+import socket
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence
+
+from .async_client import AsyncVrroomClient
+from .commands import (
+    BatchCommand,
+    can_receive_interrupts,
+    execute_many,
+    get_protocol,
+    receive_interrupts,
+)
+from .commands.enums import OnOffSwitch, Target
+from .commands.network import SPEC_IP_INTERRUPTS_ENABLED
+from .commands.spec import CommandSpec
+
+StateValues = Dict[Target, List[Any]]
+StatePredicate = Callable[[StateValues], bool]
+
+DEFAULT_INITIAL_INTERVAL = 0.05
+DEFAULT_MAX_INTERVAL = 1.0
+
+
+class WaitResult(NamedTuple):
+    """
+    Describes the state that satisfied a wait, and what it took to get there.
+    """
+
+    values: StateValues
+    elapsed: float
+    read_count: int
+
+
+class _Backoff:
+    """
+    Tracks the interval between reads, doubling it while the state stays the same.
+
+    Any change in the state resets the interval, as more changes are likely to follow.
+    """
+
+    def __init__(self, initial_interval: float, max_interval: float) -> None:
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.interval = initial_interval
+        self.__last_values: Any = None
+
+    def next_interval(self, values: StateValues) -> float:
+        if values != self.__last_values:
+            self.interval = self.initial_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        self.__last_values = values
+        return self.interval
+
+
+def __to_values(specs: Sequence[CommandSpec], results: List[List[Any]]) -> StateValues:
+    return {spec.target: values for spec, values in zip(specs, results)}
+
+
+def __interrupts_enabled(results: List[List[Any]]) -> bool:
+    return results[-1][0] == OnOffSwitch.ON
+
+
+def wait_until(
+    socket: socket.socket,
+    predicate: StatePredicate,
+    specs: Sequence[CommandSpec],
+    timeout: float,
+    initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+) -> WaitResult:
+    """
+    Waits until the values of the specs' targets satisfy the predicate.
+
+    The predicate is called with a dictionary of each target to its values, read in a
+    single batch. If IP interrupts are enabled on the switch, and the socket can be
+    listened to for them, the targets are read again as soon as an interrupt arrives.
+    Otherwise, they are polled with a backoff
+    that starts at the initial interval and doubles up to the maximum interval while
+    nothing changes. Interrupts are also polled for at the maximum interval, in case
+    a change does not raise one.
+
+    Returns the satisfying values, with how long and how many reads it took.
+
+    Raises TimeoutError if the predicate is not satisfied before the timeout.
+    """
+    start_time = time.monotonic()
+    deadline = start_time + timeout
+    commands = [BatchCommand(spec) for spec in specs]
+    backoff = _Backoff(initial_interval, max_interval)
+
+    protocol = get_protocol(socket)
+
+    # Whether to wait on interrupts is checked in the same batch as the first read
+    interrupt_count = protocol.interrupt_count
+    results = execute_many(
+        socket, commands + [BatchCommand(SPEC_IP_INTERRUPTS_ENABLED)]
+    )
+    # Stand-ins without a file descriptor, e.g. a ReplaySocket, can only be polled
+    use_interrupts = __interrupts_enabled(results) and can_receive_interrupts(socket)
+    read_count = 1
+    values = __to_values(specs, results)
+    while not predicate(values):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"State was not reached within {timeout} seconds!")
+
+        if not use_interrupts:
+            time.sleep(min(backoff.next_interval(values), remaining))
+        elif protocol.interrupt_count == interrupt_count:
+            # Interrupts received during the last read already call for another
+            receive_interrupts(socket, min(max_interval, remaining))
+
+        interrupt_count = protocol.interrupt_count
+        values = __to_values(specs, execute_many(socket, commands))
+        read_count += 1
+    return WaitResult(values, time.monotonic() - start_time, read_count)
+
+
+async def wait_until_async(
+    client: AsyncVrroomClient,
+    predicate: StatePredicate,
+    specs: Sequence[CommandSpec],
+    timeout: float,
+    initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+) -> WaitResult:
+    """
+    Waits until the values of the specs' targets satisfy the predicate.
+
+    This behaves exactly as wait_until(), but reads through an asyncio client.
+
+    Returns the satisfying values, with how long and how many reads it took.
+
+    Raises TimeoutError if the predicate is not satisfied before the timeout.
+    """
+    start_time = time.monotonic()
+    deadline = start_time + timeout
+    commands = [BatchCommand(spec) for spec in specs]
+    backoff = _Backoff(initial_interval, max_interval)
+
+    interrupt_received = asyncio.Event()
+    unsubscribe = client.subscribe_interrupts(lambda event: interrupt_received.set())
+    try:
+        results = await client.execute_many(
+            commands + [BatchCommand(SPEC_IP_INTERRUPTS_ENABLED)]
+        )
+        use_interrupts = __interrupts_enabled(results)
+        read_count = 1
+        values = __to_values(specs, results)
+        while not predicate(values):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"State was not reached within {timeout} seconds!")
+
+            if use_interrupts:
+                interval = min(max_interval, remaining)
+            else:
+                interval = min(backoff.next_interval(values), remaining)
+            try:
+                await asyncio.wait_for(interrupt_received.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            interrupt_received.clear()
+
+            values = __to_values(specs, await client.execute_many(commands))
+            read_count += 1
+        return WaitResult(values, time.monotonic() - start_time, read_count)
+    finally:
+        unsubscribe()
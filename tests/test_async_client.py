@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.async_client.
+"""
+
+import asyncio
+import unittest
+from vrroompy.async_client import AsyncVrroomClient
+from vrroompy.commands.actions import ResetDataType
+from vrroompy.commands.audio import AnalogTone
+from vrroompy.commands.input import Input
+from vrroompy.commands.modes import OperationMode
+from vrroompy.commands.network import IpAddressV4
+from vrroompy.exceptions import ConnectionClosedError, ValueNotChangedError
+
+
+class FakeStreamWriter:
+    """
+    Records written bytes and answers them through a paired stream reader.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, responses: dict) -> None:
+        self.reader = reader
+        self.responses = responses
+        self.written = b""
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        self.written += data
+        for request in data.splitlines(keepends=True):
+            response = self.responses.get(request)
+            if response is not None:
+                self.reader.feed_data(response)
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def run_with_client(responses: dict, test):
+    async def run():
+        reader = asyncio.StreamReader()
+        writer = FakeStreamWriter(reader, responses)
+        async with AsyncVrroomClient(reader, writer) as client:
+            result = await test(client, reader, writer)
+        return result, writer
+
+    return asyncio.run(run())
+
+
+class TestAsyncVrroomClient(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.async_client.AsyncVrroomClient.
+    """
+
+    def test_get(self):
+        async def test(client, reader, writer):
+            return await client.get_operation_mode()
+
+        result, writer = run_with_client({b"get opmode\n": b"opmode 3\r\n"}, test)
+        self.assertEqual(result, OperationMode.MATRIX_TMDS_DOWNSCALE)
+        self.assertEqual(writer.written, b"get opmode\n")
+        self.assertTrue(writer.closed)
+
+    def test_set(self):
+        async def test(client, reader, writer):
+            await client.set_selected_inputs(Input.RX0, Input.FOLLOW)
+            await client.set_ip_address(IpAddressV4("192.168.1.2"))
+            await client.factory_reset(ResetDataType.RESET_ALL)
+
+        _, writer = run_with_client(
+            {
+                b"set insel 0 4\n": b"insel 0 4\r\n",
+                b"set ipaddr 192.168.1.2\n": b"ipaddr 192.168.1.2\r\n",
+                b"set factoryreset 3\n": b"factoryreset 3\r\n",
+            },
+            test,
+        )
+        self.assertEqual(
+            writer.written,
+            b"set insel 0 4\nset ipaddr 192.168.1.2\nset factoryreset 3\n",
+        )
+
+    def test_set_raises(self):
+        async def test(client, reader, writer):
+            await client.set_selected_inputs(Input.RX0, Input.FOLLOW)
+
+        with self.assertRaises(ValueNotChangedError):
+            run_with_client({b"set insel 0 4\n": b"insel 0 2\r\n"}, test)
+
+    def test_concurrent(self):
+        async def test(client, reader, writer):
+            return await asyncio.gather(
+                client.get_selected_input_tx0(),
+                client.get_selected_input_tx1(),
+                client.get_autoswitch_enabled(),
+            )
+
+        result, _ = run_with_client(
+            {
+                b"get inseltx0\n": b"inseltx0 1\r\n",
+                b"get inseltx1\n": b"inseltx1 2\r\n",
+                b"get autosw\n": b"autosw on\r\n",
+            },
+            test,
+        )
+        self.assertEqual(result, [Input.RX1, Input.RX2, True])
+
+    def test_cancel(self):
+        async def test(client, reader, writer):
+            # The first command is cancelled before its response arrives
+            cancelled = asyncio.ensure_future(client.get_operation_mode())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            reader.feed_data(b"opmode 1\r\n")
+            return await client.get_selected_inputs()
+
+        result, _ = run_with_client({b"get insel\n": b"insel 3 4\r\n"}, test)
+        self.assertEqual(result, [Input.RX3, Input.FOLLOW])
+
+    def test_connection_closed(self):
+        async def test(client, reader, writer):
+            pending = asyncio.ensure_future(client.get_operation_mode())
+            await asyncio.sleep(0)
+            reader.feed_eof()
+            await pending
+
+        with self.assertRaises(ConnectionClosedError):
+            run_with_client({}, test)
+
+    def test_interrupts(self):
+        async def test(client, reader, writer):
+            events = []
+            callback_events = []
+            client.subscribe_interrupts(callback_events.append)
+
+            async def listen():
+                async for event in client.interrupts():
+                    events.append(event)
+                    if len(events) == 2:
+                        break
+
+            listener = asyncio.ensure_future(listen())
+            await asyncio.sleep(0)
+            reader.feed_data(b"int insel 2 2\r\n")
+            self.assertEqual(await client.get_operation_mode(), OperationMode(1))
+            reader.feed_data(b"int rx0\r\n")
+            await asyncio.wait_for(listener, 5)
+            return events, callback_events
+
+        (events, callback_events), _ = run_with_client(
+            {b"get opmode\n": b"opmode 1\r\n"}, test
+        )
+        self.assertEqual([event.name for event in events], ["insel", "rx0"])
+        self.assertEqual(events, callback_events)
+
+    def test_interrupts_end_on_close(self):
+        async def test(client, reader, writer):
+            async def listen():
+                return [event async for event in client.interrupts()]
+
+            listener = asyncio.ensure_future(listen())
+            await asyncio.sleep(0)
+            reader.feed_data(b"int insel 2 2\r\n")
+            reader.feed_eof()
+            return await asyncio.wait_for(listener, 5)
+
+        events, _ = run_with_client({}, test)
+        self.assertEqual(len(events), 1)
+
+    def test_transaction(self):
+        async def test(client, reader, writer):
+            async with client.transaction():
+                await client.set_selected_input_tx1(Input.RX0)
+                await client.set_selected_input_tx0(Input.RX2)
+                # Transactions only buffer sets from their own task
+                self.assertEqual(await client.get_operation_mode(), OperationMode(1))
+
+        _, writer = run_with_client(
+            {b"get opmode\n": b"opmode 1\r\n", b"set insel 2 0\n": b"insel 2 0\r\n"},
+            test,
+        )
+        self.assertEqual(writer.written, b"get opmode\nset insel 2 0\n")
+
+    def test_typed_audio_video(self):
+        async def test(client, reader, writer):
+            await client.set_hdr_custom_enabled(True)
+            await client.set_analog_bass(AnalogTone(-4))
+            return await client.get_edid_vrr_automix_enabled()
+
+        result, writer = run_with_client(
+            {
+                b"set hdrcustom on\n": b"hdrcustom on\r\n",
+                b"set analogbass -4\n": b"analogbass -4\r\n",
+                b"get edidvrrflag\n": b"edidvrrflag off\r\n",
+            },
+            test,
+        )
+        self.assertFalse(result)
+        self.assertEqual(
+            writer.written,
+            b"set hdrcustom on\nset analogbass -4\nget edidvrrflag\n",
+        )
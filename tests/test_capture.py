@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.capture.
+"""
+
+import os
+import socket
+import tempfile
+import time
+import unittest
+from vrroompy.capture import (
+    CAPTURE_MAGIC,
+    CaptureDirection,
+    RecordingSocket,
+    ReplaySocket,
+    read_capture,
+    record_connection,
+)
+from vrroompy.commands import get_command_base
+from vrroompy.commands.input import Input, get_selected_inputs, set_selected_inputs
+from vrroompy.commands.modes import OperationMode, get_operation_mode
+from vrroompy.exceptions import ConnectionClosedError, ReplayMismatchError
+from vrroompy.simulator import SimulatorFaults, SimulatorThread, VrroomSimulator
+
+
+class TestCapture(unittest.TestCase):
+    """
+    Unit tests the classes vrroompy.capture.RecordingSocket and ReplaySocket.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "session.cap")
+
+    def write_capture(self, *records):
+        local, remote = socket.socketpair()
+        with local, remote:
+            with RecordingSocket(local, self.path) as recording:
+                for direction, data in records:
+                    if direction == CaptureDirection.SENT:
+                        recording.sendall(data)
+                        remote.recv(4096)
+                    else:
+                        remote.sendall(data)
+                        self.assertEqual(recording.recv(len(data)), data)
+
+    def test_record_simulator(self):
+        simulator = VrroomSimulator(SimulatorFaults(split_probability=1.0), seed=1)
+        with SimulatorThread(simulator) as thread:
+            with record_connection(*thread.address, self.path, 5) as recording:
+                self.assertEqual(
+                    get_operation_mode(recording), OperationMode.SPLITTER_VRR
+                )
+                set_selected_inputs(recording, Input.RX1, Input.RX2)
+
+        records = read_capture(self.path)
+        sent = b"".join(
+            record.data
+            for record in records
+            if record.direction == CaptureDirection.SENT
+        )
+        self.assertEqual(sent, b"get opmode\nset insel 1 2\n")
+        received = [
+            record
+            for record in records
+            if record.direction == CaptureDirection.RECEIVED
+        ]
+        self.assertGreaterEqual(len(received), 2)
+        received_bytes = b"".join(record.data for record in received)
+        self.assertTrue(received_bytes.startswith(b"opmode "))
+        self.assertTrue(received_bytes.endswith(b"insel 1 2\r\n"))
+        timestamps = [record.timestamp for record in records]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+        with ReplaySocket(self.path) as replay:
+            self.assertEqual(get_operation_mode(replay), OperationMode.SPLITTER_VRR)
+            set_selected_inputs(replay, Input.RX1, Input.RX2)
+            self.assertEqual(replay.remaining_count, 0)
+
+    def test_replay_segments(self):
+        self.write_capture(
+            (CaptureDirection.SENT, b"get insel\n"),
+            (CaptureDirection.RECEIVED, b"insel"),
+            (CaptureDirection.RECEIVED, b" 1 3\r\n"),
+        )
+        with ReplaySocket(self.path) as replay:
+            replay.sendall(b"get insel\n")
+            self.assertEqual(replay.recv(256), b"insel")
+            self.assertEqual(replay.recv(3), b" 1 ")
+            self.assertEqual(replay.recv(256), b"3\r\n")
+            self.assertEqual(replay.recv(256), b"")
+
+            replay.rewind()
+            self.assertEqual(get_selected_inputs(replay), [Input.RX1, Input.RX3])
+            replay.rewind()
+            self.assertEqual(
+                get_command_base(replay, "insel", [r"[0-4]", r"[0-4]"], [int, int]),
+                [1, 3],
+            )
+
+    def test_replay_end(self):
+        self.write_capture((CaptureDirection.SENT, b"get opmode\n"))
+        with ReplaySocket(self.path) as replay:
+            with self.assertRaises(ConnectionClosedError):
+                get_operation_mode(replay)
+
+    def test_replay_mismatch(self):
+        self.write_capture(
+            (CaptureDirection.SENT, b"get opmode\n"),
+            (CaptureDirection.RECEIVED, b"opmode 2\r\n"),
+        )
+        with ReplaySocket(self.path) as replay:
+            with self.assertRaises(ReplayMismatchError):
+                get_selected_inputs(replay)
+        with ReplaySocket(self.path, verify=False) as replay:
+            replay.sendall(b"get insel\n")
+            self.assertEqual(replay.recv(256), b"opmode 2\r\n")
+
+    def test_replay_split_sends(self):
+        self.write_capture(
+            (CaptureDirection.SENT, b"get opmode\n"),
+            (CaptureDirection.SENT, b"get insel\n"),
+        )
+        with ReplaySocket(self.path) as replay:
+            # Sends are compared across the boundaries of the recorded sends
+            replay.sendall(b"get opmode\nget ")
+            with self.assertRaises(ReplayMismatchError) as context:
+                replay.sendall(b"inseltx0\n")
+            self.assertIn("b'insel\\n'", str(context.exception))
+            replay.sendall(bytearray(b"insel\n"))
+            with self.assertRaises(ReplayMismatchError):
+                replay.sendall(b"get opmode\n")
+
+    def test_replay_real_time(self):
+        local, remote = socket.socketpair()
+        with local, remote:
+            with RecordingSocket(local, self.path) as recording:
+                recording.sendall(b"get opmode\n")
+                time.sleep(0.1)
+                remote.sendall(b"opmode 2\r\n")
+                recording.recv(256)
+
+        with ReplaySocket(self.path, real_time=True) as replay:
+            start_time = time.monotonic()
+            self.assertEqual(get_operation_mode(replay), OperationMode.MATRIX_TMDS)
+            self.assertGreaterEqual(time.monotonic() - start_time, 0.09)
+        with ReplaySocket(self.path) as replay:
+            start_time = time.monotonic()
+            self.assertEqual(get_operation_mode(replay), OperationMode.MATRIX_TMDS)
+            self.assertLess(time.monotonic() - start_time, 0.09)
+
+    def test_append_and_truncation(self):
+        self.write_capture((CaptureDirection.SENT, b"get opmode\n"))
+        self.write_capture((CaptureDirection.RECEIVED, b"opmode 2\r\n"))
+        with open(self.path, "rb") as capture_file:
+            self.assertEqual(capture_file.read().count(CAPTURE_MAGIC), 1)
+        # A partial record written by a crash is ignored
+        with open(self.path, "ab") as capture_file:
+            capture_file.write(b"<\x00\x00")
+        self.assertEqual(
+            [record.data for record in read_capture(self.path)],
+            [b"get opmode\n", b"opmode 2\r\n"],
+        )
+
+        with open(self.path, "wb") as capture_file:
+            capture_file.write(b"not a capture")
+        with self.assertRaises(ValueError):
+            read_capture(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
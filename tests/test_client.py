@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.client.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import socket
+import threading
+import time
+import unittest
+from vrroompy.client import VrroomClient
+from vrroompy.commands import BatchCommand
+from vrroompy.commands.audio import AnalogTone, AnalogVolume
+from vrroompy.commands.input import Input, SPEC_SELECTED_INPUTS, SPEC_SELECTED_INPUT_TX0
+from vrroompy.commands.modes import OperationMode, SPEC_OPERATION_MODE
+from vrroompy.commands.oled import OledFadeTime
+from vrroompy.exceptions import (
+    ConnectionClosedError,
+    ResponseMissingError,
+    ValueNotChangedError,
+)
+from vrroompy.simulator import SimulatorFaults, SimulatorThread
+
+
+class FakeSwitch:
+    """
+    Answers requests on one end of a socket pair from a table of responses.
+    """
+
+    def __init__(self, responses: dict) -> None:
+        self.responses = responses
+        self.requests = []
+        self.client_socket, self.switch_socket = socket.socketpair()
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self) -> None:
+        with self.switch_socket.makefile("rb") as requests:
+            for request in requests:
+                self.requests.append(request)
+                if request not in self.responses:
+                    break
+                self.switch_socket.sendall(self.responses[request])
+        self.switch_socket.close()
+
+
+class TestVrroomClient(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.client.VrroomClient.
+    """
+
+    def test_get(self):
+        switch = FakeSwitch({b"get opmode\n": b"opmode 4\r\n"})
+        with VrroomClient(switch.client_socket) as client:
+            self.assertEqual(
+                client.get_operation_mode(), OperationMode.MATRIX_FRL5_TMDS
+            )
+
+    def test_set(self):
+        switch = FakeSwitch({b"set inseltx1 2\n": b"inseltx1 2\r\n"})
+        with VrroomClient(switch.client_socket) as client:
+            client.set_selected_input_tx1(Input.RX2)
+        self.assertEqual(switch.requests[0], b"set inseltx1 2\n")
+
+    def test_set_raises(self):
+        switch = FakeSwitch({b"set inseltx1 2\n": b"inseltx1 1\r\n"})
+        with VrroomClient(switch.client_socket) as client:
+            with self.assertRaises(ValueNotChangedError):
+                client.set_selected_input_tx1(Input.RX2)
+
+    def test_execute_many(self):
+        switch = FakeSwitch(
+            {
+                b"get opmode\n": b"opmode 1\r\n",
+                b"set inseltx0 3\n": b"inseltx0 3\r\n",
+            }
+        )
+        with VrroomClient(switch.client_socket) as client:
+            command_outputs = client.execute_many(
+                [
+                    BatchCommand(SPEC_OPERATION_MODE),
+                    BatchCommand(SPEC_SELECTED_INPUT_TX0, [Input.RX3]),
+                ]
+            )
+        self.assertEqual(
+            command_outputs, [[OperationMode.SPLITTER_UPSCALE], [Input.RX3]]
+        )
+
+    def test_concurrent(self):
+        switch = FakeSwitch(
+            {
+                b"get opmode\n": b"opmode 2\r\n",
+                b"get inseltx0\n": b"inseltx0 1\r\n",
+                b"get autosw\n": b"autosw off\r\n",
+            }
+        )
+        with VrroomClient(switch.client_socket) as client:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                calls = [
+                    client.get_operation_mode,
+                    client.get_selected_input_tx0,
+                    client.get_autoswitch_enabled,
+                ] * 20
+                results = list(executor.map(lambda call: call(), calls))
+        self.assertEqual(results, [OperationMode.MATRIX_TMDS, Input.RX1, False] * 20)
+
+    def test_connection_closed(self):
+        # The fake switch hangs up on any request it has no response for
+        switch = FakeSwitch({})
+        with VrroomClient(switch.client_socket) as client:
+            with self.assertRaises(ConnectionClosedError):
+                client.get_operation_mode()
+            with self.assertRaises(ConnectionClosedError):
+                client.get_operation_mode()
+
+    def test_execute_many_timeout(self):
+        # Each reply is slower than the last, so the batch misses its one deadline
+        client_socket, switch_socket = socket.socketpair()
+
+        def serve_slowly():
+            with switch_socket.makefile("rb") as requests:
+                for delay in (0.1, 0.1, 0.1):
+                    requests.readline()
+                    time.sleep(delay)
+                    switch_socket.sendall(b"opmode 4\r\n")
+
+        thread = threading.Thread(target=serve_slowly, daemon=True)
+        with switch_socket, VrroomClient(client_socket) as client:
+            thread.start()
+            start_time = time.monotonic()
+            with self.assertRaises(FutureTimeoutError):
+                client.execute_many([BatchCommand(SPEC_OPERATION_MODE)] * 4, 0.25)
+            self.assertLess(time.monotonic() - start_time, 0.4)
+            thread.join(5)
+
+            # The rest of the batch was given up on, so cannot take this reply
+            future = client.submit(SPEC_OPERATION_MODE)
+            switch_socket.sendall(b"opmode 1\r\n")
+            self.assertEqual(future.result(5), [OperationMode.SPLITTER_UPSCALE])
+
+    def test_subscribe_interrupts(self):
+        switch = FakeSwitch({b"get opmode\n": b"int insel 1 1\r\nopmode 4\r\n"})
+        events = []
+        received = threading.Event()
+
+        def on_interrupt(event):
+            events.append(event)
+            received.set()
+
+        with VrroomClient(switch.client_socket) as client:
+            client.subscribe_interrupts(on_interrupt)
+            self.assertEqual(
+                client.get_operation_mode(), OperationMode.MATRIX_FRL5_TMDS
+            )
+            self.assertTrue(received.wait(5))
+        self.assertEqual(events[0].name, "insel")
+        self.assertEqual(events[0].values, ("1", "1"))
+
+    def test_transaction(self):
+        switch = FakeSwitch(
+            {
+                b"set opmode 2\n": b"opmode 2\r\n",
+                b"set insel 1 3\n": b"insel 1 3\r\n",
+            }
+        )
+        with VrroomClient(switch.client_socket) as client:
+            with client.transaction() as transaction:
+                client.set_selected_input_tx0(Input.RX2)
+                client.set_operation_mode(OperationMode.MATRIX_TMDS)
+                client.set_selected_input_tx1(Input.RX3)
+                client.set_selected_input_tx0(Input.RX1)
+            self.assertEqual(transaction.set_count, 4)
+        self.assertEqual(switch.requests, [b"set opmode 2\n", b"set insel 1 3\n"])
+
+    def test_transaction_raises(self):
+        switch = FakeSwitch({b"set inseltx0 2\n": b"inseltx0 1\r\n"})
+        with VrroomClient(switch.client_socket) as client:
+            with self.assertRaises(RuntimeError):
+                with client.transaction():
+                    client.set_selected_input_tx0(Input.RX3)
+                    raise RuntimeError("Abandon transaction")
+
+            with self.assertRaises(ValueNotChangedError):
+                with client.transaction():
+                    client.set_selected_input_tx0(Input.RX2)
+        self.assertEqual(switch.requests, [b"set inseltx0 2\n"])
+
+    def test_typed_audio_video(self):
+        switch = FakeSwitch(
+            {
+                b"set edidhdrflag off\n": b"edidhdrflag off\r\n",
+                b"get avidisable\n": b"avidisable on\r\n",
+                b"set analogvolume -12\n": b"analogvolume -12\r\n",
+                b"get oledfade\n": b"oledfade 30\r\n",
+            }
+        )
+        with VrroomClient(switch.client_socket) as client:
+            client.set_edid_hdr_automix_enabled(False)
+            self.assertTrue(client.get_avi_infoframe_disabled())
+            client.set_analog_volume(AnalogVolume(-12))
+            self.assertEqual(client.get_oled_fade_time(), OledFadeTime(30))
+
+    def test_read_snapshot(self):
+        with SimulatorThread() as simulator:
+            with VrroomClient.connect(*simulator.address, timeout=5) as client:
+                client.set_hdmi_audio_muted_tx1(True)
+                snapshot = client.read_snapshot()
+        self.assertTrue(snapshot.hdmi_audio_muted_tx1)
+        self.assertTrue(snapshot.edid_dv_automix_enabled)
+        self.assertEqual(snapshot.analog_treble, AnalogTone(0))
+
+
+class TestVrroomClientDroppedReplies(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.client.VrroomClient against a switch dropping replies.
+    """
+
+    def drop_next_reply(self, simulator, submit):
+        simulator.simulator.faults = SimulatorFaults(drop_probability=1.0)
+        try:
+            return submit()
+        finally:
+            deadline = time.monotonic() + 5
+            while (
+                simulator.simulator.dropped_count == 0 and time.monotonic() < deadline
+            ):
+                time.sleep(0.01)
+            simulator.simulator.faults = SimulatorFaults()
+
+    def test_dropped_reply_fails_only_its_command(self):
+        with SimulatorThread() as simulator:
+            with VrroomClient.connect(*simulator.address, timeout=5) as client:
+                dropped = self.drop_next_reply(
+                    simulator, lambda: client.submit(SPEC_OPERATION_MODE)
+                )
+                self.assertEqual(
+                    client.get(SPEC_SELECTED_INPUTS, timeout=5),
+                    [Input.RX0, Input.FOLLOW],
+                )
+                with self.assertRaises(ResponseMissingError):
+                    dropped.result(5)
+                self.assertEqual(
+                    client.get(SPEC_OPERATION_MODE, timeout=5),
+                    [OperationMode.SPLITTER_VRR],
+                )
+
+    def test_timed_out_command_is_abandoned(self):
+        with SimulatorThread() as simulator:
+            with VrroomClient.connect(*simulator.address, timeout=5) as client:
+                with self.assertRaises(FutureTimeoutError):
+                    self.drop_next_reply(
+                        simulator,
+                        lambda: client.get(SPEC_OPERATION_MODE, timeout=0.2),
+                    )
+                # The next command on the same target is answered by its own reply
+                self.assertEqual(
+                    client.get(SPEC_OPERATION_MODE, timeout=5),
+                    [OperationMode.SPLITTER_VRR],
+                )
@@ -6,7 +6,7 @@ Contains unit tests for the module vrroompy.codec.
 """
 
 import unittest
-from vrroompy.codec import Codec
+from vrroompy.codec import Codec, ValidationLevel
 from vrroompy.commands.input import Input
 from vrroompy.exceptions import ResponseParsingError
 
@@ -41,6 +41,69 @@ class TestCodec(unittest.TestCase):
         with self.assertRaises(ResponseParsingError):
             Codec.decode_response(b"opmode 5\r\n", "opmode", ["[0-4]"], [str])
 
+    def test_decode_response_compiled(self):
+        response_pattern = Codec.compile_response_pattern(
+            "insel", [Input.pattern(), Input.pattern()]
+        )
+        decoded_response = Codec.decode_response_compiled(
+            b"insel 3 1\r\n", response_pattern, [Input.from_string, Input.from_string]
+        )
+        self.assertEqual(decoded_response, [Input.RX3, Input.RX1])
+
+        # Asserts when compiled pattern does not match response
+        with self.assertRaises(ResponseParsingError):
+            Codec.decode_response_compiled(
+                b"insel 3 5\r\n",
+                response_pattern,
+                [Input.from_string, Input.from_string],
+            )
+
+    def test_decode_response_fast(self):
+        input_decoder = Codec.decoder_from_lookup(Input)
+
+        # Lookup decoders, multiple outputs
+        decoded_response = Codec.decode_response_fast(
+            b"insel 0 4\r\n", b"insel", [input_decoder, input_decoder]
+        )
+        self.assertEqual(decoded_response, [Input.RX0, Input.FOLLOW])
+
+        # Converter decoder, single output
+        decoded_response = Codec.decode_response_fast(
+            b"opmode 4\n", b"opmode", [Codec.decoder_from_converter(str)]
+        )
+        self.assertEqual(decoded_response, ["4"])
+
+        # No outputs
+        decoded_response = Codec.decode_response_fast(b"reboot\r\n", b"reboot", [])
+        self.assertEqual(decoded_response, [])
+
+    def test_decode_response_fast_raises(self):
+        input_decoder = Codec.decoder_from_lookup(Input)
+
+        # Asserts when the target prefix does not match
+        with self.assertRaises(ResponseParsingError):
+            Codec.decode_response_fast(b"opmode 1\r\n", b"insel", [input_decoder])
+
+        # Asserts when the number of values does not match
+        with self.assertRaises(ResponseParsingError):
+            Codec.decode_response_fast(b"insel 1\r\n", b"insel", [input_decoder] * 2)
+        with self.assertRaises(ResponseParsingError):
+            Codec.decode_response_fast(b"reboot 1\r\n", b"reboot", [])
+
+        # Asserts when the target is only a prefix of the response target
+        with self.assertRaises(ResponseParsingError):
+            Codec.decode_response_fast(b"inseltx0 1\r\n", b"insel", [input_decoder])
+
+        # Asserts when a value is not in the lookup
+        with self.assertRaises(ResponseParsingError):
+            Codec.decode_response_fast(b"inseltx0 5\r\n", b"inseltx0", [input_decoder])
+
+        # Asserts when a value is rejected by its converter
+        with self.assertRaises(ResponseParsingError):
+            Codec.decode_response_fast(
+                b"tcpport x\r\n", b"tcpport", [Codec.decoder_from_converter(int)]
+            )
+
     def test_decode_raw(self):
         # With both carriage return and newline
         decoded_response = Codec.decode_response_raw(b"reboot\r\n")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for functions within vrroompy.commands.audio.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from vrroompy.commands.audio import *
+
+
+class TestHdmiAudioMutedTx0Commands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting HDMI audio mutes on TX0.
+    """
+
+    @patch("socket.socket")
+    def test_get_hdmi_audio_muted_tx0(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"mutetx0audio on\r\n")
+
+        self.assertEqual(get_hdmi_audio_muted_tx0(test_socket), True)
+        test_socket.sendall.assert_called_once_with(b"get mutetx0audio\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_hdmi_audio_muted_tx0(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"mutetx0audio off\r\n")
+
+        set_hdmi_audio_muted_tx0(test_socket, False)
+        test_socket.sendall.assert_called_once_with(b"set mutetx0audio off\n")
+        test_socket.recv.assert_called_once()
+
+
+class TestHdmiAudioMutedTx1Commands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting HDMI audio mutes on TX1.
+    """
+
+    @patch("socket.socket")
+    def test_get_hdmi_audio_muted_tx1(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"mutetx1audio on\r\n")
+
+        self.assertEqual(get_hdmi_audio_muted_tx1(test_socket), True)
+        test_socket.sendall.assert_called_once_with(b"get mutetx1audio\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_hdmi_audio_muted_tx1(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"mutetx1audio off\r\n")
+
+        set_hdmi_audio_muted_tx1(test_socket, False)
+        test_socket.sendall.assert_called_once_with(b"set mutetx1audio off\n")
+        test_socket.recv.assert_called_once()
+
+
+class TestAnalogVolumeCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting the analog audio volume.
+    """
+
+    def test_analog_volume_range(self):
+        self.assertEqual(int(AnalogVolume(-30)), -30)
+        self.assertEqual(int(AnalogVolume(10)), 10)
+        with self.assertRaises(ValueError):
+            AnalogVolume(-31)
+        with self.assertRaises(ValueError):
+            AnalogVolume(11)
+
+    def test_analog_tone_range(self):
+        self.assertEqual(str(AnalogTone(-10)), "-10")
+        with self.assertRaises(ValueError):
+            AnalogTone(11)
+        self.assertNotEqual(AnalogTone(5), AnalogVolume(5))
+
+    @patch("socket.socket")
+    def test_get_analog_volume(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"analogvolume -12\r\n")
+
+        self.assertEqual(get_analog_volume(test_socket), AnalogVolume(-12))
+        test_socket.sendall.assert_called_once_with(b"get analogvolume\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_analog_volume(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"analogvolume 3\r\n")
+
+        set_analog_volume(test_socket, AnalogVolume(3))
+        test_socket.sendall.assert_called_once_with(b"set analogvolume 3\n")
+        test_socket.recv.assert_called_once()
+
+
+class TestAnalogToneCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting the analog audio bass/treble.
+    """
+
+    @patch("socket.socket")
+    def test_get_analog_bass(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"analogbass -4\r\n")
+
+        self.assertEqual(get_analog_bass(test_socket), AnalogTone(-4))
+        test_socket.sendall.assert_called_once_with(b"get analogbass\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_analog_treble(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"analogtreble 2\r\n")
+
+        set_analog_treble(test_socket, AnalogTone(2))
+        test_socket.sendall.assert_called_once_with(b"set analogtreble 2\n")
+        test_socket.recv.assert_called_once()
@@ -5,11 +5,24 @@
 Contains unit tests for base commands in vrroompy.commands.
 """
 
+import socket
 import unittest
 from unittest.mock import MagicMock, patch
-from vrroompy.commands import get_command_base, set_command_base
+from vrroompy.codec import ValidationLevel
+from vrroompy.commands import (
+    BatchCommand,
+    execute_many,
+    get_command_base,
+    get_protocol,
+    receive_interrupts,
+    set_command_base,
+)
 from vrroompy.commands.input import Input
-from vrroompy.exceptions import InvalidTargetError, ValueNotChangedError
+from vrroompy.exceptions import (
+    ConnectionClosedError,
+    InvalidTargetError,
+    ValueNotChangedError,
+)
 
 
 class TestBaseCommands(unittest.TestCase):
@@ -145,3 +158,216 @@ class TestBaseCommands(unittest.TestCase):
                 [Input.pattern(), Input.pattern()],
                 [Input.from_string, Input.from_string],
             )
+
+    @patch("socket.socket")
+    def test_get_command_base_split_response(self, test_socket):
+        # Simulate a response arriving across multiple segments
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(side_effect=[b"opm", b"ode 2", b"\r\n"])
+
+        command_output = get_command_base(test_socket, "opmode", ["[0-4]"], [str])
+
+        test_socket.sendall.assert_called_once_with(b"get opmode\n")
+        self.assertEqual(test_socket.recv.call_count, 3)
+        self.assertEqual(command_output, ["2"])
+
+    @patch("socket.socket")
+    def test_get_command_base_merged_response(self, test_socket):
+        # Simulate a segment carrying a stale response and the start of the next one
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(side_effect=[b"opmode 1\r\nopmode 3\r\nins"])
+        get_protocol(test_socket).send_get("opmode")
+
+        command_output = get_command_base(test_socket, "opmode", ["[0-4]"], [str])
+        self.assertEqual(command_output, ["3"])
+        self.assertEqual(get_protocol(test_socket).buffered_byte_count, 3)
+
+    @patch("socket.socket")
+    def test_get_command_base_fast(self, test_socket):
+        # Simulate successful send and receive on a socket with fast validation
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"insel 2 0\r\n")
+        get_protocol(test_socket).validation_level = ValidationLevel.FAST
+
+        command_output = get_command_base(
+            test_socket,
+            "insel",
+            [Input.pattern(), Input.pattern()],
+            [Input.from_string, Input.from_string],
+        )
+        self.assertEqual(command_output, [Input.RX2, Input.RX0])
+
+    @patch("socket.socket")
+    def test_get_command_base_closed(self, test_socket):
+        # Simulate the switch closing the connection before responding
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"")
+
+        with self.assertRaises(ConnectionClosedError):
+            get_command_base(test_socket, "opmode", ["[0-4]"], [str])
+        self.assertEqual(get_protocol(test_socket).pending_commands, [])
+
+    @patch("socket.socket")
+    def test_get_command_base_timeout(self, test_socket):
+        # Simulate a reply that never arrives, then the reply to the next command
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(
+            side_effect=[socket.timeout("timed out"), b"opmode 3\r\n"]
+        )
+
+        with self.assertRaises(socket.timeout):
+            get_command_base(test_socket, "opmode", ["[0-4]"], [str])
+        self.assertEqual(get_protocol(test_socket).pending_commands, [])
+        command_output = get_command_base(test_socket, "opmode", ["[0-4]"], [str])
+        self.assertEqual(command_output, ["3"])
+
+    @patch("socket.socket")
+    def test_execute_many_timeout(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(side_effect=[b"opmode 1\r\n", socket.timeout()])
+
+        with self.assertRaises(socket.timeout):
+            execute_many(
+                test_socket,
+                [
+                    BatchCommand.get("opmode", ["[0-4]"], [str]),
+                    BatchCommand.get("insel", ["[0-4]"], [str]),
+                ],
+            )
+        self.assertEqual(get_protocol(test_socket).pending_commands, [])
+
+    @patch("socket.socket")
+    def test_execute_many_send_fails(self, test_socket):
+        test_socket.sendall = MagicMock(side_effect=BrokenPipeError())
+
+        with self.assertRaises(BrokenPipeError):
+            execute_many(test_socket, [BatchCommand.get("opmode", ["[0-4]"], [str])])
+        self.assertEqual(get_protocol(test_socket).pending_commands, [])
+
+    @patch("socket.socket")
+    def test_execute_many_decode_fails(self, test_socket):
+        # The first response is rejected, leaving the second command unanswered
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(side_effect=[b"insel 1 2\r\n", b"opmode 3\r\n"])
+
+        with self.assertRaises(ValueNotChangedError):
+            execute_many(
+                test_socket,
+                [
+                    BatchCommand.set(
+                        "insel",
+                        [Input.RX0, Input.FOLLOW],
+                        [Input.pattern(), Input.pattern()],
+                        [Input.from_string, Input.from_string],
+                    ),
+                    BatchCommand.get("opmode", ["[0-4]"], [str]),
+                ],
+            )
+        self.assertEqual(get_protocol(test_socket).pending_commands, [])
+        command_output = get_command_base(test_socket, "opmode", ["[0-4]"], [str])
+        self.assertEqual(command_output, ["3"])
+
+    def test_receive_interrupts(self):
+        vrroom, switch = socket.socketpair()
+        with vrroom, switch:
+            events = []
+            get_protocol(vrroom).subscribe_interrupts(events.append)
+
+            self.assertEqual(receive_interrupts(vrroom), 0)
+            switch.sendall(b"int insel 2 2\r\nint rx1\r\n")
+            self.assertEqual(receive_interrupts(vrroom, 5), 2)
+            self.assertEqual([event.name for event in events], ["insel", "rx1"])
+
+            # Interrupts arriving between commands do not disturb their responses
+            switch.sendall(b"int rx0\r\nopmode 3\r\n")
+            self.assertEqual(
+                get_command_base(vrroom, "opmode", ["[0-4]"], [str]), ["3"]
+            )
+            self.assertEqual(len(events), 3)
+            self.assertEqual(switch.recv(256), b"get opmode\n")
+
+            switch.close()
+            with self.assertRaises(ConnectionClosedError):
+                receive_interrupts(vrroom, 5)
+
+
+class TestBatchCommands(unittest.TestCase):
+    """
+    Unit tests the batch command free functions.
+    """
+
+    @patch("socket.socket")
+    def test_execute_many(self, test_socket):
+        # Simulate all responses arriving in a single segment
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(
+            return_value=b"opmode 2\r\ninsel 0 4\r\nhotplug\r\n"
+        )
+
+        command_outputs = execute_many(
+            test_socket,
+            [
+                BatchCommand.get("opmode", ["[0-4]"], [str]),
+                BatchCommand.set(
+                    "insel",
+                    [Input.RX0, Input.FOLLOW],
+                    [Input.pattern(), Input.pattern()],
+                    [Input.from_string, Input.from_string],
+                ),
+                BatchCommand.set("hotplug", [], [], []),
+            ],
+        )
+
+        test_socket.sendall.assert_called_once_with(
+            b"get opmode\nset insel 0 4\nset hotplug\n"
+        )
+        test_socket.recv.assert_called_once()
+        self.assertEqual(command_outputs, [["2"], [Input.RX0, Input.FOLLOW], []])
+
+    @patch("socket.socket")
+    def test_execute_many_split(self, test_socket):
+        # Simulate responses split unevenly across segments
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(
+            side_effect=[b"opmode 2\r", b"\nopmode", b" 3\r\n"]
+        )
+
+        command_outputs = execute_many(
+            test_socket,
+            [
+                BatchCommand.get("opmode", ["[0-4]"], [str]),
+                BatchCommand.get("opmode", ["[0-4]"], [str]),
+            ],
+        )
+
+        test_socket.sendall.assert_called_once_with(b"get opmode\nget opmode\n")
+        self.assertEqual(command_outputs, [["2"], ["3"]])
+
+    @patch("socket.socket")
+    def test_execute_many_empty(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+
+        self.assertEqual(execute_many(test_socket, []), [])
+        test_socket.sendall.assert_not_called()
+
+    @patch("socket.socket")
+    def test_execute_many_raises(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"insel 0 2\r\n")
+
+        with self.assertRaises(InvalidTargetError):
+            execute_many(test_socket, [BatchCommand.get("invalid", [], [])])
+        test_socket.sendall.assert_not_called()
+
+        with self.assertRaises(ValueNotChangedError):
+            execute_many(
+                test_socket,
+                [
+                    BatchCommand.set(
+                        "insel",
+                        [Input.RX0, Input.FOLLOW],
+                        [Input.pattern(), Input.pattern()],
+                        [Input.from_string, Input.from_string],
+                    )
+                ],
+            )
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.commands.cache.
+"""
+
+import socket
+import threading
+import unittest
+from vrroompy.commands import disable_cache, enable_cache, get_cache
+from vrroompy.commands.cache import StateCache
+from vrroompy.commands.enums import OnOffSwitch, Target
+from vrroompy.commands.input import (
+    Input,
+    get_selected_input_tx0,
+    get_selected_inputs,
+    set_selected_inputs,
+)
+from vrroompy.commands.network import get_mac_address, set_ip_interrupts_enabled
+
+
+def reply_from_table(switch: socket.socket, responses: dict, requests: list) -> None:
+    """
+    Answers each request received by the fake switch from the table of responses.
+    """
+    with switch.makefile("rb") as lines:
+        for line in lines:
+            requests.append(line.rstrip())
+            switch.sendall(responses[line.rstrip()])
+
+
+class FakeClock:
+    """
+    Stands in for time.monotonic, only moving forward when told to.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestStateCache(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.commands.cache.StateCache.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = StateCache(clock=self.clock)
+
+    def test_get_ttl(self):
+        self.cache.put(Target.SELECTED_INPUTS, [Input.RX1, Input.RX2])
+        self.cache.put(Target.MAC_ADDRESS, ["19:AC:B5:D3:22:F4"])
+
+        self.assertEqual(self.cache.get(Target.SELECTED_INPUTS), [Input.RX1, Input.RX2])
+        self.clock.now = 1000.0
+        self.assertIsNone(self.cache.get(Target.SELECTED_INPUTS))
+        self.assertEqual(self.cache.get(Target.MAC_ADDRESS), ["19:AC:B5:D3:22:F4"])
+        self.assertEqual((self.cache.hit_count, self.cache.miss_count), (2, 1))
+
+    def test_get_uncached_target(self):
+        self.cache.put(Target.STATUS, ["status"])
+        self.assertIsNone(self.cache.get(Target.STATUS))
+
+    def test_put_set_overlapping(self):
+        self.cache.put(Target.SELECTED_INPUT_TX0, [Input.RX1])
+        self.cache.put_set(Target.SELECTED_INPUTS, [Input.RX2, Input.RX3])
+
+        self.assertIsNone(self.cache.get(Target.SELECTED_INPUT_TX0))
+        self.assertEqual(self.cache.get(Target.SELECTED_INPUTS), [Input.RX2, Input.RX3])
+
+    def test_put_set_action(self):
+        self.cache.put(Target.MAC_ADDRESS, ["19:AC:B5:D3:22:F4"])
+        self.cache.put_set(Target.ACTION_REBOOT, [])
+        self.assertIsNone(self.cache.get(Target.MAC_ADDRESS))
+
+    def test_put_interrupts_enabled(self):
+        self.cache.put(Target.IP_INTERRUPTS_ENABLED, [OnOffSwitch.ON])
+        self.assertTrue(self.cache.interrupts_enabled)
+        self.cache.put(Target.IP_INTERRUPTS_ENABLED, [OnOffSwitch.OFF])
+        self.assertFalse(self.cache.interrupts_enabled)
+
+    def test_observe_interrupts(self):
+        self.cache.put(Target.SELECTED_INPUTS, [Input.RX1, Input.RX2])
+        self.cache.put(Target.MAC_ADDRESS, ["19:AC:B5:D3:22:F4"])
+
+        self.cache.observe_interrupts(0)
+        self.assertIsNotNone(self.cache.get(Target.SELECTED_INPUTS))
+        self.cache.observe_interrupts(1)
+        self.assertIsNone(self.cache.get(Target.SELECTED_INPUTS))
+        self.assertIsNotNone(self.cache.get(Target.MAC_ADDRESS))
+
+
+class TableSocket:
+    """
+    Stands in for a socket without a file descriptor, answering from a table.
+    """
+
+    def __init__(self, responses: dict) -> None:
+        self.responses = responses
+        self.requests = []
+        self.__response = b""
+
+    def sendall(self, request: bytes) -> None:
+        self.requests.append(request)
+        self.__response = self.responses[request]
+
+    def recv(self, _buffer_size: int) -> bytes:
+        response, self.__response = self.__response, b""
+        return response
+
+
+class TestCachedCommands(unittest.TestCase):
+    """
+    Unit tests commands on a socket with caching enabled.
+    """
+
+    def setUp(self):
+        self.vrroom, self.switch = socket.socketpair()
+        self.vrroom.settimeout(5)
+        self.clock = FakeClock()
+        self.cache = enable_cache(self.vrroom, StateCache(clock=self.clock))
+
+    def tearDown(self):
+        self.vrroom.close()
+        self.switch.close()
+
+    def test_get_cached(self):
+        self.switch.sendall(b"insel 1 2\r\n")
+        self.assertEqual(get_selected_inputs(self.vrroom), [Input.RX1, Input.RX2])
+        self.assertEqual(get_selected_inputs(self.vrroom), [Input.RX1, Input.RX2])
+        self.assertEqual(self.switch.recv(256), b"get insel\n")
+
+        # Once expired, the target is read from the switch again
+        self.clock.now = 10.0
+        self.switch.sendall(b"insel 3 2\r\n")
+        self.assertEqual(get_selected_inputs(self.vrroom), [Input.RX3, Input.RX2])
+        self.assertEqual(self.switch.recv(256), b"get insel\n")
+
+    def test_set_read_your_writes(self):
+        self.switch.sendall(b"insel 2 3\r\n")
+        set_selected_inputs(self.vrroom, Input.RX2, Input.RX3)
+        self.assertEqual(get_selected_inputs(self.vrroom), [Input.RX2, Input.RX3])
+        self.assertEqual(self.switch.recv(256), b"set insel 2 3\n")
+
+    def test_interrupt_invalidates(self):
+        responses = {
+            b"set ipinterrupt on": b"ipinterrupt on\r\n",
+            b"get mac": b"mac 19:AC:B5:D3:22:F4\r\n",
+            b"get insel": b"insel 1 2\r\n",
+        }
+        requests = []
+        threading.Thread(
+            target=reply_from_table,
+            args=(self.switch, responses, requests),
+            daemon=True,
+        ).start()
+
+        set_ip_interrupts_enabled(self.vrroom, True)
+        get_mac_address(self.vrroom)
+        self.assertEqual(get_selected_inputs(self.vrroom), [Input.RX1, Input.RX2])
+
+        # The interrupt arrives unprompted, and is noticed before the cache is used
+        responses[b"get insel"] = b"insel 2 2\r\n"
+        self.switch.sendall(b"int insel 2 2\r\n")
+        self.assertEqual(str(get_mac_address(self.vrroom)), "19:AC:B5:D3:22:F4")
+        self.assertEqual(get_selected_inputs(self.vrroom), [Input.RX2, Input.RX2])
+        self.assertEqual(
+            requests,
+            [b"set ipinterrupt on", b"get mac", b"get insel", b"get insel"],
+        )
+
+    def test_interrupts_without_file_descriptor(self):
+        vrroom = TableSocket(
+            {
+                b"set ipinterrupt on\n": b"ipinterrupt on\r\n",
+                b"get mac\n": b"int insel 2 2\r\nmac 19:AC:B5:D3:22:F4\r\n",
+            }
+        )
+        enable_cache(vrroom, StateCache(clock=self.clock))
+        set_ip_interrupts_enabled(vrroom, True)
+
+        # Interrupts can only arrive with responses, so the cache answers regardless
+        for _ in range(2):
+            self.assertEqual(str(get_mac_address(vrroom)), "19:AC:B5:D3:22:F4")
+        self.assertEqual(vrroom.requests, [b"set ipinterrupt on\n", b"get mac\n"])
+
+    def test_disable_cache(self):
+        self.assertIs(get_cache(self.vrroom), self.cache)
+        disable_cache(self.vrroom)
+        self.assertIsNone(get_cache(self.vrroom))
+
+        self.switch.sendall(b"inseltx0 1\r\n")
+        self.assertEqual(get_selected_input_tx0(self.vrroom), Input.RX1)
+        self.switch.sendall(b"inseltx0 2\r\n")
+        self.assertEqual(get_selected_input_tx0(self.vrroom), Input.RX2)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for functions within vrroompy.commands.edid.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from vrroompy.commands.edid import *
+
+
+class TestEdidFrlAutomixCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting the EDID FRL automix flag.
+    """
+
+    @patch("socket.socket")
+    def test_get_edid_frl_automix_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"edidfrlflag on\r\n")
+
+        self.assertEqual(get_edid_frl_automix_enabled(test_socket), True)
+        test_socket.sendall.assert_called_once_with(b"get edidfrlflag\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_edid_frl_automix_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"edidfrlflag off\r\n")
+
+        set_edid_frl_automix_enabled(test_socket, False)
+        test_socket.sendall.assert_called_once_with(b"set edidfrlflag off\n")
+        test_socket.recv.assert_called_once()
+
+
+class TestEdidHdrAutomixCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting the EDID HDR automix flag.
+    """
+
+    @patch("socket.socket")
+    def test_get_edid_hdr_automix_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"edidhdrflag on\r\n")
+
+        self.assertEqual(get_edid_hdr_automix_enabled(test_socket), True)
+        test_socket.sendall.assert_called_once_with(b"get edidhdrflag\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_edid_hdr_automix_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"edidhdrflag off\r\n")
+
+        set_edid_hdr_automix_enabled(test_socket, False)
+        test_socket.sendall.assert_called_once_with(b"set edidhdrflag off\n")
+        test_socket.recv.assert_called_once()
+
+
+class TestEdidDvAutomixCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting the EDID Dolby Vision automix flag.
+    """
+
+    @patch("socket.socket")
+    def test_get_edid_dv_automix_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"ediddvflag on\r\n")
+
+        self.assertEqual(get_edid_dv_automix_enabled(test_socket), True)
+        test_socket.sendall.assert_called_once_with(b"get ediddvflag\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_edid_dv_automix_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"ediddvflag off\r\n")
+
+        set_edid_dv_automix_enabled(test_socket, False)
+        test_socket.sendall.assert_called_once_with(b"set ediddvflag off\n")
+        test_socket.recv.assert_called_once()
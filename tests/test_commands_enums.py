@@ -54,3 +54,4 @@ class TestTarget(unittest.TestCase):
         self.assertEqual(Target.is_valid("ipaddr"), True)
         self.assertEqual(Target.is_valid("edidmode"), True)
         self.assertEqual(Target.is_valid("invalid"), False)
+        self.assertEqual(Target.is_valid(Target.MAC_ADDRESS), True)
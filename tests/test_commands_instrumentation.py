@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.commands.instrumentation.
+"""
+
+import math
+import socket
+import unittest
+from vrroompy.commands import (
+    disable_instrumentation,
+    enable_instrumentation,
+    get_command_base,
+    get_instrumentation,
+)
+from vrroompy.commands.enums import Target
+from vrroompy.commands.input import Input, get_selected_inputs, set_selected_inputs
+from vrroompy.commands.instrumentation import (
+    CommandTiming,
+    Instrumentation,
+    LatencyHistogram,
+)
+from vrroompy.commands.modes import OperationMode, get_operation_mode
+from vrroompy.exceptions import ResponseParsingError, ValueNotChangedError
+
+
+class TableSocket:
+    """
+    Stands in for a socket, answering each request from a table of responses.
+
+    Requests missing from the table time out, as if the switch never replied.
+    """
+
+    def __init__(self, responses: dict) -> None:
+        self.responses = responses
+        self.__response = b""
+
+    def sendall(self, request: bytes) -> None:
+        self.__response = self.responses.get(request, b"")
+
+    def recv(self, _buffer_size: int) -> bytes:
+        if not self.__response:
+            raise socket.timeout("timed out")
+        response, self.__response = self.__response, b""
+        return response
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.commands.instrumentation.LatencyHistogram.
+    """
+
+    def test_record_percentile(self):
+        histogram = LatencyHistogram([0.001, 0.01, 0.1])
+        self.assertTrue(math.isnan(histogram.percentile(0.5)))
+        self.assertTrue(math.isnan(histogram.mean))
+
+        for latency in [0.0005] * 90 + [0.005] * 9 + [0.5]:
+            histogram.record(latency)
+        self.assertEqual(histogram.counts, [90, 9, 0, 1])
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.percentile(0.5), 0.001)
+        self.assertEqual(histogram.percentile(0.99), 0.01)
+        self.assertEqual(histogram.percentile(1.0), 0.5)
+        self.assertAlmostEqual(histogram.mean, (0.045 + 0.045 + 0.5) / 100)
+
+    def test_percentile_capped_by_maximum(self):
+        histogram = LatencyHistogram([0.001, 0.01])
+        histogram.record(0.002)
+        self.assertEqual(histogram.percentile(0.5), 0.002)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.commands.instrumentation.Instrumentation, and its
+    use by the command functions.
+    """
+
+    def setUp(self):
+        self.socket = TableSocket(
+            {
+                b"get opmode\n": b"opmode 2\r\n",
+                b"get insel\n": b"insel 1 2\r\n",
+                b"set insel 1 2\n": b"insel 1 2\r\n",
+                b"set insel 3 3\n": b"insel 1 2\r\n",
+                b"get inseltx0\n": b"inseltx0 junk\r\n",
+            }
+        )
+
+    def test_disabled(self):
+        self.assertIsNone(get_instrumentation(self.socket))
+        self.assertEqual(get_operation_mode(self.socket), OperationMode.MATRIX_TMDS)
+
+        instrumentation = enable_instrumentation(self.socket)
+        self.assertIs(get_instrumentation(self.socket), instrumentation)
+        disable_instrumentation(self.socket)
+        get_operation_mode(self.socket)
+        self.assertEqual(instrumentation.command_count, 0)
+
+    def test_latencies(self):
+        instrumentation = enable_instrumentation(self.socket)
+        get_operation_mode(self.socket)
+        get_operation_mode(self.socket)
+        set_selected_inputs(self.socket, Input.RX1, Input.RX2)
+        self.assertEqual(
+            get_command_base(self.socket, "insel", [r"[0-4]", r"[0-4]"], [int, int]),
+            [1, 2],
+        )
+
+        self.assertEqual(instrumentation.command_count, 4)
+        self.assertEqual(
+            set(instrumentation.targets),
+            {Target.OPERATION_MODE, Target.SELECTED_INPUTS},
+        )
+        latencies = instrumentation.latencies(Target.OPERATION_MODE)
+        for histogram in latencies:
+            self.assertEqual(histogram.count, 2)
+            self.assertGreaterEqual(histogram.total, 0.0)
+        self.assertEqual(
+            instrumentation.latencies(Target.SELECTED_INPUTS).wait.count, 2
+        )
+        self.assertIsNone(instrumentation.latencies(Target.MAC_ADDRESS))
+
+        instrumentation.reset()
+        self.assertEqual(instrumentation.command_count, 0)
+        self.assertEqual(instrumentation.targets, [])
+
+    def test_error_counts(self):
+        instrumentation = enable_instrumentation(self.socket)
+        with self.assertRaises(ValueNotChangedError):
+            set_selected_inputs(self.socket, Input.RX3, Input.RX3)
+        with self.assertRaises(ResponseParsingError):
+            get_command_base(self.socket, "inseltx0", [r"[0-4]"], [int])
+        with self.assertRaises(socket.timeout):
+            get_command_base(self.socket, "mac", [r".+"], [str])
+
+        self.assertEqual(instrumentation.error_count, 3)
+        self.assertEqual(instrumentation.not_changed_count, 1)
+        self.assertEqual(instrumentation.parsing_error_count, 1)
+        self.assertEqual(instrumentation.timeout_count, 1)
+        self.assertEqual(instrumentation.command_count, 0)
+
+    def test_hooks(self):
+        instrumentation = Instrumentation()
+        self.assertIs(
+            enable_instrumentation(self.socket, instrumentation), instrumentation
+        )
+        events = []
+        instrumentation.on_send(lambda target, request: events.append(request))
+        remove = instrumentation.on_response(
+            lambda target, line, timing: events.append((target, line, timing))
+        )
+        instrumentation.on_error(
+            lambda target, error: events.append((target, type(error)))
+        )
+
+        get_selected_inputs(self.socket)
+        self.assertEqual(events[0], b"get insel\n")
+        target, line, timing = events[1]
+        self.assertEqual((target, line), (Target.SELECTED_INPUTS, b"insel 1 2\r\n"))
+        self.assertIsInstance(timing, CommandTiming)
+        self.assertAlmostEqual(timing.total, timing.send + timing.wait + timing.decode)
+
+        remove()
+        get_selected_inputs(self.socket)
+        self.assertEqual(len(events), 3)
+        with self.assertRaises(ValueNotChangedError):
+            set_selected_inputs(self.socket, Input.RX3, Input.RX3)
+        self.assertEqual(events[-1], (Target.SELECTED_INPUTS, ValueNotChangedError))
+
+    def test_hooks_raising(self):
+        instrumentation = enable_instrumentation(self.socket)
+        events = []
+
+        def raising_hook(*_args):
+            raise RuntimeError("Hook failed")
+
+        instrumentation.on_send(raising_hook)
+        instrumentation.on_send(lambda target, request: events.append(request))
+        instrumentation.on_response(raising_hook)
+        instrumentation.on_error(raising_hook)
+
+        # Failing hooks are logged, without failing the command or skipping other hooks
+        with self.assertLogs("vrroompy.commands.instrumentation", "ERROR") as logs:
+            self.assertEqual(get_operation_mode(self.socket), OperationMode.MATRIX_TMDS)
+            with self.assertRaises(ValueNotChangedError):
+                set_selected_inputs(self.socket, Input.RX3, Input.RX3)
+        self.assertEqual(len(logs.records), 4)
+        self.assertEqual(events, [b"get opmode\n", b"set insel 3 3\n"])
+        self.assertEqual(instrumentation.command_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
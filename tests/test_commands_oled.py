@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for functions within vrroompy.commands.oled.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from vrroompy.commands.oled import *
+
+
+class TestOledFadeTimeCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting the OLED fade time.
+    """
+
+    def test_oled_fade_time_range(self):
+        self.assertEqual(int(OledFadeTime(255)), 255)
+        with self.assertRaises(ValueError):
+            OledFadeTime(-1)
+        with self.assertRaises(ValueError):
+            OledFadeTime.from_string("256")
+
+    @patch("socket.socket")
+    def test_get_oled_fade_time(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"oledfade 30\r\n")
+
+        self.assertEqual(get_oled_fade_time(test_socket), OledFadeTime(30))
+        test_socket.sendall.assert_called_once_with(b"get oledfade\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_oled_fade_time(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"oledfade 0\r\n")
+
+        set_oled_fade_time(test_socket, OledFadeTime(0))
+        test_socket.sendall.assert_called_once_with(b"set oledfade 0\n")
+        test_socket.recv.assert_called_once()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.commands.reconcile.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from vrroompy.commands.audio import AnalogVolume
+from vrroompy.commands.input import Input
+from vrroompy.commands.modes import OperationMode
+from vrroompy.commands.network import IpAddressV4, TcpPort
+from vrroompy.commands.reconcile import DesiredState, reconcile
+from vrroompy.exceptions import ValueNotChangedError
+
+CURRENT_RESPONSES = b"opmode 2\r\ninsel 1 4\r\nautosw on\r\n"
+
+
+class TestReconcile(unittest.TestCase):
+    """
+    Unit tests the function vrroompy.commands.reconcile.reconcile.
+    """
+
+    @patch("socket.socket")
+    def test_reconcile_unchanged(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=CURRENT_RESPONSES)
+
+        report = reconcile(
+            test_socket,
+            DesiredState(
+                operation_mode=OperationMode.MATRIX_TMDS,
+                selected_inputs=(Input.RX1, Input.FOLLOW),
+                autoswitch_enabled=True,
+            ),
+        )
+
+        test_socket.sendall.assert_called_once_with(
+            b"get opmode\nget insel\nget autosw\n"
+        )
+        self.assertFalse(report.changed)
+        self.assertFalse(report.reboot_required)
+
+    @patch("socket.socket")
+    def test_reconcile_unchanged_list(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"insel 1 4\r\n")
+
+        report = reconcile(
+            test_socket, DesiredState(selected_inputs=[Input.RX1, Input.FOLLOW])
+        )
+
+        test_socket.sendall.assert_called_once_with(b"get insel\n")
+        self.assertFalse(report.changed)
+
+    @patch("socket.socket")
+    def test_reconcile_changed(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(
+            side_effect=[
+                b"opmode 2\r\ntcpport 2222\r\nipaddr 192.168.1.2\r\n",
+                b"tcpport 2223\r\nipaddr 192.168.1.3\r\n",
+            ]
+        )
+
+        report = reconcile(
+            test_socket,
+            DesiredState(
+                operation_mode=OperationMode.MATRIX_TMDS,
+                ip_address=IpAddressV4("192.168.1.3"),
+                tcp_port=TcpPort(2223),
+            ),
+        )
+
+        # Only differing settings are sent, with the address last
+        self.assertEqual(
+            test_socket.sendall.call_args_list[1][0][0],
+            b"set tcpport 2223\nset ipaddr 192.168.1.3\n",
+        )
+        self.assertEqual(
+            report.changes,
+            {
+                "tcp_port": (TcpPort(2222), TcpPort(2223)),
+                "ip_address": (IpAddressV4("192.168.1.2"), IpAddressV4("192.168.1.3")),
+            },
+        )
+        self.assertTrue(report.reboot_required)
+
+    @patch("socket.socket")
+    def test_reconcile_hotplug_required(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(
+            side_effect=[
+                b"edidhdrflag on\r\nanalogvolume -10\r\n",
+                b"edidhdrflag off\r\n",
+            ]
+        )
+
+        report = reconcile(
+            test_socket,
+            DesiredState(
+                edid_hdr_automix_enabled=False, analog_volume=AnalogVolume(-10)
+            ),
+        )
+
+        self.assertEqual(
+            test_socket.sendall.call_args_list[1][0][0], b"set edidhdrflag off\n"
+        )
+        self.assertEqual(report.changes, {"edid_hdr_automix_enabled": (True, False)})
+        self.assertTrue(report.hotplug_required)
+        self.assertFalse(report.reboot_required)
+
+    @patch("socket.socket")
+    def test_reconcile_dry_run(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"insel 1 4\r\nautosw on\r\n")
+
+        report = reconcile(
+            test_socket,
+            DesiredState(
+                autoswitch_enabled=False, selected_inputs=(Input.RX0, Input.RX0)
+            ),
+            dry_run=True,
+        )
+
+        test_socket.sendall.assert_called_once()
+        self.assertEqual(
+            report.changes,
+            {
+                "selected_inputs": ((Input.RX1, Input.FOLLOW), (Input.RX0, Input.RX0)),
+                "autoswitch_enabled": (True, False),
+            },
+        )
+
+    @patch("socket.socket")
+    def test_reconcile_raises(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(side_effect=[b"autosw on\r\n", b"autosw on\r\n"])
+
+        with self.assertRaises(ValueNotChangedError):
+            reconcile(test_socket, DesiredState(autoswitch_enabled=False))
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.commands.scene.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from vrroompy.commands.audio import SPEC_HDMI_MUTED_TX0
+from vrroompy.commands.edid import SPEC_EDID_HDR_AUTOMIX
+from vrroompy.commands.enums import OnOffSwitch
+from vrroompy.commands.input import (
+    Input,
+    SPEC_SELECTED_INPUT_TX0,
+    SPEC_SELECTED_INPUT_TX1,
+)
+from vrroompy.commands.modes import OperationMode, SPEC_OPERATION_MODE
+from vrroompy.commands.scene import Scene, SceneEngine, compile_scene
+from vrroompy.commands.video import SPEC_HDR_DISABLE
+
+MOVIE_SCENE = Scene(
+    "movie",
+    [
+        (SPEC_SELECTED_INPUT_TX0, [Input.RX1]),
+        (SPEC_HDMI_MUTED_TX0, [OnOffSwitch.OFF]),
+        (SPEC_HDR_DISABLE, [OnOffSwitch.OFF]),
+        (SPEC_EDID_HDR_AUTOMIX, [OnOffSwitch.ON]),
+        (SPEC_SELECTED_INPUT_TX1, [Input.RX1]),
+        (SPEC_OPERATION_MODE, [OperationMode.MATRIX_TMDS]),
+    ],
+)
+
+
+def encode_all(commands) -> bytes:
+    return b"".join(command.encode() for command in commands)
+
+
+class TestCompileScene(unittest.TestCase):
+    """
+    Unit tests the function vrroompy.commands.scene.compile_scene.
+    """
+
+    def test_compile_order(self):
+        self.assertEqual(
+            encode_all(compile_scene(MOVIE_SCENE)),
+            b"set opmode 2\n"
+            b"set edidhdrflag on\n"
+            b"set hdrdisable off\n"
+            b"set insel 1 1\n"
+            b"set mutetx0audio off\n"
+            b"set hotplug\n",
+        )
+
+    def test_compile_mute_first(self):
+        scene = Scene(
+            "switch",
+            [
+                (SPEC_SELECTED_INPUT_TX0, [Input.RX2]),
+                (SPEC_HDMI_MUTED_TX0, [OnOffSwitch.ON]),
+            ],
+        )
+        self.assertEqual(
+            encode_all(compile_scene(scene)),
+            b"set mutetx0audio on\nset inseltx0 2\n",
+        )
+
+    def test_compile_hotplug(self):
+        settings = [(SPEC_SELECTED_INPUT_TX0, [Input.RX2])]
+        self.assertEqual(
+            encode_all(compile_scene(Scene("switch", settings, hotplug=True))),
+            b"set inseltx0 2\nset hotplug\n",
+        )
+
+        settings = [(SPEC_EDID_HDR_AUTOMIX, [OnOffSwitch.OFF])]
+        self.assertEqual(
+            encode_all(compile_scene(Scene("edid", settings, hotplug=False))),
+            b"set edidhdrflag off\n",
+        )
+
+        # Automatic hotplugs are only sent for EDID settings that differ
+        scene = Scene("edid", settings)
+        self.assertEqual(
+            encode_all(compile_scene(scene)), b"set edidhdrflag off\nset hotplug\n"
+        )
+        current_values = {SPEC_EDID_HDR_AUTOMIX.target: [OnOffSwitch.OFF]}
+        self.assertEqual(
+            encode_all(compile_scene(scene, current_values)), b"set edidhdrflag off\n"
+        )
+        current_values = {SPEC_EDID_HDR_AUTOMIX.target: [OnOffSwitch.ON]}
+        self.assertEqual(
+            encode_all(compile_scene(scene, current_values)),
+            b"set edidhdrflag off\nset hotplug\n",
+        )
+
+
+class TestSceneEngine(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.commands.scene.SceneEngine.
+    """
+
+    @patch("socket.socket")
+    def test_activate(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(
+            side_effect=[
+                b"edidhdrflag off\r\n",
+                b"opmode 2\r\nedidhdrflag on\r\nhdrdisable off\r\n"
+                b"insel 1 1\r\nmutetx0audio off\r\nhotplug\r\n",
+            ]
+        )
+
+        engine = SceneEngine([MOVIE_SCENE])
+        activation = engine.activate(test_socket, "movie")
+
+        self.assertEqual(engine.scene_names, ["movie"])
+        self.assertEqual(
+            [call[0][0] for call in test_socket.sendall.call_args_list],
+            [b"get edidhdrflag\n", encode_all(engine.plan("movie"))],
+        )
+        self.assertIs(activation.scene, MOVIE_SCENE)
+        self.assertEqual(len(activation.commands), 6)
+        self.assertGreater(activation.elapsed, 0)
+
+    @patch("socket.socket")
+    def test_activate_edid_unchanged(self, test_socket):
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(
+            side_effect=[
+                b"edidhdrflag on\r\n",
+                b"opmode 2\r\nedidhdrflag on\r\nhdrdisable off\r\n"
+                b"insel 1 1\r\nmutetx0audio off\r\n",
+            ]
+        )
+
+        activation = SceneEngine([MOVIE_SCENE]).activate(test_socket, "movie")
+
+        # The EDID is already as desired, so the sources are not hotplugged
+        self.assertNotIn(b"hotplug", test_socket.sendall.call_args_list[1][0][0])
+        self.assertEqual(len(activation.commands), 5)
+
+    def test_activate_unknown(self):
+        with self.assertRaises(KeyError):
+            SceneEngine().plan("unknown")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for classes & functions within vrroompy.commands.snapshot.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from vrroompy.commands.audio import AnalogTone, AnalogVolume
+from vrroompy.commands.input import Input
+from vrroompy.commands.modes import OperationMode
+from vrroompy.commands.network import IpAddressV4, MacAddress, TcpPort
+from vrroompy.commands.oled import OledFadeTime
+from vrroompy.commands.snapshot import *
+
+SNAPSHOT_RESPONSES = (
+    b"opmode 2\r\n"
+    b"insel 1 4\r\n"
+    b"ipaddr 192.168.1.222\r\n"
+    b"ipmask 255.255.255.0\r\n"
+    b"ipgw 192.168.1.1\r\n"
+    b"dhcp off\r\n"
+    b"ipinterrupt on\r\n"
+    b"tcpport 2222\r\n"
+    b"mac 19:AC:B5:D3:22:F4\r\n"
+    b"autosw off\r\n"
+    b"edidfrlflag on\r\n"
+    b"edidvrrflag on\r\n"
+    b"edidallmflag off\r\n"
+    b"edidhdrflag on\r\n"
+    b"ediddvflag off\r\n"
+    b"hdrcustom off\r\n"
+    b"hdrdisable on\r\n"
+    b"avicustom off\r\n"
+    b"avidisable off\r\n"
+    b"mutetx0audio off\r\n"
+    b"mutetx1audio on\r\n"
+    b"analogvolume -12\r\n"
+    b"analogbass 3\r\n"
+    b"analogtreble -2\r\n"
+    b"oledfade 30\r\n"
+)
+
+SNAPSHOT = DeviceSnapshot(
+    operation_mode=OperationMode.MATRIX_TMDS,
+    selected_inputs=(Input.RX1, Input.FOLLOW),
+    ip_address=IpAddressV4("192.168.1.222"),
+    ip_network_mask=IpAddressV4("255.255.255.0"),
+    ip_gateway=IpAddressV4("192.168.1.1"),
+    dhcp_enabled=False,
+    ip_interrupts_enabled=True,
+    tcp_port=TcpPort(2222),
+    mac_address=MacAddress("19:AC:B5:D3:22:F4"),
+    autoswitch_enabled=False,
+    edid_frl_automix_enabled=True,
+    edid_vrr_automix_enabled=True,
+    edid_allm_automix_enabled=False,
+    edid_hdr_automix_enabled=True,
+    edid_dv_automix_enabled=False,
+    hdr_custom_enabled=False,
+    hdr_disabled=True,
+    avi_infoframe_custom_enabled=False,
+    avi_infoframe_disabled=False,
+    hdmi_audio_muted_tx0=False,
+    hdmi_audio_muted_tx1=True,
+    analog_volume=AnalogVolume(-12),
+    analog_bass=AnalogTone(3),
+    analog_treble=AnalogTone(-2),
+    oled_fade_time=OledFadeTime(30),
+)
+
+
+class TestDeviceSnapshot(unittest.TestCase):
+    """
+    Unit tests the DeviceSnapshot class.
+    """
+
+    def test_eq(self):
+        self.assertEqual(SNAPSHOT, SNAPSHOT._replace())
+        self.assertNotEqual(SNAPSHOT, SNAPSHOT._replace(dhcp_enabled=True))
+
+    def test_diff(self):
+        self.assertEqual(SNAPSHOT.diff(SNAPSHOT._replace()), {})
+
+        changed = SNAPSHOT._replace(
+            selected_inputs=(Input.RX2, Input.FOLLOW),
+            tcp_port=TcpPort(2200),
+        )
+        self.assertEqual(
+            SNAPSHOT.diff(changed),
+            {
+                "selected_inputs": (
+                    (Input.RX1, Input.FOLLOW),
+                    (Input.RX2, Input.FOLLOW),
+                ),
+                "tcp_port": (TcpPort(2222), TcpPort(2200)),
+            },
+        )
+
+
+class TestSnapshotCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for reading snapshots.
+    """
+
+    @patch("socket.socket")
+    def test_read_snapshot(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=SNAPSHOT_RESPONSES)
+
+        self.assertEqual(read_snapshot(test_socket), SNAPSHOT)
+        test_socket.sendall.assert_called_once_with(
+            b"get opmode\nget insel\nget ipaddr\nget ipmask\nget ipgw\n"
+            b"get dhcp\nget ipinterrupt\nget tcpport\nget mac\nget autosw\n"
+            b"get edidfrlflag\nget edidvrrflag\nget edidallmflag\nget edidhdrflag\n"
+            b"get ediddvflag\nget hdrcustom\nget hdrdisable\nget avicustom\n"
+            b"get avidisable\nget mutetx0audio\nget mutetx1audio\n"
+            b"get analogvolume\nget analogbass\nget analogtreble\nget oledfade\n"
+        )
+        test_socket.recv.assert_called_once()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for classes within vrroompy.commands.spec.
+"""
+
+import unittest
+from vrroompy.codec import ValidationLevel
+from vrroompy.commands.audio import SPEC_ANALOG_VOLUME
+from vrroompy.commands.enums import Target
+from vrroompy.commands.input import Input
+from vrroompy.commands.spec import CommandSpec
+from vrroompy.exceptions import InvalidTargetError, ResponseParsingError
+
+
+class TestCommandSpec(unittest.TestCase):
+    """
+    Unit tests the CommandSpec class.
+    """
+
+    def test_create(self):
+        spec = CommandSpec.create(
+            "insel", [Input.pattern()] * 2, [Input.from_string] * 2
+        )
+
+        self.assertIs(spec.target, Target.SELECTED_INPUTS)
+        self.assertEqual(spec.value_patterns, ("[0-4]", "[0-4]"))
+        self.assertEqual(spec.get_request, b"get insel\n")
+        self.assertEqual(spec.set_request_prefix, "set insel")
+
+    def test_create_raises(self):
+        with self.assertRaises(InvalidTargetError):
+            CommandSpec.create("invalid", [], [])
+
+        with self.assertRaises(ValueError):
+            CommandSpec.create(Target.ACTION_REBOOT, [""], [])
+
+    def test_decode(self):
+        spec = CommandSpec.create(
+            "insel", [Input.pattern()] * 2, [Input.from_string] * 2
+        )
+        self.assertEqual(spec.decode(b"insel 0 4\r\n"), [Input.RX0, Input.FOLLOW])
+
+        spec = CommandSpec.create(Target.ACTION_HOTPLUG, [], [])
+        self.assertEqual(spec.decode(b"hotplug\r\n"), [])
+
+    def test_decode_fast(self):
+        spec = CommandSpec.create(
+            "insel",
+            [Input.pattern()] * 2,
+            [Input.from_string] * 2,
+            [Input, None],
+        )
+        self.assertEqual(
+            spec.decode(b"insel 0 4\r\n", ValidationLevel.FAST),
+            [Input.RX0, Input.FOLLOW],
+        )
+
+        # Fast decoding only checks structure, so out-of-pattern values may pass
+        spec = CommandSpec.create("opmode", ["[0-4]"], [str])
+        self.assertEqual(spec.decode(b"opmode 5\r\n", ValidationLevel.FAST), ["5"])
+
+        with self.assertRaises(ResponseParsingError):
+            spec.decode(b"opmode 1 2\r\n", ValidationLevel.FAST)
+
+    def test_decode_raises(self):
+        spec = CommandSpec.create("opmode", ["[0-4]"], [str])
+
+        with self.assertRaises(ResponseParsingError):
+            spec.decode(b"opmode 5\r\n")
+
+        with self.assertRaises(ResponseParsingError):
+            spec.decode(b"insel 0 4\r\n")
+
+        # Values matching the pattern, but rejected by their converter, also raise
+        for validation_level in ValidationLevel:
+            with self.assertRaises(ResponseParsingError):
+                SPEC_ANALOG_VOLUME.decode(b"analogvolume 50\r\n", validation_level)
+
+    def test_encode_set(self):
+        spec = CommandSpec.create(
+            "insel", [Input.pattern()] * 2, [Input.from_string] * 2
+        )
+        self.assertEqual(spec.encode_set([Input.RX2, Input.RX3]), b"set insel 2 3\n")
+
+        spec = CommandSpec.create(Target.ACTION_REBOOT, [], [])
+        self.assertEqual(spec.encode_set([]), b"set reboot\n")
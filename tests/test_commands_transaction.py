@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.commands.transaction.
+"""
+
+import unittest
+from vrroompy.commands.input import (
+    Input,
+    SPEC_SELECTED_INPUTS,
+    SPEC_SELECTED_INPUT_TX0,
+    SPEC_SELECTED_INPUT_TX1,
+)
+from vrroompy.commands.modes import OperationMode, SPEC_OPERATION_MODE
+from vrroompy.commands.transaction import Transaction
+
+
+def encode_all(transaction: Transaction) -> bytes:
+    return b"".join(command.encode() for command in transaction.commands())
+
+
+class TestTransaction(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.commands.transaction.Transaction.
+    """
+
+    def test_superseded(self):
+        transaction = Transaction()
+        transaction.set(SPEC_OPERATION_MODE, [OperationMode.MATRIX_TMDS])
+        transaction.set(SPEC_SELECTED_INPUT_TX0, [Input.RX1])
+        transaction.set(SPEC_OPERATION_MODE, [OperationMode.SPLITTER_VRR])
+
+        self.assertEqual(transaction.set_count, 3)
+        self.assertEqual(encode_all(transaction), b"set inseltx0 1\nset opmode 0\n")
+
+    def test_merge_selected_inputs(self):
+        transaction = Transaction()
+        transaction.set(SPEC_SELECTED_INPUT_TX1, [Input.RX3])
+        transaction.set(SPEC_OPERATION_MODE, [OperationMode.MATRIX_TMDS])
+        transaction.set(SPEC_SELECTED_INPUT_TX0, [Input.RX1])
+
+        self.assertEqual(encode_all(transaction), b"set opmode 2\nset insel 1 3\n")
+
+    def test_fold_into_selected_inputs(self):
+        transaction = Transaction()
+        transaction.set(SPEC_SELECTED_INPUTS, [Input.RX0, Input.RX0])
+        transaction.set(SPEC_SELECTED_INPUT_TX1, [Input.RX2])
+        self.assertEqual(encode_all(transaction), b"set insel 0 2\n")
+
+        transaction.set(SPEC_SELECTED_INPUTS, [Input.RX1, Input.RX1])
+        self.assertEqual(encode_all(transaction), b"set insel 1 1\n")
+
+    def test_selected_inputs_supersede_outputs(self):
+        transaction = Transaction()
+        transaction.set(SPEC_SELECTED_INPUT_TX0, [Input.RX2])
+        transaction.set(SPEC_SELECTED_INPUTS, [Input.RX1, Input.RX3])
+        self.assertEqual(encode_all(transaction), b"set insel 1 3\n")
+
+    def test_clear(self):
+        transaction = Transaction()
+        transaction.set(SPEC_SELECTED_INPUT_TX0, [Input.RX2])
+        transaction.clear()
+        self.assertEqual(len(transaction), 0)
+        self.assertEqual(transaction.commands(), [])
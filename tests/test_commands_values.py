@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.commands.values.
+"""
+
+import unittest
+from vrroompy.commands.enums import OnOffSwitch
+from vrroompy.commands.values import (
+    BoundedInteger,
+    first_value,
+    first_value_as_bool,
+    single_value,
+    single_value_from_bool,
+)
+
+
+class Percentage(BoundedInteger):
+    """
+    Defines a bounded integer for testing.
+    """
+
+    MINIMUM = 0
+    MAXIMUM = 100
+
+
+class TestBoundedInteger(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.commands.values.BoundedInteger.
+    """
+
+    def test_bounds_inclusive(self):
+        self.assertEqual(int(Percentage(0)), 0)
+        self.assertEqual(int(Percentage(100)), 100)
+        with self.assertRaises(ValueError):
+            Percentage(-1)
+        with self.assertRaises(ValueError):
+            Percentage(101)
+
+    def test_from_string(self):
+        self.assertEqual(Percentage.from_string("42"), Percentage(42))
+        with self.assertRaises(ValueError):
+            Percentage.from_string("abc")
+
+    def test_equality(self):
+        self.assertEqual(Percentage(7), Percentage(7))
+        self.assertEqual(hash(Percentage(7)), hash(Percentage(7)))
+        self.assertNotEqual(Percentage(7), 7)
+        self.assertEqual(repr(Percentage(7)), "Percentage(7)")
+
+
+class TestValueConversions(unittest.TestCase):
+    """
+    Unit tests the value list conversions of the module vrroompy.commands.values.
+    """
+
+    def test_first_value(self):
+        self.assertEqual(first_value([3, 4]), 3)
+        self.assertTrue(first_value_as_bool([OnOffSwitch.ON]))
+        self.assertFalse(first_value_as_bool([OnOffSwitch.OFF]))
+
+    def test_single_value(self):
+        self.assertEqual(single_value(3), [3])
+        self.assertEqual(single_value_from_bool(True), [OnOffSwitch.ON])
+        self.assertEqual(single_value_from_bool(False), [OnOffSwitch.OFF])
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for functions within vrroompy.commands.video.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from vrroompy.commands.video import *
+
+
+class TestHdrCustomCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting the custom HDR infoframe.
+    """
+
+    @patch("socket.socket")
+    def test_get_hdr_custom_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"hdrcustom on\r\n")
+
+        self.assertEqual(get_hdr_custom_enabled(test_socket), True)
+        test_socket.sendall.assert_called_once_with(b"get hdrcustom\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_hdr_custom_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"hdrcustom off\r\n")
+
+        set_hdr_custom_enabled(test_socket, False)
+        test_socket.sendall.assert_called_once_with(b"set hdrcustom off\n")
+        test_socket.recv.assert_called_once()
+
+
+class TestHdrDisableCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting removal of HDR infoframes.
+    """
+
+    @patch("socket.socket")
+    def test_get_hdr_disabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"hdrdisable on\r\n")
+
+        self.assertEqual(get_hdr_disabled(test_socket), True)
+        test_socket.sendall.assert_called_once_with(b"get hdrdisable\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_hdr_disabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"hdrdisable off\r\n")
+
+        set_hdr_disabled(test_socket, False)
+        test_socket.sendall.assert_called_once_with(b"set hdrdisable off\n")
+        test_socket.recv.assert_called_once()
+
+
+class TestAviInfoframeCustomCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting the custom AVI infoframe.
+    """
+
+    @patch("socket.socket")
+    def test_get_avi_infoframe_custom_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"avicustom on\r\n")
+
+        self.assertEqual(get_avi_infoframe_custom_enabled(test_socket), True)
+        test_socket.sendall.assert_called_once_with(b"get avicustom\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_avi_infoframe_custom_enabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"avicustom off\r\n")
+
+        set_avi_infoframe_custom_enabled(test_socket, False)
+        test_socket.sendall.assert_called_once_with(b"set avicustom off\n")
+        test_socket.recv.assert_called_once()
+
+
+class TestAviInfoframeDisableCommands(unittest.TestCase):
+    """
+    Unit tests the free functions for getting/setting removal of AVI infoframes.
+    """
+
+    @patch("socket.socket")
+    def test_get_avi_infoframe_disabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"avidisable on\r\n")
+
+        self.assertEqual(get_avi_infoframe_disabled(test_socket), True)
+        test_socket.sendall.assert_called_once_with(b"get avidisable\n")
+        test_socket.recv.assert_called_once()
+
+    @patch("socket.socket")
+    def test_set_avi_infoframe_disabled(self, test_socket):
+        # Simulate successful send and receive on test socket
+        test_socket.sendall = MagicMock(return_value=None)
+        test_socket.recv = MagicMock(return_value=b"avidisable off\r\n")
+
+        set_avi_infoframe_disabled(test_socket, False)
+        test_socket.sendall.assert_called_once_with(b"set avidisable off\n")
+        test_socket.recv.assert_called_once()
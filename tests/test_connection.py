@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.connection.
+"""
+
+import socket
+import threading
+import unittest
+from vrroompy.commands import enable_cache
+from vrroompy.commands.modes import OperationMode, get_operation_mode
+from vrroompy.connection import CLOSE_CONNECTION_CHARACTER, ConnectionManager
+
+
+class FakeSwitchServer:
+    """
+    Accepts connections on a local port and answers 'get opmode' on each of them.
+    """
+
+    def __init__(self) -> None:
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.bind(("127.0.0.1", 0))
+        self.server_socket.listen()
+        self.port = self.server_socket.getsockname()[1]
+        self.connections = []
+        self.received = []
+        self.disconnected = threading.Event()
+        threading.Thread(target=self.accept, daemon=True).start()
+
+    def accept(self) -> None:
+        while True:
+            try:
+                connection, _ = self.server_socket.accept()
+            except OSError:
+                return
+            self.connections.append(connection)
+            threading.Thread(target=self.serve, args=(connection,), daemon=True).start()
+
+    def serve(self, connection: socket.socket) -> None:
+        with connection:
+            while True:
+                try:
+                    received = connection.recv(256)
+                except OSError:
+                    return
+                if not received:
+                    self.disconnected.set()
+                    return
+                self.received.append(received)
+                if received == b"get opmode\n":
+                    connection.sendall(b"opmode 2\r\n")
+
+    def drop_connections(self) -> None:
+        for connection in self.connections:
+            connection.shutdown(socket.SHUT_RDWR)
+
+    def close(self) -> None:
+        try:
+            # Shutting down first wakes the thread blocked on accept()
+            self.server_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.server_socket.close()
+
+
+class TestConnectionManager(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.connection.ConnectionManager.
+    """
+
+    def setUp(self):
+        self.server = FakeSwitchServer()
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_connection_reuse(self):
+        with ConnectionManager() as manager:
+            for _ in range(3):
+                with manager.connection("127.0.0.1", self.server.port) as vrroom:
+                    mode = get_operation_mode(vrroom)
+                    self.assertEqual(mode, OperationMode.MATRIX_TMDS)
+            self.assertEqual(manager.connect_count("127.0.0.1", self.server.port), 1)
+
+    def test_connection_reconnect(self):
+        with ConnectionManager(keepalive_interval=0) as manager:
+            with manager.connection("127.0.0.1", self.server.port) as vrroom:
+                get_operation_mode(vrroom)
+
+            # The keepalive probe finds the dropped connection and replaces it
+            self.server.drop_connections()
+            with manager.connection("127.0.0.1", self.server.port) as vrroom:
+                mode = get_operation_mode(vrroom)
+                self.assertEqual(mode, OperationMode.MATRIX_TMDS)
+            self.assertEqual(manager.connect_count("127.0.0.1", self.server.port), 2)
+
+    def test_connection_reconnect_cached(self):
+        with ConnectionManager(keepalive_interval=0) as manager:
+            with manager.connection("127.0.0.1", self.server.port) as vrroom:
+                enable_cache(vrroom)
+                get_operation_mode(vrroom)
+
+            # The probe bypasses the cached operation mode, so still finds the drop
+            self.server.drop_connections()
+            with manager.connection("127.0.0.1", self.server.port) as vrroom:
+                mode = get_operation_mode(vrroom)
+                self.assertEqual(mode, OperationMode.MATRIX_TMDS)
+            self.assertEqual(manager.connect_count("127.0.0.1", self.server.port), 2)
+
+    def test_connection_error_discards(self):
+        with ConnectionManager() as manager:
+            with self.assertRaises(OSError):
+                with manager.connection("127.0.0.1", self.server.port):
+                    raise OSError("Simulated connection failure")
+
+            with manager.connection("127.0.0.1", self.server.port) as vrroom:
+                get_operation_mode(vrroom)
+            self.assertEqual(manager.connect_count("127.0.0.1", self.server.port), 2)
+
+    def test_connect_failure(self):
+        manager = ConnectionManager(connect_attempts=2, initial_backoff=0.01)
+        self.server.close()
+
+        with self.assertRaises(OSError):
+            with manager.connection("127.0.0.1", self.server.port):
+                pass
+
+    def test_close(self):
+        manager = ConnectionManager()
+        with manager.connection("127.0.0.1", self.server.port) as vrroom:
+            get_operation_mode(vrroom)
+        manager.close("127.0.0.1", self.server.port)
+
+        self.assertTrue(self.server.disconnected.wait(5))
+        self.assertIn(CLOSE_CONNECTION_CHARACTER, b"".join(self.server.received))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.debounce.
+"""
+
+import asyncio
+import concurrent.futures
+import socket
+import threading
+import unittest
+from vrroompy.async_client import AsyncVrroomClient
+from vrroompy.client import VrroomClient
+from vrroompy.commands.audio import AnalogTone, AnalogVolume
+from vrroompy.commands.oled import OledFadeTime
+from vrroompy.debounce import CoalescingSetter
+from vrroompy.exceptions import ValueNotChangedError
+
+
+class FakeSwitch:
+    """
+    Echoes set requests on one end of a socket pair, answering only when allowed to.
+    """
+
+    def __init__(self) -> None:
+        self.requests = []
+        self.allowed = threading.Semaphore(0)
+        self.rejected = set()
+        self.client_socket, self.switch_socket = socket.socketpair()
+        self.client_socket.settimeout(5)
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self) -> None:
+        with self.switch_socket, self.switch_socket.makefile("rb") as requests:
+            for request in requests:
+                self.requests.append(request)
+                self.allowed.acquire()  # pylint: disable=consider-using-with
+                response = request[len(b"set ") :].rstrip(b"\n")
+                if response in self.rejected:
+                    response = response.rsplit(b" ", 1)[0] + b" 0"
+                self.switch_socket.sendall(response + b"\r\n")
+
+    def allow(self, count: int = 1000) -> None:
+        for _ in range(count):
+            self.allowed.release()
+
+
+class TestCoalescingSetter(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.debounce.CoalescingSetter with VrroomClient.
+    """
+
+    def test_coalesces_while_in_flight(self):
+        switch = FakeSwitch()
+        with VrroomClient(switch.client_socket) as client:
+            setter = CoalescingSetter(client)
+            for volume in range(-30, -19):
+                setter.set_analog_volume(AnalogVolume(volume))
+            switch.allow()
+            setter.flush(timeout=5)
+        # The first value is written at once, and only the last of the rest follows
+        self.assertEqual(
+            switch.requests,
+            [b"set analogvolume -30\n", b"set analogvolume -20\n"],
+        )
+        self.assertEqual(setter.set_count, 11)
+        self.assertEqual(setter.write_count, 2)
+
+    def test_targets_are_independent(self):
+        switch = FakeSwitch()
+        switch.allow()
+        with VrroomClient(switch.client_socket) as client:
+            setter = CoalescingSetter(client)
+            setter.set_analog_bass(AnalogTone(-2))
+            setter.set_analog_treble(AnalogTone(3))
+            setter.set_oled_fade_time(OledFadeTime(60))
+            setter.flush(timeout=5)
+        self.assertEqual(
+            sorted(switch.requests),
+            [b"set analogbass -2\n", b"set analogtreble 3\n", b"set oledfade 60\n"],
+        )
+
+    def test_flush_timeout(self):
+        # Each write alone finishes within the timeout, but the two together do not
+        switch = FakeSwitch()
+        threading.Timer(0.1, switch.allow, [1]).start()
+        threading.Timer(0.35, switch.allow, [1]).start()
+        with VrroomClient(switch.client_socket) as client:
+            setter = CoalescingSetter(client)
+            setter.set_analog_volume(AnalogVolume(-30))
+            setter.set_analog_volume(AnalogVolume(-20))
+            with self.assertRaises(concurrent.futures.TimeoutError):
+                setter.flush(timeout=0.25)
+            setter.flush(timeout=5)
+        self.assertEqual(setter.write_count, 2)
+
+    def test_flush_raises(self):
+        switch = FakeSwitch()
+        switch.rejected.add(b"analogvolume 5")
+        switch.allow()
+        with VrroomClient(switch.client_socket) as client:
+            setter = CoalescingSetter(client)
+            setter.set_analog_volume(AnalogVolume(5))
+            with self.assertRaises(ValueNotChangedError):
+                setter.flush(timeout=5)
+            # Errors are only raised once
+            setter.flush(timeout=5)
+
+
+class TestCoalescingSetterAsync(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.debounce.CoalescingSetter with AsyncVrroomClient.
+    """
+
+    def test_coalesces_while_in_flight(self):
+        switch = FakeSwitch()
+
+        async def run():
+            reader, writer = await asyncio.open_connection(sock=switch.client_socket)
+            async with AsyncVrroomClient(reader, writer) as client:
+                setter = CoalescingSetter(client)
+                for volume in range(0, 11):
+                    setter.set_analog_volume(AnalogVolume(volume))
+                switch.allow()
+                await setter.flush_async()
+                return setter
+
+        setter = asyncio.run(run())
+        self.assertEqual(
+            switch.requests,
+            [b"set analogvolume 0\n", b"set analogvolume 10\n"],
+        )
+        self.assertEqual(setter.write_count, 2)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.fleet.
+"""
+
+import multiprocessing
+import os
+import selectors
+import signal
+import socket
+import threading
+import unittest
+from unittest.mock import patch
+from vrroompy.commands import BatchCommand
+from vrroompy.commands.input import Input
+from vrroompy.commands.modes import SPEC_OPERATION_MODE, OperationMode
+from vrroompy.commands.network import TcpPort
+from vrroompy.exceptions import ResponseParsingError, VrroomError
+from vrroompy.fleet import FleetPoller, ShardedFleetPoller, shard_for
+
+SWITCH_RESPONSES = {
+    b"get opmode": b"opmode 2\r\n",
+    b"get insel": b"insel 1 4\r\n",
+    b"get ipaddr": b"ipaddr 192.168.1.222\r\n",
+    b"get ipmask": b"ipmask 255.255.255.0\r\n",
+    b"get ipgw": b"ipgw 192.168.1.1\r\n",
+    b"get dhcp": b"dhcp off\r\n",
+    b"get ipinterrupt": b"ipinterrupt off\r\n",
+    b"get tcpport": b"tcpport 2222\r\n",
+    b"get mac": b"mac 19:AC:B5:D3:22:F4\r\n",
+    b"get autosw": b"autosw on\r\n",
+    b"get edidfrlflag": b"edidfrlflag on\r\n",
+    b"get edidvrrflag": b"edidvrrflag on\r\n",
+    b"get edidallmflag": b"edidallmflag on\r\n",
+    b"get edidhdrflag": b"edidhdrflag on\r\n",
+    b"get ediddvflag": b"ediddvflag on\r\n",
+    b"get hdrcustom": b"hdrcustom off\r\n",
+    b"get hdrdisable": b"hdrdisable off\r\n",
+    b"get avicustom": b"avicustom off\r\n",
+    b"get avidisable": b"avidisable off\r\n",
+    b"get mutetx0audio": b"mutetx0audio off\r\n",
+    b"get mutetx1audio": b"mutetx1audio off\r\n",
+    b"get analogvolume": b"analogvolume -10\r\n",
+    b"get analogbass": b"analogbass 0\r\n",
+    b"get analogtreble": b"analogtreble 0\r\n",
+    b"get oledfade": b"oledfade 30\r\n",
+}
+
+
+class FakeSwitchServer:
+    """
+    Accepts connections on a local port and answers get commands from a table.
+    """
+
+    def __init__(self, responses: dict) -> None:
+        self.responses = responses
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.bind(("127.0.0.1", 0))
+        self.server_socket.listen()
+        self.address = self.server_socket.getsockname()
+        self.connection_count = 0
+        threading.Thread(target=self.accept, daemon=True).start()
+
+    def accept(self) -> None:
+        while True:
+            try:
+                connection, _ = self.server_socket.accept()
+            except OSError:
+                return
+            self.connection_count += 1
+            threading.Thread(target=self.serve, args=(connection,), daemon=True).start()
+
+    def serve(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("rb") as requests:
+            for request in requests:
+                response = self.responses.get(request.rstrip())
+                if response is not None:
+                    connection.sendall(response)
+
+    def close(self) -> None:
+        try:
+            self.server_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.server_socket.close()
+
+
+class HangUpSwitchServer(FakeSwitchServer):
+    """
+    Accepts connections on a local port, answers the first request, then hangs up.
+    """
+
+    def serve(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("rb") as requests:
+            connection.sendall(self.responses[requests.readline().rstrip()])
+
+
+class CountingSelector(selectors.DefaultSelector):
+    """
+    Counts the calls made to select, across every instance.
+    """
+
+    select_count = 0
+
+    def select(self, timeout=None):
+        CountingSelector.select_count += 1
+        return super().select(timeout)
+
+
+class TestFleetPoller(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.fleet.FleetPoller.
+    """
+
+    def setUp(self):
+        self.servers = [FakeSwitchServer(SWITCH_RESPONSES) for _ in range(5)]
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+
+    def test_poll(self):
+        addresses = [server.address for server in self.servers]
+        with FleetPoller(addresses) as poller:
+            for _ in range(3):
+                results = poller.poll()
+                self.assertEqual(list(results.keys()), addresses)
+                for result in results.values():
+                    self.assertIsNone(result.error)
+                    self.assertEqual(result.snapshot.operation_mode, OperationMode(2))
+                    self.assertEqual(
+                        result.snapshot.selected_inputs, (Input.RX1, Input.FOLLOW)
+                    )
+                    self.assertEqual(result.snapshot.tcp_port, TcpPort(2222))
+
+        # Connections are kept open between polls
+        for server in self.servers:
+            self.assertEqual(server.connection_count, 1)
+
+    def test_poll_custom_commands(self):
+        addresses = [server.address for server in self.servers]
+        with FleetPoller(
+            addresses, commands=[BatchCommand(SPEC_OPERATION_MODE)], decode=list
+        ) as poller:
+            for result in poller.poll().values():
+                self.assertEqual(result.snapshot, [[OperationMode.MATRIX_TMDS]])
+
+    def test_poll_errors(self):
+        silent_server = FakeSwitchServer({})
+        invalid_server = FakeSwitchServer({b"get opmode": b"opmode 9\r\n"})
+        closed_server = FakeSwitchServer({})
+        closed_server.close()
+        self.servers += [silent_server, invalid_server]
+
+        addresses = [self.servers[0].address] + [
+            server.address for server in (silent_server, invalid_server, closed_server)
+        ]
+        with FleetPoller(addresses, timeout=0.5) as poller:
+            results = poller.poll()
+
+        self.assertIsNone(results[addresses[0]].error)
+        self.assertIsInstance(results[addresses[1]].error, TimeoutError)
+        self.assertIsInstance(results[addresses[2]].error, ResponseParsingError)
+        self.assertIsInstance(results[addresses[3]].error, ConnectionRefusedError)
+        for address in addresses[1:]:
+            self.assertIsNone(results[address].snapshot)
+
+    @patch("selectors.DefaultSelector", CountingSelector)
+    def test_poll_unwatches_polled(self):
+        hang_up_server = HangUpSwitchServer(SWITCH_RESPONSES)
+        silent_server = FakeSwitchServer({})
+        self.servers += [hang_up_server, silent_server]
+
+        addresses = [hang_up_server.address, silent_server.address]
+        CountingSelector.select_count = 0
+        with FleetPoller(
+            addresses,
+            timeout=0.3,
+            commands=[BatchCommand(SPEC_OPERATION_MODE)],
+            decode=list,
+        ) as poller:
+            results = poller.poll()
+
+        self.assertIsNone(results[addresses[0]].error)
+        self.assertIsInstance(results[addresses[1]].error, TimeoutError)
+        # The hang up of the polled switch does not wake the selector until the timeout
+        self.assertLess(CountingSelector.select_count, 10)
+
+
+class TestShardedFleetPoller(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.fleet.ShardedFleetPoller.
+    """
+
+    def setUp(self):
+        self.servers = [FakeSwitchServer(SWITCH_RESPONSES) for _ in range(6)]
+        self.addresses = [server.address for server in self.servers]
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+
+    def test_shard_for_stable(self):
+        address = ("192.168.1.222", 2222)
+        self.assertEqual(shard_for(address, 4), shard_for(address, 4))
+        self.assertEqual(shard_for(address, 1), 0)
+        self.assertTrue(0 <= shard_for(address, 7) < 7)
+
+    def test_shards(self):
+        with ShardedFleetPoller(self.addresses, worker_count=3) as poller:
+            shards = poller.shards
+        self.assertEqual(len(shards), 3)
+        self.assertCountEqual(sum(shards, []), self.addresses)
+        for index, shard in enumerate(shards):
+            for address in shard:
+                self.assertEqual(shard_for(address, 3), index)
+
+    def test_poll(self):
+        with ShardedFleetPoller(self.addresses, worker_count=2) as poller:
+            for _ in range(3):
+                results = poller.poll()
+                self.assertEqual(list(results.keys()), self.addresses)
+                for result in results.values():
+                    self.assertIsNone(result.error)
+                    self.assertEqual(result.snapshot.operation_mode, OperationMode(2))
+                    self.assertEqual(
+                        result.snapshot.selected_inputs, (Input.RX1, Input.FOLLOW)
+                    )
+                    self.assertEqual(result.snapshot.tcp_port, TcpPort(2222))
+            self.assertEqual(poller.restart_count, 0)
+
+        # Each worker keeps its connections open between polls
+        for server in self.servers:
+            self.assertEqual(server.connection_count, 1)
+
+    def test_poll_errors(self):
+        invalid_server = FakeSwitchServer({b"get opmode": b"opmode 9\r\n"})
+        self.servers.append(invalid_server)
+        addresses = [self.addresses[0], invalid_server.address]
+
+        with ShardedFleetPoller(addresses, worker_count=2, timeout=0.5) as poller:
+            results = poller.poll()
+
+        self.assertIsNone(results[addresses[0]].error)
+        self.assertIsInstance(results[addresses[1]].error, ResponseParsingError)
+        self.assertIsNone(results[addresses[1]].snapshot)
+
+    def test_worker_restart(self):
+        with ShardedFleetPoller(self.addresses, worker_count=2) as poller:
+            poller.poll()
+            for worker in multiprocessing.active_children():
+                if worker.name.startswith("VrroomFleetWorker"):
+                    os.kill(worker.pid, signal.SIGKILL)
+                    worker.join()
+
+            # Dead workers are restarted with the same shard before the next poll
+            results = poller.poll()
+            for result in results.values():
+                self.assertIsNone(result.error)
+
+    def test_worker_failure(self):
+        with ShardedFleetPoller(self.addresses, worker_count=1) as poller:
+            poller.poll()
+            worker = next(
+                worker
+                for worker in multiprocessing.active_children()
+                if worker.name.startswith("VrroomFleetWorker")
+            )
+            # Stopping the worker mid-poll fails its shard for this poll only
+            os.kill(worker.pid, signal.SIGSTOP)
+            poller.timeout = 0.25
+            results = poller.poll()
+            for result in results.values():
+                self.assertIsInstance(result.error, VrroomError)
+            self.assertEqual(poller.restart_count, 1)
+
+            results = poller.poll()
+            for result in results.values():
+                self.assertIsNone(result.error)
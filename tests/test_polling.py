@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.polling.
+"""
+
+import asyncio
+import math
+import socket
+import threading
+import unittest
+from vrroompy.async_client import AsyncVrroomClient
+from vrroompy.client import VrroomClient
+from vrroompy.commands.enums import Target
+from vrroompy.commands.input import SPEC_SELECTED_INPUTS
+from vrroompy.commands.modes import OperationMode, SPEC_OPERATION_MODE
+from vrroompy.commands.network import SPEC_MAC_ADDRESS, SPEC_TCP_PORT
+from vrroompy.polling import (
+    AdaptivePoller,
+    PollRate,
+    TimerWheel,
+    Volatility,
+)
+
+
+class FakeClock:
+    """
+    Holds a time that only moves when advanced.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTimerWheel(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.polling.TimerWheel.
+    """
+
+    def test_expires_in_order(self):
+        wheel = TimerWheel(tick=1.0, slot_count=8, start=0.0)
+        wheel.schedule(3.0, "c")
+        wheel.schedule(1.0, "a")
+        wheel.schedule(2.5, "b")
+        self.assertEqual(len(wheel), 3)
+        self.assertEqual(wheel.advance(0.5), [])
+        self.assertEqual(wheel.advance(3.0), ["a", "b", "c"])
+        self.assertEqual(len(wheel), 0)
+
+    def test_beyond_one_turn(self):
+        wheel = TimerWheel(tick=1.0, slot_count=4, start=0.0)
+        wheel.schedule(10.0, "late")
+        wheel.schedule(2.0, "early")
+        self.assertEqual(wheel.advance(4.0), ["early"])
+        self.assertEqual(wheel.advance(9.0), [])
+        self.assertEqual(wheel.advance(100.0), ["late"])
+
+    def test_past_is_next_tick(self):
+        wheel = TimerWheel(tick=1.0, slot_count=4, start=0.0)
+        wheel.advance(5.0)
+        wheel.schedule(1.0, "past")
+        self.assertEqual(wheel.advance(6.0), ["past"])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            TimerWheel(tick=0.0, slot_count=4, start=0.0)
+
+
+class TestAdaptivePoller(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.polling.AdaptivePoller.
+    """
+
+    def create_poller(self, clock, **kwargs):
+        rates = {
+            Volatility.STATIC: PollRate(math.inf, math.inf),
+            Volatility.SLOW: PollRate(60.0, 600.0, 2.0),
+            Volatility.NORMAL: PollRate(5.0, 60.0),
+            Volatility.FAST: PollRate(1.0, 8.0, 2.0),
+        }
+        return AdaptivePoller(
+            [SPEC_OPERATION_MODE, SPEC_MAC_ADDRESS],
+            rates=rates,
+            tick=0.5,
+            jitter=0.0,
+            clock=clock,
+            **kwargs
+        )
+
+    def test_volatility(self):
+        poller = AdaptivePoller([])
+        self.assertEqual(poller.volatility(Target.MAC_ADDRESS), Volatility.STATIC)
+        self.assertEqual(poller.volatility(Target.IP_ADDRESS), Volatility.SLOW)
+        self.assertEqual(poller.volatility(Target.SELECTED_INPUTS), Volatility.FAST)
+        self.assertEqual(poller.volatility(Target.EDID_MODE), Volatility.NORMAL)
+
+    def test_rate_adapts(self):
+        clock = FakeClock()
+        poller = self.create_poller(clock)
+        poller.add_device("a")
+        self.assertEqual(poller.due(), {"a": [SPEC_OPERATION_MODE, SPEC_MAC_ADDRESS]})
+        poller.observe("a", Target.OPERATION_MODE, [OperationMode.MATRIX_TMDS])
+        poller.observe("a", Target.MAC_ADDRESS, ["00:00:00:00:00:00"])
+        self.assertEqual(poller.interval("a", Target.OPERATION_MODE), 1.0)
+
+        # Stable values decay the rate towards the maximum interval
+        for expected_interval in (2.0, 4.0, 8.0, 8.0):
+            clock.now += poller.interval("a", Target.OPERATION_MODE)
+            self.assertEqual(poller.due(), {"a": [SPEC_OPERATION_MODE]})
+            poller.observe("a", Target.OPERATION_MODE, [OperationMode.MATRIX_TMDS])
+            self.assertEqual(
+                poller.interval("a", Target.OPERATION_MODE), expected_interval
+            )
+
+        # A change resets the rate to the minimum interval
+        clock.now += 8.0
+        poller.due()
+        self.assertTrue(
+            poller.observe("a", Target.OPERATION_MODE, [OperationMode.MATRIX_FRL5_TMDS])
+        )
+        self.assertEqual(poller.interval("a", Target.OPERATION_MODE), 1.0)
+        # Static targets are never polled again
+        self.assertEqual(poller.scheduled_count, 1)
+
+    def test_change_notifications(self):
+        clock = FakeClock()
+        poller = self.create_poller(clock)
+        events = []
+        unsubscribe = poller.subscribe(events.append)
+        poller.add_device("a")
+        poller.due()
+        poller.observe("a", Target.OPERATION_MODE, [OperationMode.MATRIX_TMDS])
+        poller.observe("a", Target.OPERATION_MODE, [OperationMode.MATRIX_TMDS])
+        poller.observe("a", Target.OPERATION_MODE, [OperationMode.SPLITTER_VRR])
+        unsubscribe()
+        poller.observe("a", Target.OPERATION_MODE, [OperationMode.MATRIX_TMDS])
+
+        self.assertEqual(len(events), 2)
+        self.assertIsNone(events[0].old_values)
+        self.assertEqual(events[1].old_values, [OperationMode.MATRIX_TMDS])
+        self.assertEqual(events[1].new_values, [OperationMode.SPLITTER_VRR])
+        self.assertEqual(poller.change_count, 3)
+
+    def test_subscriber_raising(self):
+        clock = FakeClock()
+        poller = self.create_poller(clock)
+        events = []
+
+        def raising_callback(_event):
+            raise RuntimeError("Subscriber failed")
+
+        poller.subscribe(raising_callback)
+        poller.subscribe(events.append)
+        poller.add_device("a")
+        poller.due()
+        # Failing subscribers are logged, and the poll is still rescheduled
+        with self.assertLogs("vrroompy.polling", "ERROR"):
+            self.assertTrue(
+                poller.observe("a", Target.OPERATION_MODE, [OperationMode.MATRIX_TMDS])
+            )
+        self.assertEqual(len(events), 1)
+        clock.now += poller.interval("a", Target.OPERATION_MODE)
+        self.assertEqual(poller.due(), {"a": [SPEC_OPERATION_MODE]})
+
+    def test_jitter_spreads_polls(self):
+        clock = FakeClock()
+        poller = AdaptivePoller(
+            [SPEC_OPERATION_MODE], tick=0.01, jitter=0.2, clock=clock, seed=1
+        )
+        for device in range(100):
+            poller.add_device(device)
+        for device in poller.due():
+            poller.observe(device, Target.OPERATION_MODE, [OperationMode.MATRIX_TMDS])
+
+        due_counts = []
+        while clock.now < 1.3:
+            clock.now += 0.01
+            due_counts.append(len(poller.due()))
+        # Every device is polled again, but never more than a fraction at once
+        self.assertEqual(sum(due_counts), 100)
+        self.assertLess(max(due_counts), 20)
+
+    def test_failed_polls_retry(self):
+        clock = FakeClock()
+        poller = self.create_poller(clock, retry_interval=2.0)
+        poller.add_device("a")
+        poller.due()
+        poller.fail("a", Target.MAC_ADDRESS)
+        poller.fail("a", Target.OPERATION_MODE)
+        clock.now += 1.0
+        self.assertEqual(poller.due(), {"a": [SPEC_OPERATION_MODE]})
+        clock.now += 1.0
+        self.assertEqual(poller.due(), {"a": [SPEC_MAC_ADDRESS]})
+
+    def test_remove_device(self):
+        clock = FakeClock()
+        poller = self.create_poller(clock)
+        poller.add_device("a")
+        poller.add_device("b")
+        poller.remove_device("a")
+        self.assertEqual(list(poller.due()), ["b"])
+        self.assertEqual(poller.devices, ["b"])
+        self.assertFalse(poller.observe("a", Target.OPERATION_MODE, []))
+
+
+class FakeSwitch:
+    """
+    Answers requests on one end of a socket pair from a table of responses.
+    """
+
+    RESPONSES = {
+        b"get opmode\n": b"opmode 4\r\n",
+        b"get tcpport\n": b"tcpport 2222\r\n",
+        b"get insel\n": b"insel junk\r\n",
+    }
+
+    def __init__(self) -> None:
+        self.requests = []
+        self.client_socket, self.switch_socket = socket.socketpair()
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self) -> None:
+        with self.switch_socket, self.switch_socket.makefile("rb") as requests:
+            for request in requests:
+                self.requests.append(request)
+                self.switch_socket.sendall(self.RESPONSES.get(request, b"err\r\n"))
+
+
+class SilentSwitch(FakeSwitch):
+    """
+    Reads requests on one end of a socket pair, but never answers the operation mode.
+    """
+
+    RESPONSES = {b"get opmode\n": b""}
+
+
+class TestAdaptivePollerClients(unittest.TestCase):
+    """
+    Unit tests polling switches through clients with vrroompy.polling.AdaptivePoller.
+    """
+
+    def test_poll(self):
+        switches = [FakeSwitch(), FakeSwitch()]
+        poller = AdaptivePoller(
+            [SPEC_OPERATION_MODE, SPEC_TCP_PORT, SPEC_SELECTED_INPUTS]
+        )
+        clients = {}
+        for index, switch in enumerate(switches):
+            clients[index] = VrroomClient(switch.client_socket)
+            poller.add_device(index)
+        try:
+            self.assertEqual(poller.poll(clients), 6)
+            self.assertEqual(poller.poll(clients), 0)
+        finally:
+            for client in clients.values():
+                client.close()
+
+        self.assertEqual(poller.poll_count, 4)
+        self.assertEqual(
+            poller.values(1, Target.OPERATION_MODE), [OperationMode.MATRIX_FRL5_TMDS]
+        )
+        # The failed read is retried, rather than recorded
+        self.assertIsNone(poller.values(1, Target.SELECTED_INPUTS))
+        self.assertEqual(poller.scheduled_count, 6)
+
+    def test_poll_async(self):
+        switch = FakeSwitch()
+        poller = AdaptivePoller([SPEC_OPERATION_MODE])
+        events = []
+        poller.subscribe(events.append)
+
+        async def run():
+            reader, writer = await asyncio.open_connection(sock=switch.client_socket)
+            async with AsyncVrroomClient(reader, writer) as client:
+                poller.add_device("a")
+                return await poller.poll_async({"a": client})
+
+        self.assertEqual(asyncio.run(run()), 1)
+        self.assertEqual(events[0].new_values, [OperationMode.MATRIX_FRL5_TMDS])
+
+    def test_poll_timeout(self):
+        switches = [FakeSwitch(), SilentSwitch()]
+        poller = AdaptivePoller([SPEC_OPERATION_MODE], poll_timeout=0.2)
+        clients = {}
+        for index, switch in enumerate(switches):
+            clients[index] = VrroomClient(switch.client_socket)
+            poller.add_device(index)
+        try:
+            self.assertEqual(poller.poll(clients), 2)
+        finally:
+            for client in clients.values():
+                client.close()
+
+        self.assertEqual(poller.poll_count, 1)
+        self.assertEqual(
+            poller.values(0, Target.OPERATION_MODE), [OperationMode.MATRIX_FRL5_TMDS]
+        )
+        # The unanswered poll fails, and is retried
+        self.assertIsNone(poller.values(1, Target.OPERATION_MODE))
+        self.assertEqual(poller.scheduled_count, 2)
+
+    def test_poll_async_timeout(self):
+        switch = SilentSwitch()
+        poller = AdaptivePoller([SPEC_OPERATION_MODE], poll_timeout=0.2)
+
+        async def run():
+            reader, writer = await asyncio.open_connection(sock=switch.client_socket)
+            async with AsyncVrroomClient(reader, writer) as client:
+                poller.add_device("a")
+                # A switch without a client fails its polls, rather than every poll
+                poller.add_device("b")
+                return await poller.poll_async({"a": client})
+
+        self.assertEqual(asyncio.run(run()), 2)
+        self.assertEqual(poller.poll_count, 0)
+        self.assertEqual(poller.scheduled_count, 2)
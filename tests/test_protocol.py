@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.protocol.
+"""
+
+import unittest
+from vrroompy.commands.input import Input
+from vrroompy.protocol import InterruptEvent, VrroomProtocol
+
+
+class TestVrroomProtocol(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.protocol.VrroomProtocol.
+    """
+
+    def test_send_get(self):
+        protocol = VrroomProtocol()
+        command = protocol.send_get("opmode")
+
+        self.assertEqual(command.request, b"get opmode\n")
+        self.assertEqual(command.target, "opmode")
+        self.assertEqual(protocol.pending_commands, [command])
+
+    def test_send_set(self):
+        protocol = VrroomProtocol()
+        command = protocol.send_set("insel", [Input.RX1, Input.FOLLOW], "context")
+
+        self.assertEqual(command.request, b"set insel 1 4\n")
+        self.assertEqual(command.context, "context")
+        self.assertEqual(protocol.pending_commands, [command])
+
+    def test_receive_single(self):
+        protocol = VrroomProtocol()
+        command = protocol.send_get("opmode")
+
+        self.assertEqual(protocol.receive_data(b"opmode 2\r\n"), 1)
+        response = protocol.next_response()
+        self.assertIs(response.command, command)
+        self.assertEqual(response.line, b"opmode 2\r\n")
+        self.assertEqual(response.decode(["[0-4]"], [str]), ["2"])
+        self.assertIsNone(protocol.next_response())
+        self.assertEqual(protocol.pending_commands, [])
+
+    def test_receive_split(self):
+        protocol = VrroomProtocol()
+        command = protocol.send_get("insel")
+
+        self.assertEqual(protocol.receive_data(b"ins"), 0)
+        self.assertEqual(protocol.receive_data(b"el 2 "), 0)
+        self.assertEqual(protocol.buffered_byte_count, 8)
+        self.assertIsNone(protocol.next_response())
+        self.assertEqual(protocol.receive_data(b"3\r"), 0)
+        self.assertEqual(protocol.receive_data(b"\n"), 1)
+
+        response = protocol.next_response()
+        self.assertIs(response.command, command)
+        self.assertEqual(response.line, b"insel 2 3\r\n")
+        self.assertEqual(protocol.buffered_byte_count, 0)
+
+    def test_receive_merged(self):
+        protocol = VrroomProtocol()
+        first = protocol.send_get("opmode")
+        second = protocol.send_get("inseltx0")
+
+        self.assertEqual(protocol.receive_data(b"opmode 1\r\ninseltx0 3\r\ninsel"), 2)
+        self.assertIs(protocol.next_response().command, first)
+        self.assertIs(protocol.next_response().command, second)
+        self.assertEqual(protocol.buffered_byte_count, 5)
+
+    def test_receive_matched_by_target(self):
+        protocol = VrroomProtocol()
+        skipped = []
+        protocol.on_skipped = skipped.append
+        dropped = protocol.send_get("opmode")
+        first = protocol.send_get("insel")
+        second = protocol.send_get("opmode")
+
+        # The reply to the first opmode was dropped, so the insel reply skips it
+        protocol.receive_data(b"insel 1 2\r\nopmode 3\r\ntcpport 23\r\n")
+        self.assertIs(protocol.next_response().command, first)
+        self.assertIs(protocol.next_response().command, second)
+        self.assertIsNone(protocol.next_response().command)
+        self.assertEqual(skipped, [dropped])
+        self.assertEqual(protocol.pending_commands, [])
+
+    def test_abandon(self):
+        protocol = VrroomProtocol()
+        abandoned = protocol.send_get("opmode")
+        command = protocol.send_get("opmode")
+        self.assertTrue(protocol.abandon(abandoned))
+        self.assertFalse(protocol.abandon(abandoned))
+
+        protocol.receive_data(b"opmode 1\r\n")
+        self.assertIs(protocol.next_response().command, command)
+
+    def test_receive_long(self):
+        protocol = VrroomProtocol()
+        protocol.send_get("edidtable rx0")
+        edid_line = b"edidtable rx0 " + b"00" * 256 + b"\r\n"
+
+        for index in range(0, len(edid_line), 100):
+            protocol.receive_data(edid_line[index : index + 100])
+        self.assertEqual(protocol.next_response().line, edid_line)
+
+    def test_receive_unmatched(self):
+        protocol = VrroomProtocol()
+
+        protocol.receive_data(b"int\r\n")
+        self.assertIsNone(protocol.next_response().command)
+
+    def test_receive_interrupt(self):
+        protocol = VrroomProtocol()
+        command = protocol.send_get("opmode")
+        events = []
+        unsubscribe = protocol.subscribe_interrupts(events.append)
+
+        self.assertEqual(protocol.receive_data(b"int insel 2 2\r\nopmode 1\r\n"), 1)
+        self.assertIs(protocol.next_response().command, command)
+        self.assertEqual(protocol.interrupt_count, 1)
+        self.assertEqual(
+            events, [InterruptEvent("insel", ("2", "2"), b"int insel 2 2\r\n")]
+        )
+
+        unsubscribe()
+        protocol.receive_data(b"int insel 3 3\r\n")
+        self.assertEqual(len(events), 1)
+        self.assertEqual(protocol.interrupt_count, 2)
+
+    def test_receive_interrupt_callback_raises(self):
+        protocol = VrroomProtocol()
+        events = []
+
+        def raise_error(event):
+            raise RuntimeError("Callback failed")
+
+        protocol.subscribe_interrupts(raise_error)
+        protocol.subscribe_interrupts(events.append)
+        with self.assertLogs("vrroompy.protocol", "ERROR"):
+            protocol.receive_data(b"int rx0\r\n")
+        self.assertEqual(events, [InterruptEvent("rx0", (), b"int rx0\r\n")])
+
+    def test_clear(self):
+        protocol = VrroomProtocol()
+        protocol.send_get("opmode")
+        protocol.receive_data(b"opmode 1\r\nop")
+
+        protocol.clear()
+        self.assertEqual(protocol.buffered_byte_count, 0)
+        self.assertEqual(protocol.pending_commands, [])
+        self.assertIsNone(protocol.next_response())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.recorder.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from vrroompy.capture import CaptureDirection, ReplaySocket, read_capture
+from vrroompy.client import VrroomClient
+from vrroompy.commands import (
+    decode_response,
+    disable_flight_recorder,
+    enable_flight_recorder,
+    get_flight_recorder,
+    get_spec,
+)
+from vrroompy.commands.input import (
+    Input,
+    SPEC_SELECTED_INPUTS,
+    get_selected_inputs,
+    set_selected_inputs,
+)
+from vrroompy.exceptions import ResponseParsingError, ValueNotChangedError
+from vrroompy.protocol import VrroomProtocol
+from vrroompy.recorder import FlightRecorder
+from vrroompy.simulator import SimulatorThread
+
+SENT = CaptureDirection.SENT
+RECEIVED = CaptureDirection.RECEIVED
+
+
+class FakeClock:
+    """
+    Stands in for time.monotonic, only moving forward when told to.
+    """
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TableSocket:
+    """
+    Stands in for a socket, answering each request from a table of responses.
+    """
+
+    def __init__(self, responses: dict) -> None:
+        self.responses = responses
+        self.__response = b""
+
+    def sendall(self, request: bytes) -> None:
+        self.__response = self.responses[request]
+
+    def recv(self, _buffer_size: int) -> bytes:
+        response, self.__response = self.__response, b""
+        return response
+
+
+class TestFlightRecorder(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.recorder.FlightRecorder.
+    """
+
+    def test_records(self):
+        clock = FakeClock()
+        recorder = FlightRecorder(clock=clock)
+        self.assertEqual(recorder.records(), [])
+        recorder.record_sent(b"get insel\n")
+        clock.now += 0.5
+        recorder.record_received(bytearray(b"insel 1 2\r\n"))
+
+        records = recorder.records()
+        self.assertEqual(
+            [(record.direction, record.data) for record in records],
+            [(SENT, b"get insel\n"), (RECEIVED, b"insel 1 2\r\n")],
+        )
+        self.assertEqual([record.timestamp for record in records], [0.0, 0.5])
+        self.assertEqual(
+            recorder.format().splitlines()[-1],
+            "    0.500000 < b'insel 1 2\\r\\n'",
+        )
+
+        recorder.clear()
+        self.assertEqual(recorder.records(), [])
+
+    def test_record_capacity(self):
+        recorder = FlightRecorder(record_capacity=3)
+        for number in range(10):
+            recorder.record_sent(f"get {number}\n".encode())
+        self.assertEqual(
+            [record.data for record in recorder.records()],
+            [b"get 7\n", b"get 8\n", b"get 9\n"],
+        )
+        self.assertEqual(recorder.record_count, 10)
+
+    def test_arena_wrap(self):
+        recorder = FlightRecorder(record_capacity=16, arena_size=16)
+        recorder.record_sent(b"0123456789")
+        recorder.record_received(b"abcdefgh")  # Wraps around the end of the arena
+        self.assertEqual([record.data for record in recorder.records()], [b"abcdefgh"])
+        recorder.record_received(b"ABCD")
+        self.assertEqual(
+            [record.data for record in recorder.records()], [b"abcdefgh", b"ABCD"]
+        )
+
+        # A record larger than the arena keeps only its last bytes
+        recorder.record_received(b"x" * 20 + b"0123456789ABCDEF")
+        self.assertEqual(
+            [record.data for record in recorder.records()], [b"0123456789ABCDEF"]
+        )
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            FlightRecorder(record_capacity=0)
+        with self.assertRaises(ValueError):
+            FlightRecorder(arena_size=0)
+
+
+class TestFlightRecorderCommands(unittest.TestCase):
+    """
+    Unit tests the flight recorder's use by the command functions and clients.
+    """
+
+    def setUp(self):
+        self.socket = TableSocket(
+            {
+                b"get insel\n": b"insel 1 2\r\n",
+                b"set insel 3 3\n": b"insel 1 2\r\n",
+            }
+        )
+
+    def test_annotate_errors(self):
+        self.assertIsNone(get_flight_recorder(self.socket))
+        recorder = enable_flight_recorder(self.socket)
+        self.assertIs(get_flight_recorder(self.socket), recorder)
+
+        get_selected_inputs(self.socket)
+        with self.assertRaises(ValueNotChangedError) as context:
+            set_selected_inputs(self.socket, Input.RX3, Input.RX3)
+        self.assertEqual(
+            [record.data for record in context.exception.flight_recording],
+            [b"get insel\n", b"insel 1 2\r\n", b"set insel 3 3\n", b"insel 1 2\r\n"],
+        )
+        if sys.version_info >= (3, 11):
+            self.assertIn("b'set insel 3 3\\n'", context.exception.__notes__[0])
+
+        disable_flight_recorder(self.socket)
+        with self.assertRaises(ValueNotChangedError) as context:
+            set_selected_inputs(self.socket, Input.RX3, Input.RX3)
+        self.assertIsNone(context.exception.flight_recording)
+
+    def test_decode_response_without_annotation(self):
+        protocol = VrroomProtocol(flight_recorder=FlightRecorder())
+        protocol.send_command("insel", b"get insel\n")
+        protocol.receive_data(b"insel 9 9\r\n")
+        response = protocol.next_response()
+        with self.assertRaises(ResponseParsingError) as context:
+            decode_response(protocol, SPEC_SELECTED_INPUTS, response, annotate=False)
+        self.assertIsNone(context.exception.flight_recording)
+
+    def test_dump_replay(self):
+        recorder = enable_flight_recorder(self.socket, FlightRecorder(8, 1024))
+        get_selected_inputs(self.socket)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "recording.cap")
+            recorder.dump(path)
+            self.assertEqual(read_capture(path), recorder.records())
+            with ReplaySocket(path) as replay:
+                self.assertEqual(get_selected_inputs(replay), [Input.RX1, Input.RX2])
+
+    def test_client(self):
+        recorder = FlightRecorder()
+        with SimulatorThread() as simulator:
+            with VrroomClient.connect(
+                *simulator.address, timeout=5, flight_recorder=recorder
+            ) as client:
+                client.set_selected_inputs(Input.RX1, Input.RX2)
+                with self.assertRaises(ResponseParsingError) as context:
+                    client.get(get_spec("insel", [r"4", r"4"], [int, int]))
+        records = context.exception.flight_recording
+        self.assertEqual(records[0], recorder.records()[0])
+        self.assertEqual(
+            [record.data for record in records if record.direction == SENT],
+            [b"set insel 1 2\n", b"get insel\n"],
+        )
+        self.assertTrue(records[-1].data.endswith(b"insel 1 2\r\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.scheduler.
+"""
+
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import socket
+import threading
+import unittest
+from vrroompy.client import VrroomClient
+from vrroompy.commands import BatchCommand
+from vrroompy.commands.input import Input, SPEC_SELECTED_INPUTS
+from vrroompy.commands.modes import OperationMode, SPEC_OPERATION_MODE
+from vrroompy.exceptions import ConnectionClosedError
+from vrroompy.scheduler import CommandScheduler, Priority
+
+
+class FakeSwitch:
+    """
+    Answers requests on one end of a socket pair, only when allowed to.
+    """
+
+    def __init__(self) -> None:
+        self.requests = []
+        self.allowed = threading.Semaphore(0)
+        self.client_socket, self.switch_socket = socket.socketpair()
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self) -> None:
+        with self.switch_socket, self.switch_socket.makefile("rb") as requests:
+            for request in requests:
+                self.requests.append(request)
+                self.allowed.acquire()  # pylint: disable=consider-using-with
+                if request == b"get opmode\n":
+                    self.switch_socket.sendall(b"opmode 1\r\n")
+                else:
+                    self.switch_socket.sendall(request[len(b"set ") : -1] + b"\r\n")
+
+    def allow(self, count: int = 1000) -> None:
+        for _ in range(count):
+            self.allowed.release()
+
+
+POLL = BatchCommand(SPEC_OPERATION_MODE)
+
+
+class TestCommandScheduler(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.scheduler.CommandScheduler.
+    """
+
+    def test_interactive_overtakes_poll(self):
+        switch = FakeSwitch()
+        with VrroomClient(switch.client_socket) as client:
+            scheduler = CommandScheduler(client, max_in_flight=2)
+            polls = scheduler.submit_many([POLL] * 10, Priority.POLL)
+            self.assertEqual(scheduler.in_flight, 2)
+            self.assertEqual(scheduler.queue_depth(Priority.POLL), 8)
+
+            switched = scheduler.submit(
+                SPEC_SELECTED_INPUTS, [Input.RX1, Input.RX2], Priority.INTERACTIVE
+            )
+            switch.allow()
+            self.assertEqual(switched.result(5), [Input.RX1, Input.RX2])
+            for poll in polls:
+                self.assertEqual(poll.result(5), [OperationMode.SPLITTER_UPSCALE])
+
+        # Only the polls already in flight were sent before the input switch
+        self.assertEqual(switch.requests[2], b"set insel 1 2\n")
+        metrics = scheduler.metrics(Priority.POLL)
+        self.assertEqual(metrics.queue_depth, 0)
+        self.assertEqual(metrics.sent_count, 10)
+        self.assertGreater(metrics.max_wait, 0)
+        self.assertEqual(scheduler.metrics(Priority.INTERACTIVE).sent_count, 1)
+
+    def test_bulk_is_not_starved(self):
+        switch = FakeSwitch()
+        with VrroomClient(switch.client_socket) as client:
+            scheduler = CommandScheduler(client, max_in_flight=1, max_bypass=2)
+            scheduler.submit(SPEC_OPERATION_MODE, priority=Priority.AUTOMATION)
+            bulk = scheduler.submit(
+                SPEC_SELECTED_INPUTS, [Input.RX3, Input.RX3], Priority.BULK
+            )
+            scheduler.submit_many([POLL] * 5, Priority.INTERACTIVE)
+            switch.allow()
+            bulk.result(5)
+            scheduler.submit(SPEC_OPERATION_MODE).result(5)
+        self.assertEqual(switch.requests.index(b"set insel 3 3\n"), 3)
+
+    def test_cancelled_before_sending(self):
+        switch = FakeSwitch()
+        with VrroomClient(switch.client_socket) as client:
+            scheduler = CommandScheduler(client, max_in_flight=1)
+            first, second, third = scheduler.submit_many([POLL] * 3, Priority.POLL)
+            self.assertTrue(second.cancel())
+            switch.allow()
+            first.result(5)
+            third.result(5)
+        self.assertEqual(len(switch.requests), 2)
+
+    def test_timeout_frees_slot(self):
+        switch = FakeSwitch()
+        with VrroomClient(switch.client_socket) as client:
+            scheduler = CommandScheduler(client, max_in_flight=1)
+            with self.assertRaises(FutureTimeoutError):
+                scheduler.get(SPEC_OPERATION_MODE, timeout=0.1)
+            self.assertEqual(scheduler.in_flight, 0)
+
+            switched = scheduler.submit(SPEC_SELECTED_INPUTS, [Input.RX1, Input.RX2])
+            switch.allow()
+            self.assertEqual(switched.result(5), [Input.RX1, Input.RX2])
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_closed_client_fails_commands(self):
+        switch = FakeSwitch()
+        client = VrroomClient(switch.client_socket)
+        client.close()
+        scheduler = CommandScheduler(client)
+        with self.assertRaises(ConnectionClosedError):
+            scheduler.get(SPEC_OPERATION_MODE, timeout=5)
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            CommandScheduler(None, max_in_flight=0)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.simulator.
+"""
+
+import asyncio
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import socket
+import threading
+import time
+import unittest
+from vrroompy.async_client import AsyncVrroomClient
+from vrroompy.client import VrroomClient
+from vrroompy.commands import BatchCommand
+from vrroompy.commands.input import Input, SPEC_SELECTED_INPUT_TX1
+from vrroompy.commands.modes import OperationMode
+from vrroompy.commands.network import MacAddress
+from vrroompy.commands.snapshot import SNAPSHOT_COMMANDS
+from vrroompy.exceptions import ConnectionClosedError
+from vrroompy.simulator import (
+    DEFAULT_EDID_TABLE,
+    SimulatorFaults,
+    SimulatorThread,
+    VrroomSimulator,
+)
+
+
+def request_raw(address, request: bytes, response_count: int = 1) -> bytes:
+    with socket.create_connection(address, timeout=5) as raw_socket:
+        raw_socket.sendall(request)
+        received = b""
+        while received.count(b"\r\n") < response_count:
+            received += raw_socket.recv(4096)
+        return received
+
+
+class TestVrroomSimulator(unittest.TestCase):
+    """
+    Unit tests the class vrroompy.simulator.VrroomSimulator.
+    """
+
+    def test_get_set(self):
+        with SimulatorThread() as simulator:
+            with VrroomClient.connect(*simulator.address) as client:
+                self.assertEqual(
+                    client.get_operation_mode(), OperationMode.SPLITTER_VRR
+                )
+                client.set_operation_mode(OperationMode.MATRIX_TMDS)
+                client.set_selected_input_tx1(Input.RX2)
+                self.assertEqual(client.get_selected_inputs(), [Input.RX0, Input.RX2])
+                self.assertEqual(
+                    str(client.get_mac_address()), str(MacAddress("19:AC:B5:D3:22:F4"))
+                )
+            self.assertEqual(simulator.simulator.state["opmode"], "2")
+
+    def test_raw_protocol(self):
+        with SimulatorThread() as simulator:
+            # RS232 headers and carriage returns are accepted, and unknown targets ignored
+            received = request_raw(
+                simulator.address,
+                b"#vrroom get dhcp\rget nonsense\nset autosw off\n",
+                response_count=2,
+            )
+        self.assertEqual(received, b"dhcp off\r\nautosw off\r\n")
+
+    def test_edid_table(self):
+        with SimulatorThread() as simulator:
+            received = request_raw(simulator.address, b"get edidtable tx0\n")
+        words = received.split()
+        self.assertEqual(words[:2], [b"edidtable", b"tx0"])
+        self.assertEqual(bytes.fromhex(words[2].decode()), DEFAULT_EDID_TABLE)
+        self.assertEqual(len(DEFAULT_EDID_TABLE), 256)
+
+    def test_interrupts(self):
+        with SimulatorThread() as simulator:
+            with VrroomClient.connect(*simulator.address) as client:
+                events = []
+                received = threading.Event()
+                client.subscribe_interrupts(
+                    lambda event: (events.append(event), received.set())
+                )
+                client.set_ip_interrupts_enabled(True)
+                simulator.change("insel", "3 3")
+                self.assertTrue(received.wait(5))
+                self.assertEqual(events[0].name, "insel")
+                self.assertEqual(events[0].values, ("3", "3"))
+                # Sets also interrupt, and the echo is still matched to its command
+                client.set(SPEC_SELECTED_INPUT_TX1, [Input.RX1])
+                self.assertEqual(client.get_selected_inputs(), [Input.RX3, Input.RX1])
+
+    def test_reboot_drops_connection(self):
+        simulator = VrroomSimulator(reboot_time=0.2)
+        with SimulatorThread(simulator) as thread:
+            with VrroomClient.connect(*thread.address) as client:
+                client.reboot()
+                with self.assertRaises(ConnectionClosedError):
+                    client.get_operation_mode()
+            # New connections are refused until the reboot finishes
+            with VrroomClient.connect(*thread.address) as client:
+                with self.assertRaises(ConnectionClosedError):
+                    client.get_operation_mode()
+            time.sleep(0.3)
+            with VrroomClient.connect(*thread.address) as client:
+                client.get_operation_mode()
+
+    def test_latency(self):
+        simulator = VrroomSimulator(SimulatorFaults(latency=0.05, jitter=0.01))
+        with SimulatorThread(simulator) as thread:
+            with VrroomClient.connect(*thread.address) as client:
+                start_time = time.perf_counter()
+                client.execute_many(SNAPSHOT_COMMANDS)
+                elapsed = time.perf_counter() - start_time
+        # Pipelined commands pay the latency once, not once per command
+        self.assertGreater(elapsed, 0.04)
+        self.assertLess(elapsed, 0.04 * len(SNAPSHOT_COMMANDS))
+
+    def test_split_and_merged_segments(self):
+        faults = SimulatorFaults(merge_window=0.002, split_probability=0.5)
+        simulator = VrroomSimulator(faults, seed=1)
+
+        async def run():
+            async with simulator:
+                client = await AsyncVrroomClient.connect(*simulator.address)
+                async with client:
+                    for _ in range(20):
+                        await client.execute_many(SNAPSHOT_COMMANDS)
+
+        asyncio.run(run())
+        self.assertEqual(simulator.request_count, 20 * len(SNAPSHOT_COMMANDS))
+
+    def test_dropped_replies(self):
+        simulator = VrroomSimulator(SimulatorFaults(drop_probability=1.0))
+        with SimulatorThread(simulator) as thread:
+            with VrroomClient.connect(*thread.address) as client:
+                (future,) = client.submit_many(
+                    [BatchCommand(SNAPSHOT_COMMANDS[0].spec)]
+                )
+                with self.assertRaises(FutureTimeoutError):
+                    future.result(0.1)
+        self.assertEqual(simulator.dropped_count, 1)
+
+    def test_close_ends_connections(self):
+        simulator = VrroomSimulator()
+
+        async def run():
+            await simulator.start()
+            _, writer = await asyncio.open_connection(*simulator.address)
+            await asyncio.sleep(0.01)  # Until the connection is being served
+            await simulator.close()
+            self.assertEqual(asyncio.all_tasks(), {asyncio.current_task()})
+            writer.close()
+
+        asyncio.run(run())
+        self.assertEqual(simulator.connection_count, 1)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-function-docstring
+
+"""
+Contains unit tests for the module vrroompy.wait.
+"""
+
+import asyncio
+import socket
+import threading
+import unittest
+from vrroompy.async_client import AsyncVrroomClient
+from vrroompy.commands.enums import Target
+from vrroompy.commands.modes import SPEC_OPERATION_MODE, OperationMode
+from vrroompy.wait import wait_until, wait_until_async
+
+
+def is_frl5(values):
+    return values[Target.OPERATION_MODE] == [OperationMode.MATRIX_FRL5_TMDS]
+
+
+class FakeSwitch:
+    """
+    Answers requests on one end of a socket pair, with an operation mode that can change.
+    """
+
+    def __init__(self, interrupts_enabled: bool) -> None:
+        self.interrupts_enabled = interrupts_enabled
+        self.operation_modes = []
+        self.operation_mode = b"1"
+        self.client_socket, self.switch_socket = socket.socketpair()
+        self.client_socket.settimeout(5)
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def respond(self, request: bytes) -> bytes:
+        if request == b"get ipinterrupt\n":
+            return (
+                b"ipinterrupt on\r\n"
+                if self.interrupts_enabled
+                else b"ipinterrupt off\r\n"
+            )
+        if self.operation_modes:
+            self.operation_mode = self.operation_modes.pop(0)
+        return b"opmode " + self.operation_mode + b"\r\n"
+
+    def serve(self) -> None:
+        with self.switch_socket, self.switch_socket.makefile("rb") as requests:
+            for request in requests:
+                self.switch_socket.sendall(self.respond(request))
+
+    def change_operation_mode(self, operation_mode: bytes) -> None:
+        self.operation_mode = operation_mode
+        self.switch_socket.sendall(b"int opmode " + operation_mode + b"\r\n")
+
+
+class UnselectableSocket:
+    """
+    Wraps a socket, hiding its file descriptor as a ReplaySocket has none.
+    """
+
+    def __init__(self, wrapped: socket.socket) -> None:
+        self.__socket = wrapped
+
+    def sendall(self, data: bytes) -> None:
+        self.__socket.sendall(data)
+
+    def recv(self, buffer_size: int) -> bytes:
+        return self.__socket.recv(buffer_size)
+
+
+class TestWaitUntil(unittest.TestCase):
+    """
+    Unit tests the function vrroompy.wait.wait_until.
+    """
+
+    def test_wait_until_immediate(self):
+        switch = FakeSwitch(interrupts_enabled=False)
+        switch.operation_mode = b"4"
+        with switch.client_socket:
+            result = wait_until(
+                switch.client_socket, is_frl5, [SPEC_OPERATION_MODE], timeout=5
+            )
+        self.assertEqual(result.read_count, 1)
+        self.assertEqual(
+            result.values, {Target.OPERATION_MODE: [OperationMode.MATRIX_FRL5_TMDS]}
+        )
+
+    def test_wait_until_polling(self):
+        switch = FakeSwitch(interrupts_enabled=False)
+        switch.operation_modes = [b"1", b"1", b"1", b"4"]
+        with switch.client_socket:
+            result = wait_until(
+                switch.client_socket,
+                is_frl5,
+                [SPEC_OPERATION_MODE],
+                timeout=5,
+                initial_interval=0.001,
+            )
+        self.assertEqual(result.read_count, 4)
+        self.assertGreater(result.elapsed, 0)
+
+    def test_wait_until_interrupt(self):
+        switch = FakeSwitch(interrupts_enabled=True)
+        threading.Timer(0.05, switch.change_operation_mode, [b"4"]).start()
+        with switch.client_socket:
+            # Without the interrupt, the first re-read would only happen after 10 seconds
+            result = wait_until(
+                switch.client_socket,
+                is_frl5,
+                [SPEC_OPERATION_MODE],
+                timeout=5,
+                max_interval=10,
+            )
+        self.assertLess(result.elapsed, 5)
+        self.assertEqual(result.read_count, 2)
+
+    def test_wait_until_without_file_descriptor(self):
+        # Interrupts cannot be listened for, so are polled for instead
+        switch = FakeSwitch(interrupts_enabled=True)
+        switch.operation_modes = [b"1", b"1", b"4"]
+        with switch.client_socket:
+            result = wait_until(
+                UnselectableSocket(switch.client_socket),
+                is_frl5,
+                [SPEC_OPERATION_MODE],
+                timeout=5,
+                initial_interval=0.001,
+            )
+        self.assertEqual(result.read_count, 3)
+
+    def test_wait_until_timeout(self):
+        switch = FakeSwitch(interrupts_enabled=False)
+        with switch.client_socket:
+            with self.assertRaises(TimeoutError):
+                wait_until(
+                    switch.client_socket,
+                    is_frl5,
+                    [SPEC_OPERATION_MODE],
+                    timeout=0.1,
+                    initial_interval=0.01,
+                )
+
+
+class TestWaitUntilAsync(unittest.TestCase):
+    """
+    Unit tests the function vrroompy.wait.wait_until_async.
+    """
+
+    def run_with_switch(self, switch: FakeSwitch, test):
+        async def run():
+            reader, writer = await asyncio.open_connection(sock=switch.client_socket)
+            async with AsyncVrroomClient(reader, writer) as client:
+                return await test(client)
+
+        return asyncio.run(run())
+
+    def test_wait_until_polling(self):
+        switch = FakeSwitch(interrupts_enabled=False)
+        switch.operation_modes = [b"1", b"1", b"4"]
+
+        async def test(client):
+            return await wait_until_async(
+                client, is_frl5, [SPEC_OPERATION_MODE], 5, initial_interval=0.001
+            )
+
+        result = self.run_with_switch(switch, test)
+        self.assertEqual(result.read_count, 3)
+
+    def test_wait_until_interrupt(self):
+        switch = FakeSwitch(interrupts_enabled=True)
+
+        async def test(client):
+            asyncio.get_running_loop().call_later(
+                0.05, switch.change_operation_mode, b"4"
+            )
+            return await wait_until_async(
+                client, is_frl5, [SPEC_OPERATION_MODE], 5, max_interval=10
+            )
+
+        result = self.run_with_switch(switch, test)
+        self.assertLess(result.elapsed, 5)
+        self.assertEqual(result.read_count, 2)
+
+    def test_wait_until_timeout(self):
+        switch = FakeSwitch(interrupts_enabled=False)
+
+        async def test(client):
+            return await wait_until_async(
+                client, is_frl5, [SPEC_OPERATION_MODE], 0.1, initial_interval=0.01
+            )
+
+        with self.assertRaises(TimeoutError):
+            self.run_with_switch(switch, test)